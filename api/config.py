@@ -0,0 +1,30 @@
+"""
+Configuration de l'API (variables d'environnement / .env)
+"""
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Charger variables d'environnement
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class Settings:
+    """Paramètres de l'API, surchargeables par variables d'environnement"""
+
+    def __init__(self):
+        # Fichier JSON des workouts parsés servi par GET /workouts/list
+        self.WORKOUTS_CACHE_PATH = Path(os.getenv(
+            'WORKOUTS_CACHE_PATH',
+            PROJECT_ROOT / "data" / "workouts_cache" / "S06_workouts_v6_near_final.json"
+        ))
+        # Cache Garmin partagé entre workers (ex: redis://localhost:6379/0), désactivé si vide
+        self.REDIS_URL = os.getenv('REDIS_URL', '')
+        # Mode debug asyncio : signale les appels bloquants sur la boucle d'événements
+        self.DEBUG = os.getenv('API_DEBUG', '').lower() in ('1', 'true', 'yes')
+
+
+settings = Settings()
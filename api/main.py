@@ -3,17 +3,75 @@
 Garmin Automation API - Point d'entrée FastAPI
 
 Usage:
-    uvicorn api.main:app --reload --port 8000
+    uvicorn api.main:app --reload --port 8000     # développement
+    python -m api.main                            # production (uvloop, httptools, 1 worker/CPU si REDIS_URL)
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from api.config import settings
+from api.middleware.timing import timing_middleware
+from api.responses import ORJSONResponse
 from api.routes import workouts, garmin, health
+from api.services.garmin_service import AsyncGarminService, GarminService, GARMIN_API_URL, GARMIN_HTTP_LIMITS
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Crée les clients Garmin (session garth, HTTP) et Redis partagés pour toute la durée de vie de l'app"""
+    if settings.DEBUG:
+        # Signale tout appel bloquant > 100 ms exécuté sur la boucle d'événements
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.1
+
+    app.state.redis = None
+    if settings.REDIS_URL:
+        from redis.asyncio import Redis
+        app.state.redis = Redis.from_url(settings.REDIS_URL)
+
+    # Session garth chargée une seule fois pour tout le process
+    try:
+        app.state.garmin_client = await asyncio.to_thread(GarminService.load_session)
+    except Exception as e:
+        app.state.garmin_client = None
+        logger.warning(f"⚠️  Session ~/.garth non chargée au démarrage ({e}), connexion à la première requête")
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=GARMIN_API_URL,
+            http2=True,
+            limits=GARMIN_HTTP_LIMITS,
+            timeout=30.0
+        ) as http:
+            app.state.garmin = AsyncGarminService(
+                http,
+                GarminService(client=app.state.garmin_client),
+                redis=app.state.redis
+            )
+            refresh_task = asyncio.create_task(app.state.garmin.keep_token_fresh())
+            try:
+                yield
+            finally:
+                refresh_task.cancel()
+    finally:
+        if app.state.redis is not None:
+            await app.state.redis.aclose()
+
 
 app = FastAPI(
     title="Garmin Automation API",
     description="API pour automatiser l'upload/fetch de workouts Garmin Connect",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -25,6 +83,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Durée de traitement de chaque requête
+app.middleware("http")(timing_middleware)
+
 # Routes
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(workouts.router, prefix="/api/v1/workouts", tags=["workouts"])
@@ -41,5 +102,17 @@ async def root():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools sont fournis par uvicorn[standard]
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        # Chaque worker exécute son propre lifespan, donc sa boucle keep_token_fresh
+        # qui réécrit ~/.garth : plusieurs workers seulement avec Redis, dont le
+        # verrou SET NX réserve chaque rafraîchissement à un seul worker
+        workers=(os.cpu_count() or 2) if settings.REDIS_URL else 1
+    )
@@ -0,0 +1,36 @@
+"""Mesure du temps de traitement de chaque requête"""
+
+import asyncio
+import logging
+
+from fastapi import Request, Response
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Au-delà, la requête est loguée en warning (Garmin lent ou boucle bloquée)
+SLOW_REQUEST_MS = 200
+
+
+async def timing_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Logue la durée de chaque requête (chemin, méthode, statut, ms)"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    response = await call_next(request)
+    elapsed_ms = (loop.time() - start) * 1000
+
+    level = logging.WARNING if elapsed_ms > SLOW_REQUEST_MS else logging.INFO
+    logger.log(
+        level,
+        f"{request.method} {request.url.path} → {response.status_code} en {elapsed_ms:.1f} ms",
+        extra={
+            "path": request.url.path,
+            "method": request.method,
+            "status": response.status_code,
+            "ms": round(elapsed_ms, 1)
+        }
+    )
+    return response
@@ -0,0 +1,28 @@
+"""Modèles de réponse des endpoints Garmin Connect"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Activity(BaseModel):
+    """Activité Garmin (les champs non déclarés sont transmis tels quels)"""
+
+    model_config = ConfigDict(extra="allow")
+
+    activityId: int
+    activityName: Optional[str] = None
+    startTimeLocal: str
+    activityType: Optional[Dict[str, Any]] = None
+    distance: Optional[float] = None
+    duration: Optional[float] = None
+
+
+class ActivitiesResponse(BaseModel):
+    """Réponse de GET /garmin/activities"""
+
+    status: str
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    count: int
+    activities: List[Activity]
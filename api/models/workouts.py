@@ -0,0 +1,25 @@
+"""Modèles de réponse des endpoints workouts"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Workout(BaseModel):
+    """Workout parsé depuis le PDF (intervalles, séries... transmis tels quels)"""
+
+    model_config = ConfigDict(extra="allow")
+
+    code: str
+    date: Optional[str] = None
+    type: Optional[str] = None
+
+
+class WorkoutsListResponse(BaseModel):
+    """Réponse de GET /workouts/list"""
+
+    status: str
+    week: str
+    period: Optional[str] = None
+    workouts_count: int
+    workouts: List[Workout]
@@ -1,30 +1,33 @@
 """Garmin Connect interaction endpoints"""
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any, Optional
-from datetime import datetime
-from api.services.garmin_service import GarminService
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Dict, Any, List, Optional
+from api.models.garmin import ActivitiesResponse
+from api.services.garmin_service import AsyncGarminService, date_range, today_str
 
 router = APIRouter()
 
-# Instance du service Garmin (singleton)
-garmin_service = None
+# Plage maximale acceptée par les endpoints /range (jours)
+MAX_RANGE_DAYS = 366
 
 
-def get_garmin_service() -> GarminService:
-    """Retourne l'instance du service Garmin (singleton)"""
-    global garmin_service
-    if garmin_service is None:
-        garmin_service = GarminService()
-    return garmin_service
+async def get_garmin_service(request: Request) -> AsyncGarminService:
+    """
+    Dépendance FastAPI : service Garmin partagé (créé dans le lifespan de l'app)
+
+    Déclarée async pour être exécutée sur la boucle d'événements plutôt
+    que dans le threadpool à chaque requête.
+    """
+    return request.app.state.garmin
 
 
-@router.get("/activities")
+@router.get("/activities", response_model=ActivitiesResponse)
 async def get_activities(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    limit: int = 50
-) -> Dict[str, Any]:
+    limit: int = 50,
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> ActivitiesResponse:
     """
     Récupère les activités depuis Garmin Connect
 
@@ -37,23 +40,25 @@ async def get_activities(
         List of activities
     """
     try:
-        service = get_garmin_service()
-        activities = service.get_activities(start_date, end_date, limit)
+        activities = await service.get_activities(start_date, end_date, limit)
 
-        return {
-            "status": "success",
-            "start_date": start_date,
-            "end_date": end_date,
-            "count": len(activities),
-            "activities": activities
-        }
+        return ActivitiesResponse(
+            status="success",
+            start_date=start_date,
+            end_date=end_date,
+            count=len(activities),
+            activities=activities
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/weight")
-async def get_weight(date: Optional[str] = None) -> Dict[str, Any]:
+async def get_weight(
+    date: Optional[str] = None,
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
     """
     Récupère le poids pour une date donnée
 
@@ -65,10 +70,9 @@ async def get_weight(date: Optional[str] = None) -> Dict[str, Any]:
     """
     try:
         if not date:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = today_str()
 
-        service = get_garmin_service()
-        weight_kg = service.get_weight(date)
+        weight_kg = await service.get_weight(date)
 
         if weight_kg is not None:
             return {
@@ -88,8 +92,88 @@ async def get_weight(date: Optional[str] = None) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_range(start: str, end: str) -> List[str]:
+    """Valide une plage de dates et retourne la liste des jours"""
+    try:
+        dates = date_range(start, end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates attendues au format YYYY-MM-DD")
+
+    if not dates:
+        raise HTTPException(status_code=400, detail="start doit précéder end")
+    if len(dates) > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Plage limitée à {MAX_RANGE_DAYS} jours")
+    return dates
+
+
+@router.get("/weight/range")
+async def get_weight_range(
+    start: str,
+    end: str,
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
+    """
+    Récupère le poids pour chaque jour d'une plage de dates
+
+    Args:
+        start: Start date (YYYY-MM-DD)
+        end: End date (YYYY-MM-DD)
+
+    Returns:
+        Weight per date (None when no data or fetch failed)
+    """
+    dates = _parse_range(start, end)
+
+    try:
+        weights = await service.get_weight_range(dates)
+
+        return {
+            "status": "success",
+            "start": start,
+            "end": end,
+            "weights_kg": weights
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sleep/range")
+async def get_sleep_range(
+    start: str,
+    end: str,
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
+    """
+    Récupère les données de sommeil pour chaque jour d'une plage de dates
+
+    Args:
+        start: Start date (YYYY-MM-DD)
+        end: End date (YYYY-MM-DD)
+
+    Returns:
+        Sleep data per date (None when no data or fetch failed)
+    """
+    dates = _parse_range(start, end)
+
+    try:
+        sleep = await service.get_sleep_range(dates)
+
+        return {
+            "status": "success",
+            "start": start,
+            "end": end,
+            "sleep": sleep
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/test-connection")
-async def test_garmin_connection() -> Dict[str, Any]:
+async def test_garmin_connection(
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
     """
     Teste la connexion à Garmin Connect
 
@@ -97,8 +181,7 @@ async def test_garmin_connection() -> Dict[str, Any]:
         Connection status
     """
     try:
-        service = get_garmin_service()
-        result = service.test_connection()
+        result = await service.test_connection()
 
         if result["connected"]:
             return {
@@ -113,3 +196,19 @@ async def test_garmin_connection() -> Dict[str, Any]:
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/cache")
+async def clear_garmin_cache(
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
+    """
+    Vide le cache des réponses Garmin (activités, poids, sommeil, utilisateur), y compris Redis
+
+    Returns:
+        Nombre d'entrées supprimées
+    """
+    return {
+        "status": "success",
+        "cleared": await service.clear_cache()
+    }
@@ -1,17 +1,42 @@
 """Workout management endpoints"""
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request
 from typing import Dict, Any
-import json
+import asyncio
+import logging
+import tempfile
+import aiofiles
+import orjson
+from api.config import settings
+from api.models.workouts import WorkoutsListResponse
+from api.routes.garmin import get_garmin_service
+from api.services.garmin_service import AsyncGarminService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Uploads Garmin simultanés pour POST /upload
+UPLOAD_CONCURRENCY = 4
+
+# Dernier contenu lu du cache workouts, invalidé quand le fichier change (mtime)
+_workouts_cache: Dict[str, Any] = {"mtime_ns": None, "data": None}
+
+# Taille max d'un PDF d'entraînement accepté par /parse (les PDF hebdo font < 1 Mo)
+MAX_PDF_BYTES = 25 * 1024 * 1024
+# Au-delà, le PDF reçu est déversé sur disque plutôt que gardé en mémoire
+PDF_SPOOL_BYTES = 2 * 1024 * 1024
+PDF_CHUNK_BYTES = 64 * 1024
+
 
 @router.post("/parse")
-async def parse_pdf(file: UploadFile = File(...)) -> Dict[str, Any]:
+async def parse_pdf(request: Request, file: UploadFile = File(...)) -> Dict[str, Any]:
     """
     Parse un PDF d'entraînement et retourne les workouts en JSON
 
+    Le PDF est lu par blocs dans un fichier temporaire, et refusé (413)
+    s'il dépasse MAX_PDF_BYTES.
+
     Args:
         file: PDF file to parse
 
@@ -21,55 +46,98 @@ async def parse_pdf(file: UploadFile = File(...)) -> Dict[str, Any]:
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
 
-    try:
-        # Lire le contenu du PDF
-        pdf_content = await file.read()
+    # Refuser d'emblée les uploads annoncés comme trop gros
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > MAX_PDF_BYTES:
+        raise HTTPException(status_code=413, detail=f"PDF trop volumineux (max {MAX_PDF_BYTES} octets)")
 
-        # TODO: Implémenter parser
-        # from api.services.parser_service import ParserService
-        # parser_service = ParserService()
-        # workouts = parser_service.parse_pdf_bytes(pdf_content)
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_BYTES) as pdf_file:
+            # Lire le contenu du PDF par blocs
+            total = 0
+            while chunk := await file.read(PDF_CHUNK_BYTES):
+                total += len(chunk)
+                if total > MAX_PDF_BYTES:
+                    raise HTTPException(status_code=413, detail=f"PDF trop volumineux (max {MAX_PDF_BYTES} octets)")
+                pdf_file.write(chunk)
+            pdf_file.seek(0)
+
+            # TODO: Implémenter parser
+            # from api.services.parser_service import ParserService
+            # parser_service = ParserService()
+            # workouts = parser_service.parse_pdf_stream(pdf_file)
 
         return {
             "status": "success",
             "message": "Parser not yet implemented",
             "filename": file.filename,
-            "size": len(pdf_content)
+            "size": total
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/upload")
-async def upload_workouts(workouts_data: Dict[str, Any]) -> Dict[str, Any]:
+async def upload_workouts(
+    workouts_data: Dict[str, Any],
+    service: AsyncGarminService = Depends(get_garmin_service)
+) -> Dict[str, Any]:
     """
     Upload workouts vers Garmin Connect
 
+    Les uploads partent en parallèle (UPLOAD_CONCURRENCY max) ; un échec
+    n'interrompt pas les autres workouts.
+
     Args:
-        workouts_data: JSON containing workouts to upload
+        workouts_data: JSON containing workouts to upload ({"workouts": [...]})
 
     Returns:
-        Upload results
+        Upload results, one entry per workout
     """
-    try:
-        # TODO: Implémenter upload Garmin
-        # from api.services.garmin_service import GarminService
-        # garmin_service = GarminService()
-        # result = garmin_service.upload_workouts(workouts_data)
+    workouts = workouts_data.get("workouts", [])
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
 
-        return {
-            "status": "success",
-            "message": "Upload not yet implemented",
-            "workouts_count": len(workouts_data.get("workouts", []))
-        }
+    async def upload_one(workout: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await service.upload_workout(workout)
+                return {"code": workout.get("code"), "workout_id": result.get("workoutId")}
+            except Exception as e:
+                return {"code": workout.get("code"), "error": str(e)}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await asyncio.gather(*[upload_one(workout) for workout in workouts])
+    logger.info(f"📤 {len(workouts)} workouts uploadés en {loop.time() - start:.2f}s")
+
+    errors = [result for result in results if "error" in result]
+
+    return {
+        "status": "success" if not errors else "partial" if len(errors) < len(results) else "error",
+        "workouts_count": len(workouts),
+        "uploaded_count": len(results) - len(errors),
+        "results": results
+    }
+
+
+async def _load_workouts_cache() -> Dict[str, Any]:
+    """Retourne le JSON des workouts en cache, relu uniquement s'il a été modifié"""
+    path = settings.WORKOUTS_CACHE_PATH
+    stat = await asyncio.to_thread(path.stat)
+
+    if _workouts_cache["mtime_ns"] != stat.st_mtime_ns:
+        async with aiofiles.open(path, 'rb') as f:
+            raw = await f.read()
+        _workouts_cache.update(mtime_ns=stat.st_mtime_ns, data=orjson.loads(raw))
 
+    return _workouts_cache["data"]
 
-@router.get("/list")
-async def list_workouts() -> Dict[str, Any]:
+
+@router.get("/list", response_model=WorkoutsListResponse)
+async def list_workouts() -> WorkoutsListResponse:
     """
     Liste tous les workouts en cache
 
@@ -77,17 +145,16 @@ async def list_workouts() -> Dict[str, Any]:
         List of cached workouts
     """
     try:
-        # Lire le fichier cache V6
-        with open('/Users/aptsdae/Documents/Triathlon/garmin_automation/data/workouts_cache/S06_workouts_v6_near_final.json', 'r') as f:
-            data = json.load(f)
-
-        return {
-            "status": "success",
-            "week": data['week'],
-            "period": data.get('period'),
-            "workouts_count": len(data['workouts']),
-            "workouts": data['workouts']
-        }
+        # Lire le fichier cache V6 (WORKOUTS_CACHE_PATH)
+        data = await _load_workouts_cache()
+
+        return WorkoutsListResponse(
+            status="success",
+            week=data['week'],
+            period=data.get('period'),
+            workouts_count=len(data['workouts']),
+            workouts=data['workouts']
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -5,14 +5,28 @@ Basé sur: https://github.com/cyberjunky/python-garminconnect
 Version: 0.2.38 (dernière release au 2026-01-04)
 """
 
+import asyncio
+import functools
+import hashlib
+import importlib
 import os
-from typing import Dict, List, Optional, Any
+import threading
+import time
+import weakref
+from types import ModuleType
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-from garminconnect import Garmin, GarminConnectAuthenticationError, GarminConnectConnectionError
+import httpx
+import orjson
+from cachetools import TLRUCache, TTLCache
 from dotenv import load_dotenv
 import logging
 
+if TYPE_CHECKING:
+    from garminconnect import Garmin
+    from redis.asyncio import Redis
+
 # Charger variables d'environnement
 load_dotenv()
 
@@ -21,23 +35,400 @@ logger = logging.getLogger(__name__)
 # Chemin pour stocker les tokens garth
 GARTH_DIR = Path.home() / ".garth"
 
+# Profil du compte (display_name...) sauvegardé à côté des tokens : évite à la
+# reprise de session les deux appels profil/réglages faits par Garmin.login()
+GARMIN_PROFILE_FILE = GARTH_DIR / "garmin_profile.json"
+GARMIN_PROFILE_FIELDS = ("display_name", "full_name", "unit_system")
+
+# API Garmin Connect (même hôte que garth.connectapi)
+GARMIN_API_URL = "https://connectapi.garmin.com"
+GARMIN_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Pool keep-alive + retries de la session requests utilisée par garth
+GARTH_SESSION_OPTIONS = {
+    "pool_connections": 20,
+    "pool_maxsize": 50,
+    "retries": 3,
+    "backoff_factor": 0.3,
+    "status_forcelist": (429, 502, 503, 504),
+}
+
+# Marge avant expiration du token en deçà de laquelle test_connection revérifie la session
+TOKEN_EXPIRY_MARGIN = 60
+
+# Rafraîchissement périodique du token OAuth2 par l'API (il expire au bout d'~1h)
+TOKEN_REFRESH_INTERVAL = 45 * 60
+
+# Appels Garmin simultanés tolérés pour les requêtes par plage de dates
+RANGE_CONCURRENCY = 8
+
+# Durées de vie du cache (secondes) : une date passée ne change plus,
+# le poids/sommeil du jour peut encore être mis à jour
+CACHE_TTL_PAST = 24 * 3600
+CACHE_TTL_TODAY = 60
+CACHE_TTL_DEFAULT = 300
+
+
+# Date du jour (YYYY-MM-DD), recalculée seulement au changement de jour
+_today_cache: Dict[str, Any] = {"day": None, "str": ""}
+
+
+def today_str() -> str:
+    """Date du jour au format YYYY-MM-DD"""
+    day = datetime.now().date()
+    if _today_cache["day"] != day:
+        _today_cache.update(day=day, str=day.isoformat())
+    return _today_cache["str"]
+
+
+def _date_ttl(date: str) -> int:
+    """Durée de vie (secondes) d'une donnée Garmin datée"""
+    today = today_str()
+    if date < today:
+        return CACHE_TTL_PAST
+    if date == today:
+        return CACHE_TTL_TODAY
+    return CACHE_TTL_DEFAULT
+
+
+def _date_ttu(key: tuple, value: Any, now: float) -> float:
+    """Expiration d'une entrée de cache selon la date (dernier élément de la clé)"""
+    return now + _date_ttl(key[-1])
+
+
+_weight_cache: TLRUCache = TLRUCache(maxsize=512, ttu=_date_ttu)
+_sleep_cache: TLRUCache = TLRUCache(maxsize=512, ttu=_date_ttu)
+_activities_cache: TLRUCache = TLRUCache(maxsize=128, ttu=_date_ttu)
+_user_cache: TTLCache = TTLCache(maxsize=512, ttl=CACHE_TTL_DEFAULT)
+
+# Un verrou par clé en cours de récupération (singleflight)
+_inflight: "weakref.WeakValueDictionary[Hashable, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# Verrou Redis anti-stampede : un seul worker interroge Garmin pour une clé
+REDIS_LOCK_TTL = 5
+REDIS_LOCK_POLL = 0.1
+
+_MISS = object()
+
+
+async def _redis_get(redis: "Redis", key: str) -> Any:
+    """Lit une valeur du cache partagé (_MISS si absente ou Redis indisponible)"""
+    try:
+        raw = await redis.get(key)
+    except Exception as e:
+        logger.warning(f"⚠️  Cache Redis indisponible: {e}")
+        return _MISS
+    return _MISS if raw is None else orjson.loads(raw)
+
+
+async def _redis_try_lock(
+    redis: "Redis",
+    lock_key: str,
+    ttl: int = REDIS_LOCK_TTL,
+    unavailable: bool = True
+) -> bool:
+    """Prend le verrou de rafraîchissement d'une clé (unavailable si Redis est indisponible)"""
+    try:
+        return bool(await redis.set(lock_key, 1, nx=True, ex=ttl))
+    except Exception:
+        return unavailable
+
+
+async def _redis_wait(redis: "Redis", key: str) -> Any:
+    """Attend la valeur qu'un autre worker est en train de récupérer (_MISS si délai dépassé)"""
+    for _ in range(int(REDIS_LOCK_TTL / REDIS_LOCK_POLL)):
+        await asyncio.sleep(REDIS_LOCK_POLL)
+        value = await _redis_get(redis, key)
+        if value is not _MISS:
+            return value
+    return _MISS
+
+
+async def cache_aside(
+    cache: Dict,
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Any]],
+    redis: Optional["Redis"] = None,
+    redis_key: Optional[str] = None,
+    ttl: int = CACHE_TTL_DEFAULT
+) -> Any:
+    """
+    Cache-aside à deux niveaux : L1 en mémoire (cache), L2 Redis partagé entre workers
+
+    Les requêtes concurrentes sur une même clé absente partagent un seul appel
+    Garmin (verrou asyncio par clé dans le process, SET NX entre workers).
+    Les exceptions levées par fetch ne sont pas mises en cache.
+
+    Args:
+        cache: Cache L1 (cachetools)
+        key: Clé L1
+        fetch: Coroutine récupérant la valeur depuis Garmin
+        redis: Client redis.asyncio (L2 désactivé si None)
+        redis_key: Clé L2
+        ttl: Durée de vie L2 en secondes
+    """
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    lock = _inflight.get(key)
+    if lock is None:
+        lock = _inflight[key] = asyncio.Lock()
+
+    async with lock:
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+
+        refresh_lock = None
+        if redis is not None:
+            value = await _redis_get(redis, redis_key)
+            if value is _MISS:
+                if await _redis_try_lock(redis, f"{redis_key}:lock"):
+                    refresh_lock = f"{redis_key}:lock"
+                else:
+                    # Un autre worker interroge déjà Garmin pour cette clé
+                    value = await _redis_wait(redis, redis_key)
+            if value is not _MISS:
+                cache[key] = value
+                return value
+
+        try:
+            value = await fetch()
+            cache[key] = value
+            if redis is not None:
+                try:
+                    await redis.set(redis_key, orjson.dumps(value), ex=ttl)
+                except Exception as e:
+                    logger.warning(f"⚠️  Cache Redis indisponible: {e}")
+            return value
+        finally:
+            if refresh_lock:
+                try:
+                    await redis.delete(refresh_lock)
+                except Exception:
+                    pass
+
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    """Liste des dates (YYYY-MM-DD) de start_date à end_date inclus"""
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def clear_caches() -> int:
+    """Vide les caches Garmin en mémoire et retourne le nombre d'entrées supprimées"""
+    count = 0
+    for cache in (_weight_cache, _sleep_cache, _activities_cache, _user_cache):
+        count += len(cache)
+        cache.clear()
+    return count
+
+
+@functools.lru_cache(maxsize=None)
+def _garminconnect() -> ModuleType:
+    """Module garminconnect, importé au premier usage (garth + requests coûtent ~130 ms)"""
+    return importlib.import_module("garminconnect")
+
+
+@functools.lru_cache(maxsize=1)
+def _garth_http_session() -> Any:
+    """
+    Session requests keep-alive (pool GARTH_SESSION_OPTIONS) partagée par les clients garth du processus
+
+    Les tentatives successives de connect() et les uploads en boucle réutilisent
+    ainsi les mêmes connexions TLS au lieu d'un nouveau pool par client.
+    """
+    template = importlib.import_module("garth").Client()
+    template.configure(**GARTH_SESSION_OPTIONS)
+    return template.sess
+
+
+def _is_network_error(error: BaseException) -> bool:
+    """True si l'erreur (ou une de ses causes) est un échec réseau requests (connexion, timeout)"""
+    requests_exceptions = importlib.import_module("requests.exceptions")
+    while error is not None:
+        if isinstance(error, (requests_exceptions.ConnectionError, requests_exceptions.Timeout)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+_CONVERTERS: Optional[Tuple[Callable, Callable]] = None
+
+
+def _get_converters() -> Tuple[Callable, Callable]:
+    """Convertisseurs (cyclisme, course à pied) de src.garmin_workout_converter, importés une fois"""
+    global _CONVERTERS
+    if _CONVERTERS is None:
+        module = importlib.import_module("src.garmin_workout_converter")
+        _CONVERTERS = (
+            module.convert_to_garmin_cycling_workout,
+            module.convert_to_garmin_running_workout
+        )
+    return _CONVERTERS
+
+
+def _latest_weight_kg(weight_data: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Extrait la dernière pesée du jour (en kg) d'une réponse weight/dayview"""
+    if weight_data and weight_data.get('dateWeightList'):
+        # Prendre la dernière pesée du jour
+        latest = weight_data['dateWeightList'][-1]
+        weight_g = latest.get('weight', 0)
+        return weight_g / 1000.0  # Garmin retourne en grammes
+    return None
+
+
+def _weights_by_day(range_data: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Dernière pesée (en kg) de chaque jour d'une réponse weight/range"""
+    weights = {}
+    for summary in (range_data or {}).get('dailyWeightSummaries') or []:
+        latest = summary.get('latestWeight') or {}
+        if summary.get('summaryDate') and latest.get('weight') is not None:
+            weights[summary['summaryDate']] = latest['weight'] / 1000.0  # Garmin retourne en grammes
+    return weights
+
+
+def _summarize_sleep(date: str, sleep_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Résume une réponse dailySleepData (durée, qualité, phases)"""
+    if sleep_data and 'dailySleepDTO' in sleep_data:
+        daily = sleep_data['dailySleepDTO']
+
+        # Extraire durée et qualité
+        duration_seconds = daily.get('sleepTimeSeconds', 0)
+        duration_hours = duration_seconds / 3600.0
+
+        # Score de qualité depuis sleepScores si disponible
+        quality_score = 0
+        if 'sleepScores' in sleep_data:
+            quality_score = sleep_data['sleepScores'].get('overall', {}).get('value', 0)
+
+        return {
+            "date": date,
+            "duration_hours": round(duration_hours, 1),
+            "quality_score": quality_score,
+            "deep_sleep_seconds": daily.get('deepSleepSeconds', 0),
+            "light_sleep_seconds": daily.get('lightSleepSeconds', 0),
+            "rem_sleep_seconds": daily.get('remSleepSeconds', 0)
+        }
+
+    return None
+
+
+def _convert_workout(workout_json: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convertit un workout parsé au format Garmin
+
+    Raises:
+        ValueError: Si type de workout non supporté
+    """
+    convert_to_garmin_cycling_workout, convert_to_garmin_running_workout = _get_converters()
+
+    workout_type = workout_json.get('type', '').lower()
+
+    if 'cyclisme' in workout_type or 'cycling' in workout_type:
+        return convert_to_garmin_cycling_workout(workout_json)
+    elif 'course à pied' in workout_type or 'running' in workout_type:
+        return convert_to_garmin_running_workout(workout_json)
+    else:
+        raise ValueError(f"Type de workout non supporté: {workout_type}")
+
 
 class GarminService:
     """Service pour interagir avec Garmin Connect"""
 
-    def __init__(self, email: Optional[str] = None, password: Optional[str] = None):
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        client: Optional["Garmin"] = None
+    ):
         """
         Initialise le service Garmin
 
         Args:
             email: Email Garmin (ou depuis .env GARMIN_EMAIL)
             password: Password Garmin (ou depuis .env GARMIN_PASSWORD)
+            client: Client Garmin déjà authentifié (voir load_session), connect() devient inutile
         """
         self.email = email or os.getenv('GARMIN_EMAIL')
         self.password = password or os.getenv('GARMIN_PASSWORD')
 
-        self.client: Optional[Garmin] = None
-        self._is_authenticated = False
+        self.client: Optional["Garmin"] = client
+        self._is_authenticated = client is not None
+
+        # Infos de la session courante, pour répondre à test_connection sans appel Garmin
+        self._user_name: Optional[str] = None
+        self._auth_expires_at: float = 0
+        if client is not None:
+            self.remember_session()
+        # Le service peut être appelé depuis plusieurs threads : la session
+        # garth (requests.Session) n'est pas garantie thread-safe
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_client(*args) -> "Garmin":
+        """Crée un client Garmin branché sur la session garth partagée (connexions réutilisées)"""
+        client = _garminconnect().Garmin(*args)
+        client.garth.sess = _garth_http_session()
+        return client
+
+    @classmethod
+    def load_session(cls) -> "Garmin":
+        """
+        Crée un client Garmin authentifié depuis la session garth ~/.garth
+
+        Raises:
+            Exception: Si la session est absente ou invalide
+        """
+        client = cls._new_client()
+        client.login(str(GARTH_DIR))
+        return client
+
+    @classmethod
+    def resume_session(cls) -> "Garmin":
+        """
+        Reprend la session garth ~/.garth sans aucun appel réseau
+
+        Les tokens et le profil sont relus depuis le disque ; le token OAuth2
+        n'est rafraîchi (puis resauvegardé) que s'il a expiré.
+
+        Raises:
+            Exception: Si la session ou le profil sont absents ou invalides
+        """
+        profile = orjson.loads(GARMIN_PROFILE_FILE.read_bytes())
+        client = cls._new_client()
+        client.garth.load(str(GARTH_DIR))
+
+        oauth2_token = client.garth.oauth2_token
+        if oauth2_token.expired:
+            client.garth.refresh_oauth2()
+            client.garth.dump(str(GARTH_DIR))
+
+        for field in GARMIN_PROFILE_FIELDS:
+            setattr(client, field, profile.get(field))
+        if not client.display_name:
+            raise ValueError("Profil Garmin sauvegardé incomplet")
+        return client
+
+    def save_session(self) -> None:
+        """Sauvegarde tokens garth et profil du compte pour les prochaines connexions"""
+        self.client.garth.dump(str(GARTH_DIR))
+        profile = {field: getattr(self.client, field, None) for field in GARMIN_PROFILE_FIELDS}
+        GARMIN_PROFILE_FILE.write_bytes(orjson.dumps(profile))
+
+    def remember_session(self, user_name: Optional[str] = None) -> None:
+        """Mémorise le nom d'utilisateur et l'expiration du token OAuth2 courant"""
+        self._user_name = user_name or self.client.get_full_name()
+        oauth2_token = self.client.garth.oauth2_token
+        self._auth_expires_at = getattr(oauth2_token, 'expires_at', 0) or 0
+
+    def session_valid(self) -> bool:
+        """True si la session connue reste valide au moins TOKEN_EXPIRY_MARGIN secondes"""
+        return bool(self._user_name) and time.time() < self._auth_expires_at - TOKEN_EXPIRY_MARGIN
 
     def connect(self) -> bool:
         """
@@ -50,45 +441,66 @@ class GarminService:
             GarminConnectAuthenticationError: Si credentials invalides
             GarminConnectConnectionError: Si problème de connexion
         """
+        garminconnect = _garminconnect()
+
         try:
             logger.info(f"Connexion à Garmin Connect avec {self.email}...")
 
-            # Approche 1 : Essayer de charger session garth existante
+            # Approche 1 : Reprendre la session garth + profil sauvegardés (sans réseau)
+            if GARMIN_PROFILE_FILE.exists():
+                try:
+                    self.client = self.resume_session()
+                    self._is_authenticated = True
+                    self.remember_session()
+                    logger.info("✅ Connexion Garmin réussie (session garth en cache)")
+                    return True
+                except Exception as e:
+                    logger.warning(f"Session garth en cache invalide: {e}")
+
+            # Approche 2 : Charger la session garth existante (valide profil et réglages).
+            # Tokens refusés (401), absents ou corrompus => nouveau login ; une erreur
+            # réseau ou un 429 ferait aussi échouer la connexion directe
             if GARTH_DIR.exists():
                 try:
                     # Créer client Garmin et charger la session depuis ~/.garth
-                    self.client = Garmin()
-                    self.client.login(str(GARTH_DIR))
+                    self.client = self.load_session()
                     self._is_authenticated = True
+                    self.save_session()
+                    self.remember_session()
                     logger.info("✅ Connexion Garmin réussie (session garth)")
                     return True
+                except garminconnect.GarminConnectTooManyRequestsError:
+                    raise
                 except Exception as e:
+                    if _is_network_error(e):
+                        raise
                     logger.warning(f"Session garth invalide: {e}, tentative connexion directe...")
 
-            # Approche 2 : Connexion directe avec credentials (peut nécessiter MFA manuel)
+            # Approche 3 : Connexion directe avec credentials (peut nécessiter MFA manuel)
             if not self.email or not self.password:
                 raise ValueError(
                     "Credentials Garmin manquants et aucune session ~/.garth valide. "
                     "Définir GARMIN_EMAIL et GARMIN_PASSWORD dans .env, puis relancer."
                 )
-            self.client = Garmin(self.email, self.password)
+            self.client = self._new_client(self.email, self.password)
             self.client.login()
 
             # Sauvegarder la session pour utilisation future
             if not GARTH_DIR.exists():
                 GARTH_DIR.mkdir(parents=True, exist_ok=True)
-            self.client.garth.dump(str(GARTH_DIR))
+            self.save_session()
 
             self._is_authenticated = True
+            self.remember_session()
             logger.info("✅ Connexion Garmin réussie")
 
             return True
 
-        except GarminConnectAuthenticationError as e:
+        except garminconnect.GarminConnectAuthenticationError as e:
             logger.error(f"❌ Authentification Garmin échouée: {e}")
             logger.error("💡 Si MFA activé, exécuter script d'auth initial : python scripts/garmin_auth.py")
             raise
-        except GarminConnectConnectionError as e:
+        except garminconnect.GarminConnectConnectionError as e:
             logger.error(f"❌ Erreur de connexion Garmin: {e}")
             raise
 
@@ -100,15 +512,21 @@ class GarminService:
             Dict avec user info et statut connexion
         """
         try:
-            if not self._is_authenticated:
-                self.connect()
+            # Token encore valide : inutile de revérifier auprès de Garmin
+            if self._is_authenticated and self.session_valid():
+                return {
+                    "connected": True,
+                    "user_name": self._user_name,
+                    "message": "Connexion Garmin OK"
+                }
 
-            # Récupérer les infos utilisateur pour tester
-            user_info = self.client.get_full_name()
+            # Session inconnue ou token proche de l'expiration : se réauthentifier
+            self._is_authenticated = False
+            self.connect()
 
             return {
                 "connected": True,
-                "user_name": user_info,
+                "user_name": self._user_name,
                 "message": "Connexion Garmin OK"
             }
 
@@ -140,24 +558,19 @@ class GarminService:
             self.connect()
 
         # Dates par défaut
+        today = datetime.now().date()
         if not end_date:
-            end_date = datetime.now().strftime('%Y-%m-%d')
+            end_date = today.isoformat()
         if not start_date:
-            start_delta = datetime.now() - timedelta(days=7)
-            start_date = start_delta.strftime('%Y-%m-%d')
+            start_date = (today - timedelta(days=7)).isoformat()
 
         try:
-            activities = self.client.get_activities(0, limit)
+            # Filtrage par dates côté Garmin
+            with self._lock:
+                activities = self.client.get_activities_by_date(start_date, end_date)[:limit]
 
-            # Filtrer par dates
-            filtered = []
-            for activity in activities:
-                activity_date = activity.get('startTimeLocal', '')[:10]
-                if start_date <= activity_date <= end_date:
-                    filtered.append(activity)
-
-            logger.info(f"✅ {len(filtered)} activités récupérées ({start_date} à {end_date})")
-            return filtered
+            logger.info(f"✅ {len(activities)} activités récupérées ({start_date} à {end_date})")
+            return activities
 
         except Exception as e:
             logger.error(f"❌ Erreur récupération activités: {e}")
@@ -177,21 +590,17 @@ class GarminService:
             self.connect()
 
         if not date:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = today_str()
 
         try:
             # get_daily_weigh_ins retourne les pesées du jour
-            weight_data = self.client.get_daily_weigh_ins(date)
+            with self._lock:
+                weight_data = self.client.get_daily_weigh_ins(date)
 
-            if weight_data and 'dateWeightList' in weight_data and len(weight_data['dateWeightList']) > 0:
-                # Prendre la dernière pesée du jour
-                latest = weight_data['dateWeightList'][-1]
-                weight_g = latest.get('weight', 0)
-                weight_kg = weight_g / 1000.0  # Garmin retourne en grammes
+            weight_kg = _latest_weight_kg(weight_data)
+            if weight_kg is not None:
                 logger.info(f"✅ Poids récupéré: {weight_kg:.1f} kg pour {date}")
-                return weight_kg
-
-            return None
+            return weight_kg
 
         except Exception as e:
             logger.error(f"❌ Erreur récupération poids: {e}")
@@ -211,44 +620,73 @@ class GarminService:
             self.connect()
 
         if not date:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = today_str()
 
         try:
-            sleep_data = self.client.get_sleep_data(date)
+            with self._lock:
+                sleep_data = self.client.get_sleep_data(date)
 
-            if sleep_data and 'dailySleepDTO' in sleep_data:
-                daily = sleep_data['dailySleepDTO']
+            return _summarize_sleep(date, sleep_data)
 
-                # Extraire durée et qualité
-                duration_seconds = daily.get('sleepTimeSeconds', 0)
-                duration_hours = duration_seconds / 3600.0
+        except Exception as e:
+            logger.error(f"❌ Erreur récupération sommeil: {e}")
+            return None
 
-                # Score de qualité depuis sleepScores si disponible
-                quality_score = 0
-                if 'sleepScores' in sleep_data:
-                    quality_score = sleep_data['sleepScores'].get('overall', {}).get('value', 0)
+    def get_weight_range(self, start_date: str, end_date: str) -> Dict[str, Optional[float]]:
+        """
+        Récupère le poids de chaque jour d'une période en une seule requête
 
-                return {
-                    "date": date,
-                    "duration_hours": round(duration_hours, 1),
-                    "quality_score": quality_score,
-                    "deep_sleep_seconds": daily.get('deepSleepSeconds', 0),
-                    "light_sleep_seconds": daily.get('lightSleepSeconds', 0),
-                    "rem_sleep_seconds": daily.get('remSleepSeconds', 0)
-                }
+        Args:
+            start_date: Date début (YYYY-MM-DD)
+            end_date: Date fin (YYYY-MM-DD), incluse
 
-            return None
+        Returns:
+            Dict {date: poids en kg ou None}
+        """
+        if not self._is_authenticated:
+            self.connect()
+
+        weights: Dict[str, Optional[float]] = dict.fromkeys(date_range(start_date, end_date))
+        try:
+            # weight/range : toutes les pesées de la période en un aller-retour
+            with self._lock:
+                range_data = self.client.get_weigh_ins(start_date, end_date)
+
+            weights.update(_weights_by_day(range_data))
+            logger.info(f"✅ Poids récupérés ({start_date} à {end_date})")
 
         except Exception as e:
-            logger.error(f"❌ Erreur récupération sommeil: {e}")
-            return None
+            logger.error(f"❌ Erreur récupération poids: {e}")
 
-    def upload_workout(self, workout_json: Dict[str, Any]) -> Dict[str, Any]:
+        return weights
+
+    def get_sleep_range(self, start_date: str, end_date: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Récupère les données de sommeil de chaque jour d'une période
+
+        Garmin n'expose dailySleepData que jour par jour : une requête par date,
+        sur la même session.
+
+        Args:
+            start_date: Date début (YYYY-MM-DD)
+            end_date: Date fin (YYYY-MM-DD), incluse
+
+        Returns:
+            Dict {date: résumé du sommeil ou None}
+        """
+        return {date: self.get_sleep(date) for date in date_range(start_date, end_date)}
+
+    def upload_workout(
+        self,
+        workout_json: Dict[str, Any],
+        converted: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Upload un workout vers Garmin Connect
 
         Args:
             workout_json: Structure JSON du workout (format parsé)
+            converted: Workout déjà converti au format Garmin (évite une seconde conversion)
 
         Returns:
             Réponse Garmin avec workout ID
@@ -260,28 +698,374 @@ class GarminService:
             self.connect()
 
         try:
-            # Convertir JSON → format Garmin
-            from src.garmin_workout_converter import (
-                convert_to_garmin_cycling_workout,
-                convert_to_garmin_running_workout
+            garmin_workout = converted if converted is not None else _convert_workout(workout_json)
+            logger.info(f"📤 Upload workout {workout_json['code']} vers Garmin...")
+            # Seul le rafraîchissement du token OAuth2 modifie le client garth :
+            # le POST lui-même passe par le pool keep-alive et peut être concurrent
+            with self._lock:
+                if getattr(self.client.garth.oauth2_token, 'expired', True):
+                    self.client.garth.refresh_oauth2()
+            result = self.client.upload_workout(garmin_workout)
+            logger.info(f"✅ Workout uploadé: ID {result.get('workoutId', 'unknown')}")
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Erreur upload workout: {e}")
+            raise
+
+
+class AsyncGarminService:
+    """
+    Service asynchrone pour les endpoints Garmin utilisés par l'API
+
+    L'authentification (session ~/.garth, login) reste gérée par GarminService ;
+    les requêtes passent ensuite par un httpx.AsyncClient partagé, sans bloquer
+    la boucle d'événements ni consommer un thread par appel.
+    """
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        garmin: Optional[GarminService] = None,
+        redis: Optional["Redis"] = None
+    ):
+        """
+        Args:
+            http: Client httpx partagé (base_url = GARMIN_API_URL)
+            garmin: Service synchrone fournissant les tokens garth
+            redis: Client redis.asyncio pour le cache partagé entre workers (optionnel)
+        """
+        self.http = http
+        self.garmin = garmin or GarminService()
+        self.redis = redis
+        self._auth_lock = asyncio.Lock()
+
+        # Clés Redis : v1:garmin:<type>:<hash email>:<date>
+        email = (self.garmin.email or "").lower().encode()
+        self._user_hash = hashlib.sha256(email).hexdigest()[:16]
+
+    def _redis_key(self, kind: str, *parts: str) -> str:
+        """Clé du cache partagé pour l'utilisateur courant"""
+        return ":".join(("v1", "garmin", kind, self._user_hash, *parts))
+
+    async def _cached(
+        self,
+        cache: Dict,
+        kind: str,
+        parts: Tuple[str, ...],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Cache-aside L1/L2 d'une donnée Garmin ; si parts est non vide, son dernier élément est une date"""
+        return await cache_aside(
+            cache,
+            (kind, *parts),
+            fetch,
+            redis=self.redis,
+            redis_key=self._redis_key(kind, *parts),
+            ttl=_date_ttl(parts[-1]) if parts else CACHE_TTL_DEFAULT
+        )
+
+    async def clear_cache(self) -> int:
+        """
+        Vide le cache en mémoire et le cache Redis de l'utilisateur
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        count = clear_caches()
+
+        if self.redis is not None:
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=self._redis_key("*") + "*")]
+                if keys:
+                    count += await self.redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"⚠️  Cache Redis indisponible: {e}")
+
+        return count
+
+    async def connect(self) -> bool:
+        """
+        Authentifie le client garth sous-jacent (une seule fois)
+
+        Les requêtes concurrentes arrivant avant la fin du login attendent
+        le même verrou au lieu de relancer chacune un login Garmin.
+        """
+        if self.garmin._is_authenticated:
+            return True
+
+        async with self._auth_lock:
+            if not self.garmin._is_authenticated:
+                await asyncio.to_thread(self.garmin.connect)
+        return True
+
+    async def refresh_token(self) -> None:
+        """Rafraîchit le token OAuth2 garth et le sauvegarde dans ~/.garth"""
+        await self.connect()
+        garth_client = self.garmin.client.garth
+
+        async with self._auth_lock:
+            await asyncio.to_thread(garth_client.refresh_oauth2)
+            await asyncio.to_thread(garth_client.dump, str(GARTH_DIR))
+            self.garmin.remember_session()
+
+    async def keep_token_fresh(self, interval: float = TOKEN_REFRESH_INTERVAL) -> None:
+        """
+        Boucle de fond : rafraîchit le token avant expiration, sans bloquer les requêtes
+
+        Avec Redis, chaque worker uvicorn lance cette boucle mais un seul par
+        intervalle (SET NX) rafraîchit et réécrit ~/.garth ; les autres passent
+        leur tour (leur token en mémoire est rafraîchi à la demande par _headers).
+        Redis indisponible : tour passé plutôt que des écritures concurrentes.
+        """
+        # Verrou expirant avant l'intervalle suivant : un seul rafraîchissement par intervalle
+        lock_ttl = max(1, int(interval * 0.9))
+        while True:
+            await asyncio.sleep(interval)
+            if self.redis is not None and not await _redis_try_lock(
+                self.redis, self._redis_key("token_refresh", "lock"), ttl=lock_ttl, unavailable=False
+            ):
+                continue
+            try:
+                await self.refresh_token()
+                logger.info("🔄 Token Garmin rafraîchi")
+            except Exception as e:
+                logger.warning(f"⚠️  Rafraîchissement token Garmin échoué: {e}")
+
+    async def _headers(self) -> Dict[str, str]:
+        """En-têtes d'authentification, avec rafraîchissement du token OAuth2 si expiré"""
+        await self.connect()
+        garth_client = self.garmin.client.garth
+
+        async with self._auth_lock:
+            if garth_client.oauth2_token.expired:
+                await asyncio.to_thread(garth_client.refresh_oauth2)
+                self.garmin.remember_session()
+
+        return {
+            "User-Agent": garth_client.sess.headers.get("User-Agent", ""),
+            "Authorization": f"Bearer {garth_client.oauth2_token.access_token}"
+        }
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        """Requête authentifiée vers l'API Garmin Connect"""
+        headers = await self._headers()
+        response = await self.http.request(method, path, headers=headers, **kwargs)
+        response.raise_for_status()
+
+        if response.status_code == 204 or not response.content:
+            return None
+        return orjson.loads(response.content)
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """
+        Teste la connexion Garmin et retourne les infos utilisateur
+
+        Returns:
+            Dict avec user info et statut connexion
+        """
+        # Token encore valide : inutile de revérifier auprès de Garmin
+        if self.garmin._is_authenticated and self.garmin.session_valid():
+            return {
+                "connected": True,
+                "user_name": self.garmin._user_name,
+                "message": "Connexion Garmin OK"
+            }
+
+        async def fetch_user_name() -> Optional[str]:
+            profile = await self._request("GET", "/userprofile-service/socialProfile")
+            return profile.get('fullName') if profile else None
+
+        try:
+            user_name = await self._cached(_user_cache, "user", (), fetch_user_name)
+            self.garmin.remember_session(user_name)
+
+            return {
+                "connected": True,
+                "user_name": user_name,
+                "message": "Connexion Garmin OK"
+            }
+
+        except Exception as e:
+            return {
+                "connected": False,
+                "error": str(e),
+                "message": "Connexion Garmin échouée"
+            }
+
+    async def get_activities(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère les activités Garmin
+
+        Args:
+            start_date: Date début (YYYY-MM-DD), défaut: aujourd'hui - 7 jours
+            end_date: Date fin (YYYY-MM-DD), défaut: aujourd'hui
+            limit: Nombre max d'activités
+
+        Returns:
+            Liste des activités
+        """
+        # Dates par défaut
+        today = datetime.now().date()
+        if not end_date:
+            end_date = today.isoformat()
+        if not start_date:
+            start_date = (today - timedelta(days=7)).isoformat()
+
+        async def fetch_activities() -> List[Dict[str, Any]]:
+            # Filtrage par dates côté Garmin (même requête que get_activities_by_date)
+            return await self._request(
+                "GET",
+                "/activitylist-service/activities/search/activities",
+                params={"startDate": start_date, "endDate": end_date, "start": 0, "limit": limit}
+            ) or []
+
+        try:
+            # Clé terminée par end_date : sa durée de vie dépend de cette date
+            activities = await self._cached(
+                _activities_cache, "activities", (str(limit), start_date, end_date), fetch_activities
+            )
+
+            logger.info(f"✅ {len(activities)} activités récupérées ({start_date} à {end_date})")
+            return activities
+
+        except Exception as e:
+            logger.error(f"❌ Erreur récupération activités: {e}")
+            raise
+
+    async def get_weight(self, date: Optional[str] = None) -> Optional[float]:
+        """
+        Récupère le poids pour une date
+
+        Args:
+            date: Date (YYYY-MM-DD), défaut: aujourd'hui
+
+        Returns:
+            Poids en kg ou None
+        """
+        if not date:
+            date = today_str()
+
+        async def fetch_weight() -> Optional[float]:
+            weight_data = await self._request(
+                "GET",
+                f"/weight-service/weight/dayview/{date}",
+                params={"includeAll": True}
             )
+            return _latest_weight_kg(weight_data)
+
+        try:
+            weight_kg = await self._cached(_weight_cache, "weight", (date,), fetch_weight)
+            if weight_kg is not None:
+                logger.info(f"✅ Poids récupéré: {weight_kg:.1f} kg pour {date}")
+            return weight_kg
+
+        except Exception as e:
+            logger.error(f"❌ Erreur récupération poids: {e}")
+            return None
+
+    async def get_sleep(self, date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Récupère les données de sommeil
+
+        Args:
+            date: Date (YYYY-MM-DD), défaut: aujourd'hui
+
+        Returns:
+            Dict avec heures et qualité de sommeil
+        """
+        if not date:
+            date = today_str()
+
+        async def fetch_sleep() -> Optional[Dict[str, Any]]:
+            await self.connect()
+            sleep_data = await self._request(
+                "GET",
+                f"/wellness-service/wellness/dailySleepData/{self.garmin.client.display_name}",
+                params={"date": date, "nonSleepBufferMinutes": 60}
+            )
+            return _summarize_sleep(date, sleep_data)
+
+        try:
+            return await self._cached(_sleep_cache, "sleep", (date,), fetch_sleep)
 
-            workout_type = workout_json.get('type', '').lower()
-
-            if 'cyclisme' in workout_type or 'cycling' in workout_type:
-                garmin_workout = convert_to_garmin_cycling_workout(workout_json)
-                logger.info(f"📤 Upload workout {workout_json['code']} vers Garmin...")
-                result = self.client.upload_workout(garmin_workout)
-                logger.info(f"✅ Workout uploadé: ID {result.get('workoutId', 'unknown')}")
-                return result
-            elif 'course à pied' in workout_type or 'running' in workout_type:
-                garmin_workout = convert_to_garmin_running_workout(workout_json)
-                logger.info(f"📤 Upload workout {workout_json['code']} vers Garmin...")
-                result = self.client.upload_workout(garmin_workout)
-                logger.info(f"✅ Workout uploadé: ID {result.get('workoutId', 'unknown')}")
-                return result
-            else:
-                raise ValueError(f"Type de workout non supporté: {workout_type}")
+        except Exception as e:
+            logger.error(f"❌ Erreur récupération sommeil: {e}")
+            return None
+
+    async def _gather_by_date(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        dates: List[str]
+    ) -> Dict[str, Any]:
+        """Exécute fetch(date) pour chaque date en parallèle (RANGE_CONCURRENCY max)"""
+        semaphore = asyncio.Semaphore(RANGE_CONCURRENCY)
+
+        async def one(date: str) -> Any:
+            async with semaphore:
+                return await fetch(date)
+
+        results = await asyncio.gather(*[one(date) for date in dates], return_exceptions=True)
+
+        # Un échec sur une date ne fait pas échouer toute la plage
+        return {
+            date: None if isinstance(result, Exception) else result
+            for date, result in zip(dates, results)
+        }
+
+    async def get_weight_range(self, dates: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Récupère le poids pour plusieurs dates en parallèle
+
+        Args:
+            dates: Dates (YYYY-MM-DD)
+
+        Returns:
+            Dict {date: poids en kg ou None}
+        """
+        return await self._gather_by_date(self.get_weight, dates)
+
+    async def get_sleep_range(self, dates: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Récupère les données de sommeil pour plusieurs dates en parallèle
+
+        Args:
+            dates: Dates (YYYY-MM-DD)
+
+        Returns:
+            Dict {date: données de sommeil ou None}
+        """
+        return await self._gather_by_date(self.get_sleep, dates)
+
+    async def upload_workout(
+        self,
+        workout_json: Dict[str, Any],
+        converted: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload un workout vers Garmin Connect
+
+        Args:
+            workout_json: Structure JSON du workout (format parsé)
+            converted: Workout déjà converti au format Garmin (évite une seconde conversion)
+
+        Returns:
+            Réponse Garmin avec workout ID
+
+        Raises:
+            ValueError: Si type de workout non supporté
+        """
+        try:
+            garmin_workout = converted if converted is not None else _convert_workout(workout_json)
+            logger.info(f"📤 Upload workout {workout_json['code']} vers Garmin...")
+            result = await self._request("POST", "/workout-service/workout", json=garmin_workout)
+            logger.info(f"✅ Workout uploadé: ID {result.get('workoutId', 'unknown')}")
+            return result
 
         except Exception as e:
             logger.error(f"❌ Erreur upload workout: {e}")
@@ -8,16 +8,7 @@ import sys
 import shutil
 from pathlib import Path
 
-# On va utiliser libreoffice en ligne de commande car xlrd ne peut plus écrire
-# Alternative : Utiliser pandas qui peut lire .xls et écrire .xlsx
-
-try:
-    import pandas as pd
-except ImportError:
-    print("❌ pandas non installé. Installation...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas"])
-    import pandas as pd
+from src.excel_converter import stream_xls_to_xlsx
 
 def convert_xls_to_xlsx(xls_path: str, output_path: str = None, backup: bool = True):
     """
@@ -49,18 +40,11 @@ def convert_xls_to_xlsx(xls_path: str, output_path: str = None, backup: bool = T
         print(f"💾 Backup créé : {backup_path.name}")
 
     try:
-        # Lire le fichier .xls avec pandas
-        # pandas utilise xlrd en arrière-plan pour .xls
-        print("📖 Lecture du fichier .xls...")
-        xls = pd.ExcelFile(xls_path, engine='xlrd')
-
-        # Créer le fichier .xlsx avec openpyxl
-        print(f"✍️  Écriture du fichier .xlsx ({len(xls.sheet_names)} feuilles)...")
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for sheet_name in xls.sheet_names:
-                print(f"   - Feuille: {sheet_name}")
-                df = pd.read_excel(xls, sheet_name=sheet_name)
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        # Transcodage direct xlrd → openpyxl (write_only), sans DataFrame
+        print("📖 Lecture du fichier .xls et écriture du .xlsx...")
+        sheets = stream_xls_to_xlsx(xls_file, output_path)
+        for sheet_name, _ in sheets:
+            print(f"   - Feuille: {sheet_name}")
 
         print(f"✅ Conversion réussie : {output_path}")
         return True
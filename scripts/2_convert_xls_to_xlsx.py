@@ -11,7 +11,11 @@ Exemple:
 
 import sys
 from pathlib import Path
-import pandas as pd
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.excel_converter import stream_xls_to_xlsx
 
 
 def convert_xls_to_xlsx(xls_path: str) -> str:
@@ -40,18 +44,12 @@ def convert_xls_to_xlsx(xls_path: str) -> str:
     xlsx_file = xls_file.with_suffix('.xlsx')
 
     try:
-        # Lire le fichier XLS
-        # engine='xlrd' pour lire les vieux formats .xls
-        df_dict = pd.read_excel(xls_file, sheet_name=None, engine='xlrd')
-
-        print(f"   - {len(df_dict)} feuille(s) trouvée(s)")
-
-        # Écrire en XLSX
-        # engine='openpyxl' pour écrire en .xlsx
-        with pd.ExcelWriter(xlsx_file, engine='openpyxl') as writer:
-            for sheet_name, df in df_dict.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                print(f"   - Feuille '{sheet_name}': {len(df)} lignes")
+        # Transcodage direct xlrd → openpyxl (write_only), sans DataFrame
+        sheets = stream_xls_to_xlsx(xls_file, xlsx_file)
+
+        print(f"   - {len(sheets)} feuille(s) trouvée(s)")
+        for sheet_name, nrows in sheets:
+            print(f"   - Feuille '{sheet_name}': {nrows} lignes")
 
         print(f"✅ Conversion réussie: {xlsx_file.name}")
         print(f"   Taille: {xlsx_file.stat().st_size / 1024:.1f} KB")
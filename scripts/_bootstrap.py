@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Installe les dépendances manquantes des scripts de remplissage Excel / Google Sheets
+
+Les scripts n'installent plus rien au lancement : une dépendance absente lève
+ImportError avec la commande à exécuter. Ce script est à lancer une fois,
+explicitement (en CI, utiliser requirements.txt).
+
+Usage:
+    python -m scripts._bootstrap [excel] [sheets]
+"""
+
+import sys
+import argparse
+import subprocess
+from importlib.util import find_spec
+
+# Groupe → {module importé: paquet pip}
+DEPENDENCY_GROUPS = {
+    'excel': {
+        'openpyxl': 'openpyxl',
+    },
+    'sheets': {
+        'googleapiclient': 'google-api-python-client',
+        'google_auth_httplib2': 'google-auth-httplib2',
+        'google_auth_oauthlib': 'google-auth-oauthlib',
+    },
+}
+
+
+def missing_packages(groups) -> list:
+    """Paquets pip des groupes dont le module n'est pas importable"""
+    return [
+        package
+        for group in groups
+        for module, package in DEPENDENCY_GROUPS[group].items()
+        if find_spec(module) is None
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Installe les dépendances des scripts de remplissage")
+    parser.add_argument('groups', nargs='*', choices=sorted(DEPENDENCY_GROUPS),
+                        help="Groupes à installer (défaut: tous)")
+    args = parser.parse_args()
+
+    packages = missing_packages(args.groups or DEPENDENCY_GROUPS)
+    if not packages:
+        print("✅ Dépendances déjà installées")
+        return
+
+    print(f"📦 Installation: {', '.join(packages)}")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *packages])
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Installation impossible: {e}")
+        sys.exit(1)
+    print("✅ Dépendances installées")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Session garth partagée par les scripts d'authentification Garmin
+
+garmin_auth.py, garmin_auth_file_mfa.py, garmin_auth_manual_mfa.py et
+garmin_auth_no_mfa.py ne diffèrent que par la saisie du code MFA (et les
+messages d'erreur pour le dernier) : reprise de ~/.garth, connexion,
+sauvegarde des tokens et messages sont regroupés ici.
+
+Usage:
+    from _garmin_session import run_auth
+    run_auth("Authentification Garmin Connect", prompt_mfa=ma_saisie_mfa)
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+import garth
+from garth.exc import GarthException, GarthHTTPError
+
+# Charger .env
+load_dotenv()
+
+GARMIN_EMAIL = os.getenv('GARMIN_EMAIL')
+GARMIN_PASSWORD = os.getenv('GARMIN_PASSWORD')
+GARTH_DIR = Path.home() / ".garth"
+
+# Explication des statuts HTTP renvoyés par le SSO Garmin au login
+HTTP_STATUS_HINTS = {
+    401: "🔒 Identifiants refusés par Garmin (401)",
+    403: "⛔ Accès refusé par Garmin (403)",
+    429: "⏳ Trop de tentatives de connexion, réessayer plus tard (429)",
+}
+
+# Marqueurs d'une exception garth liée au MFA
+MFA_MARKERS = ('mfa', 'verification')
+
+
+def http_status(error: GarthHTTPError) -> Optional[int]:
+    """Statut HTTP de la réponse en erreur (None si pas de réponse)"""
+    return getattr(error.error.response, 'status_code', None)
+
+
+def is_mfa_error(error: GarthException) -> bool:
+    """True si l'exception garth signale une étape MFA"""
+    msg = error.msg.lower()
+    return any(marker in msg for marker in MFA_MARKERS)
+
+
+def resume_session() -> Optional[garth.Client]:
+    """Reprend la session ~/.garth, None si absente ou invalide"""
+    if not GARTH_DIR.exists():
+        return None
+
+    print("📂 Session garth existante trouvée, tentative de reprise...")
+    try:
+        garth.resume(str(GARTH_DIR))
+    except Exception as e:
+        print(f"⚠️  Session invalide ({e}), nouvelle connexion nécessaire...")
+        print()
+        return None
+
+    return garth.client
+
+
+def login_session(prompt_mfa: Optional[Callable[[], Optional[str]]] = None) -> garth.Client:
+    """
+    Nouvelle connexion (MFA via prompt_mfa, défaut : invite input() de garth) puis sauvegarde dans ~/.garth
+    """
+    if prompt_mfa is None:
+        garth.login(GARMIN_EMAIL, GARMIN_PASSWORD)
+    else:
+        garth.login(GARMIN_EMAIL, GARMIN_PASSWORD, prompt_mfa=prompt_mfa)
+    garth.save(str(GARTH_DIR))
+    return garth.client
+
+
+def run_auth(title: str, prompt_mfa: Optional[Callable[[], Optional[str]]] = None,
+             login_hint: str = "Si MFA activé, entrer le code à l'invite") -> None:
+    """Déroulé commun des scripts d'authentification (messages, reprise, connexion, erreurs)"""
+    if not GARMIN_EMAIL or not GARMIN_PASSWORD:
+        print("❌ GARMIN_EMAIL ou GARMIN_PASSWORD manquant dans .env")
+        sys.exit(1)
+
+    print(f"🔐 {title}")
+    print(f"📧 Email: {GARMIN_EMAIL}")
+    print()
+
+    try:
+        if resume_session() is not None:
+            print("✅ Session garth reprise avec succès!")
+            print(f"👤 Connecté en tant que: {GARMIN_EMAIL}")
+            return
+
+        print("🔑 Connexion en cours...")
+        print(f"💡 {login_hint}")
+        print()
+
+        login_session(prompt_mfa)
+
+        print()
+        print("="*70)
+        print("✅ AUTHENTIFICATION RÉUSSIE!")
+        print("="*70)
+        print(f"📁 Tokens sauvegardés dans {GARTH_DIR}")
+        print()
+        print("💡 L'API peut maintenant se connecter sans MFA")
+        print("   Les tokens sont valides pendant ~1 an")
+        print()
+        print("🎯 Prochaine étape:")
+        print("   python scripts/test_upload_c16.py")
+
+    except KeyboardInterrupt:
+        print("\n⚠️  Authentification annulée")
+        sys.exit(1)
+    except GarthHTTPError as e:
+        print(f"\n❌ Erreur: {e}")
+        print(HTTP_STATUS_HINTS.get(http_status(e), "💡 Vérifiez la connexion internet et réessayez"))
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Erreur: {e}")
+        print()
+        print("💡 Vérifiez:")
+        print("   1. Email/password corrects dans .env")
+        print("   2. Code MFA valide (essayez à nouveau)")
+        print("   3. Connexion internet stable")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
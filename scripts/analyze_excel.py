@@ -18,14 +18,22 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "xlrd"])
     import xlrd
 
+# Formatage de l'aperçu selon le type xlrd de la cellule (str par défaut)
+_FORMATTERS = {
+    xlrd.XL_CELL_EMPTY: lambda value: "",
+    xlrd.XL_CELL_TEXT: lambda value: value,
+    xlrd.XL_CELL_NUMBER: str,
+    xlrd.XL_CELL_DATE: lambda value: f"DATE({value})",
+}
+
 EXCEL_FILE = Path("/Users/aptsdae/Documents/Triathlon/S06_Delalain C_2026.xls")
 
 print("📊 Analyse du fichier Excel S06")
 print("=" * 70)
 print()
 
-# Ouvrir le fichier Excel
-workbook = xlrd.open_workbook(str(EXCEL_FILE))
+# Ouvrir le fichier Excel (on_demand : les feuilles sont chargées une à une)
+workbook = xlrd.open_workbook(str(EXCEL_FILE), on_demand=True)
 
 print(f"📁 Fichier: {EXCEL_FILE.name}")
 print(f"📑 Nombre de feuilles: {workbook.nsheets}")
@@ -45,23 +53,11 @@ for sheet_idx in range(workbook.nsheets):
     print("   " + "-" * 66)
 
     for row_idx in range(min(20, sheet.nrows)):
-        row_data = []
-        for col_idx in range(sheet.ncols):
-            cell = sheet.cell(row_idx, col_idx)
-
-            # Formater la valeur selon le type
-            if cell.ctype == xlrd.XL_CELL_EMPTY:
-                value = ""
-            elif cell.ctype == xlrd.XL_CELL_TEXT:
-                value = cell.value
-            elif cell.ctype == xlrd.XL_CELL_NUMBER:
-                value = str(cell.value)
-            elif cell.ctype == xlrd.XL_CELL_DATE:
-                value = f"DATE({cell.value})"
-            else:
-                value = str(cell.value)
-
-            row_data.append(value)
+        # Ligne entière en un appel, formatée selon le type de chaque cellule
+        row_data = [
+            _FORMATTERS.get(ctype, str)(value)
+            for value, ctype in zip(sheet.row_values(row_idx), sheet.row_types(row_idx))
+        ]
 
         # Afficher la ligne
         print(f"   Ligne {row_idx + 1:2d}: {row_data}")
@@ -69,8 +65,13 @@ for sheet_idx in range(workbook.nsheets):
     if sheet.nrows > 20:
         print(f"   ... ({sheet.nrows - 20} lignes supplémentaires)")
 
+    # Libérer la feuille avant de charger la suivante
+    workbook.unload_sheet(sheet_idx)
+
     print()
     print()
 
+workbook.release_resources()
+
 print("=" * 70)
 print("✅ Analyse terminée")
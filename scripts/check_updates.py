@@ -12,55 +12,71 @@ Usage:
 import subprocess
 import sys
 import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+PYPI_JSON_URL = "https://pypi.org/pypi/{package}/json"
+PYPI_TIMEOUT = 10
 
-def get_installed_version(package: str) -> str:
-    """Récupère la version installée d'un package."""
-    try:
-        result = subprocess.run(
-            ["pip", "show", package],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        for line in result.stdout.split('\n'):
-            if line.startswith('Version:'):
-                return line.split(':', 1)[1].strip()
-    except subprocess.CalledProcessError:
-        return "NOT_INSTALLED"
-    return "UNKNOWN"
-
-
-def get_latest_version(package: str) -> str:
-    """Récupère la dernière version disponible sur PyPI."""
+
+def _normalize(name: str) -> str:
+    """Nom de package normalisé (PEP 503) pour les comparaisons."""
+    return name.lower().replace('_', '-').replace('.', '-')
+
+
+def pip_list(*args: str) -> dict[str, dict]:
+    """Un seul appel `pip list --format=json`, indexé par nom normalisé."""
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "list", "--format=json", *args],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return {_normalize(p["name"]): p for p in json.loads(result.stdout)}
+
+
+def pypi_latest_version(package: str) -> str:
+    """Dernière version publiée sur PyPI (API JSON), sans passer par pip."""
     try:
-        result = subprocess.run(
-            ["pip", "index", "versions", package],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        for line in result.stdout.split('\n'):
-            if 'LATEST:' in line:
-                return line.split('LATEST:', 1)[1].strip()
-    except subprocess.CalledProcessError:
+        with urllib.request.urlopen(PYPI_JSON_URL.format(package=package), timeout=PYPI_TIMEOUT) as response:
+            return json.load(response)["info"]["version"]
+    except (OSError, ValueError, KeyError):
         return "UNKNOWN"
-    return "UNKNOWN"
+
+
+def pypi_latest_versions(packages: list[str]) -> dict[str, str]:
+    """Interroge PyPI en parallèle : un aller-retour réseau au lieu de N."""
+    if not packages:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(packages)) as executor:
+        return dict(zip(packages, executor.map(pypi_latest_version, packages)))
 
 
 def check_package_updates(packages: list[str]) -> dict:
     """
     Vérifie les mises à jour pour une liste de packages.
 
+    Un seul appel pip (versions installées) ; la dernière version de chaque
+    package vient de l'API JSON PyPI, interrogée en parallèle. PyPI injoignable :
+    dernière version UNKNOWN (pip list --outdated renverrait alors [] sans
+    erreur, ce qui ferait passer tout le monde pour à jour).
+
     Returns:
         Dict avec status de chaque package
     """
+    try:
+        installed_packages = pip_list()
+    except (subprocess.CalledProcessError, json.JSONDecodeError):
+        installed_packages = {}
+    latest_versions = pypi_latest_versions(packages)
+
     results = {}
 
     for package in packages:
-        installed = get_installed_version(package)
-        latest = get_latest_version(package)
+        installed_info = installed_packages.get(_normalize(package))
+        installed = installed_info["version"] if installed_info else "NOT_INSTALLED"
+        latest = latest_versions.get(package, "UNKNOWN")
 
         needs_update = installed != latest and latest != "UNKNOWN"
 
@@ -91,13 +107,20 @@ def main():
     results = check_package_updates(critical_packages)
 
     has_updates = False
+    has_unknown = False
 
     for package, info in results.items():
         installed = info["installed"]
         latest = info["latest"]
         needs_update = info["needs_update"]
 
-        status_emoji = "⚠️" if needs_update else "✅"
+        if needs_update:
+            status_emoji = "⚠️"
+        elif latest == "UNKNOWN":
+            status_emoji = "❓"
+            has_unknown = True
+        else:
+            status_emoji = "✅"
 
         print(f"{status_emoji} {package:20s} {installed:15s} → {latest:15s}")
 
@@ -119,6 +142,9 @@ def main():
         print("  pip install --upgrade -r requirements.txt")
 
         sys.exit(1)  # Exit code 1 pour indiquer des mises à jour disponibles
+    elif has_unknown:
+        print("❓ Dernières versions inconnues (PyPI injoignable ?) : vérification incomplète")
+        sys.exit(0)
     else:
         print("✅ Toutes les dépendances sont à jour !")
         sys.exit(0)
@@ -26,18 +26,55 @@ Exemples:
     python scripts/clawdbot_workflow.py --action prepare_email --file "S07_carnet_entrainement.xlsx"
 """
 
+import os
 import sys
+import re
+import functools
 import argparse
 from pathlib import Path
-import json
+import orjson
 from datetime import datetime
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.pdf_parser_v3 import TriathlonPDFParserV3
-import pandas as pd
+# Uploads Garmin simultanés (requests relâche le GIL pendant les I/O)
+UPLOAD_WORKERS = 8
+
+# Numéro de semaine dans un nom de fichier (ex: "S07_carnet_entrainement.xls" → "S07")
+_WEEK_RE = re.compile(r'(S\d+)')
+
+
+@functools.lru_cache(maxsize=1)
+def _garmin():
+    """
+    GarminService connecté, partagé par toutes les actions du processus
+
+    connect() réutilise la session ~/.garth si elle est valide et la sauvegarde
+    après un login complet : les processus suivants évitent aussi l'OAuth.
+    """
+    from api.services.garmin_service import GarminService
+
+    garmin = GarminService()
+    garmin.connect()
+    return garmin
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(directory: Path) -> Path:
+    """Crée le dossier au premier appel seulement (par processus)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Écrit le JSON dans un fichier temporaire voisin puis le renomme (os.replace)"""
+    _ensure_dir(path.parent)
+    tmp = path.with_suffix('.json.tmp')
+    tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, path)
 
 
 def parse_workouts_from_pdf(pdf_path: str) -> dict:
@@ -89,7 +126,7 @@ def parse_workouts_from_pdf(pdf_path: str) -> dict:
                 text=True,
             )
             if completed.returncode == 0 and output_json.exists():
-                parsed = json.loads(output_json.read_text(encoding="utf-8"))
+                parsed = orjson.loads(output_json.read_bytes())
                 return {
                     "success": True,
                     "parser_mode": "docker",
@@ -105,12 +142,12 @@ def parse_workouts_from_pdf(pdf_path: str) -> dict:
 
     # 2) Fallback local (comportement historique)
     try:
+        # Import tardif : pdfplumber n'est chargé que si Docker a échoué
+        from src.pdf_parser_v3 import TriathlonPDFParserV3
+
         with TriathlonPDFParserV3(str(pdf_file)) as parser:
             parsed = parser.parse()
-        output_json.write_text(
-            json.dumps(parsed, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        output_json.write_bytes(orjson.dumps(parsed, option=orjson.OPT_INDENT_2))
         return {
             "success": True,
             "parser_mode": "local",
@@ -135,7 +172,6 @@ def upload_workouts(pdf_path: str) -> dict:
     print(f"   Fichier: {pdf_path}\n")
 
     try:
-        from api.services.garmin_service import GarminService
         from src.garmin_workout_converter import (
             convert_to_garmin_cycling_workout,
             convert_to_garmin_running_workout,
@@ -161,47 +197,49 @@ def upload_workouts(pdf_path: str) -> dict:
 
     # Connexion Garmin
     print("🔐 Connexion Garmin Connect...")
-    garmin = GarminService()
-    garmin.connect()
+    try:
+        garmin = _garmin()
+    except ModuleNotFoundError as e:
+        return {"success": False, "error": f"Dépendance upload manquante: {e}"}
 
     uploaded = []
     skipped = []
     errors = []
 
-    # Upload cyclisme
-    for workout in result['workouts']:
-        if workout['type'] == 'Cyclisme' and workout.get('intervals'):
-            code = workout['code']
-            try:
-                garmin_workout = convert_to_garmin_cycling_workout(workout)
-                upload_result = garmin.client.upload_workout(garmin_workout)
-                workout_id = upload_result.get('workoutId', 'unknown')
-
-                uploaded.append({
-                    'code': code,
-                    'type': 'Cyclisme',
-                    'workout_id': workout_id
-                })
-                print(f"✅ {code} (Cyclisme) → ID: {workout_id}")
-            except Exception as e:
-                errors.append({'code': code, 'error': str(e)})
-                print(f"❌ {code} erreur: {e}")
-
-    # Upload course
-    for workout in result['workouts']:
-        if workout['type'] == 'Course à pied' and workout.get('intervals'):
-            code = workout['code']
+    # Conversion d'abord (CPU, rapide), puis uploads en parallèle (I/O réseau)
+    to_upload = []
+    for workout_type, label, convert in (
+        ('Cyclisme', 'Cyclisme', convert_to_garmin_cycling_workout),
+        ('Course à pied', 'Course', convert_to_garmin_running_workout),
+    ):
+        for workout in result['workouts']:
+            if workout['type'] == workout_type and workout.get('intervals'):
+                code = workout['code']
+                try:
+                    to_upload.append((workout, workout_type, label, convert(workout)))
+                except Exception as e:
+                    errors.append({'code': code, 'error': str(e)})
+                    print(f"❌ {code} erreur: {e}")
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {
+            # Via le service : rafraîchissement OAuth2 sérialisé entre les threads
+            executor.submit(garmin.upload_workout, workout, converted=garmin_workout): (
+                workout['code'], workout_type, label
+            )
+            for workout, workout_type, label, garmin_workout in to_upload
+        }
+        # Résultats dans l'ordre de soumission (cyclisme puis course)
+        for future, (code, workout_type, label) in futures.items():
             try:
-                garmin_workout = convert_to_garmin_running_workout(workout)
-                upload_result = garmin.client.upload_workout(garmin_workout)
-                workout_id = upload_result.get('workoutId', 'unknown')
+                workout_id = future.result().get('workoutId', 'unknown')
 
                 uploaded.append({
                     'code': code,
-                    'type': 'Course à pied',
+                    'type': workout_type,
                     'workout_id': workout_id
                 })
-                print(f"✅ {code} (Course) → ID: {workout_id}")
+                print(f"✅ {code} ({label}) → ID: {workout_id}")
             except Exception as e:
                 errors.append({'code': code, 'error': str(e)})
                 print(f"❌ {code} erreur: {e}")
@@ -216,15 +254,14 @@ def upload_workouts(pdf_path: str) -> dict:
         'uploaded': uploaded,
         'skipped': skipped,
         'errors': errors,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now()
     }
 
     print(f"\n📊 Résumé: {len(uploaded)} séances uploadées")
 
     # Sauvegarder résultat
     result_file = Path(f"data/workouts_cache/{week}_upload_result.json")
-    with open(result_file, 'w') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    result_file.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     return summary
 
@@ -272,9 +309,9 @@ def fill_excel(xls_path: str, google_drive_id: str = None) -> dict:
     print(f"   Fichier: {xls_path}\n")
 
     try:
-        from api.services.garmin_service import GarminService
+        from src.excel_converter import convert_and_open
     except ModuleNotFoundError as e:
-        return {"success": False, "error": f"Dépendance Garmin manquante: {e}"}
+        return {"success": False, "error": f"Dépendance manquante: {e}"}
 
     xls_file = Path(xls_path)
     if not xls_file.exists():
@@ -285,29 +322,34 @@ def fill_excel(xls_path: str, google_drive_id: str = None) -> dict:
     xlsx_file = xls_file.with_suffix('.xlsx')
 
     try:
-        df_dict = pd.read_excel(xls_file, sheet_name=None, engine='xlrd')
-        with pd.ExcelWriter(xlsx_file, engine='openpyxl') as writer:
-            for sheet_name, df in df_dict.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-        print(f"✅ Converti: {xlsx_file.name}")
+        # Classeur gardé en mémoire jusqu'au remplissage : une seule sauvegarde
+        workbook = convert_and_open(xls_file)
+        print(f"✅ Converti en mémoire: {xlsx_file.name}")
     except Exception as e:
         return {"success": False, "error": f"Échec conversion: {e}"}
 
+    def converted_only(error: str) -> dict:
+        """Échec avant remplissage : le XLSX converti (non rempli) est tout de même écrit"""
+        try:
+            workbook.save(xlsx_file)
+            print(f"💾 XLSX converti sauvegardé (non rempli): {xlsx_file.name}")
+        except Exception as e:
+            error = f"{error} (sauvegarde XLSX impossible: {e})"
+        return {"success": False, "error": error, "xlsx_path": str(xlsx_file)}
+
     # Étape 2: Récupération données Garmin
     print("\n📡 Étape 2/3: Récupération données Garmin...")
 
     # Extraire numéro de semaine depuis nom fichier
     # Ex: "S07_carnet_entrainement.xls" → "S07"
-    import re
-    week_match = re.search(r'(S\d+)', xls_file.name)
+    week_match = _WEEK_RE.search(xls_file.name)
     week = week_match.group(1) if week_match else None
 
     if not week:
-        return {"success": False, "error": "Impossible d'extraire le numéro de semaine"}
+        return converted_only("Impossible d'extraire le numéro de semaine")
 
     try:
-        garmin = GarminService()
-        garmin.connect()
+        garmin = _garmin()
 
         # TODO: Récupérer les données de la semaine
         # - Activités cyclisme/course/natation
@@ -317,16 +359,17 @@ def fill_excel(xls_path: str, google_drive_id: str = None) -> dict:
         print(f"✅ Données récupérées pour {week}")
 
     except Exception as e:
-        return {"success": False, "error": f"Échec récupération Garmin: {e}"}
+        return converted_only(f"Échec récupération Garmin: {e}")
 
     # Étape 3: Remplissage Excel
     print("\n✍️  Étape 3/3: Remplissage Excel...")
 
     try:
         # TODO: Implémenter remplissage Excel
-        # - Mapper données Garmin → colonnes Excel
+        # - Mapper données Garmin → colonnes Excel (workbook[...].cell(row, col).value = ...)
         # - Remplir durées, distances, FC, etc.
 
+        workbook.save(xlsx_file)
         print(f"✅ Excel rempli: {xlsx_file.name}")
 
     except Exception as e:
@@ -362,8 +405,7 @@ def prepare_email(xlsx_path: str, recipient: str = "stephane.palazzetti@*") -> d
         return {"success": False, "error": f"XLSX introuvable: {xlsx_path}"}
 
     # Extraire semaine
-    import re
-    week_match = re.search(r'(S\d+)', xlsx_file.name)
+    week_match = _WEEK_RE.search(xlsx_file.name)
     week = week_match.group(1) if week_match else "SXX"
 
     # Extraire dates depuis nom fichier si possible
@@ -395,10 +437,8 @@ Généré automatiquement par Garmin Automation
 
     # Sauvegarder brouillon
     draft_file = Path(f"data/email_drafts/{week}_email_draft.json")
-    draft_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(draft_file, 'w') as f:
-        json.dump(email_draft, f, indent=2, ensure_ascii=False)
+    # Écriture atomique : jamais de brouillon tronqué si deux workflows se chevauchent
+    _write_json_atomic(draft_file, email_draft)
 
     print(f"✅ Brouillon email préparé:")
     print(f"   Destinataire: {recipient}")
@@ -8,6 +8,10 @@ ce script peut extraire les tokens OAuth pour les réutiliser.
 IMPORTANT: Vous devez être DÉJÀ CONNECTÉ à https://connect.garmin.com
 dans votre navigateur avant d'exécuter ce script.
 
+Si browser_cookie3 est installé (pip install browser-cookie3), les cookies
+sont lus directement dans le navigateur, sans interaction ; sinon la
+méthode manuelle (copier-coller depuis les DevTools) est proposée.
+
 Usage:
     python scripts/extract_browser_tokens.py
 """
@@ -17,6 +21,37 @@ import sys
 from pathlib import Path
 import json
 
+# Lecture automatique des cookies navigateur (optionnelle)
+try:
+    import browser_cookie3
+except ImportError:
+    browser_cookie3 = None
+
+OAUTH_COOKIES = ("OAuth_token", "OAuth_token_secret")
+
+
+def load_browser_tokens():
+    """
+    Lit les cookies OAuth Garmin dans les navigateurs (Chrome, Firefox, Safari...)
+
+    Returns:
+        (oauth_token, oauth_token_secret) ou None si introuvables
+    """
+    if browser_cookie3 is None:
+        return None
+
+    try:
+        cookie_jar = browser_cookie3.load(domain_name="garmin.com")
+    except Exception as e:
+        print(f"⚠️  Lecture des cookies navigateur impossible: {e}")
+        return None
+
+    cookies = {cookie.name: cookie.value for cookie in cookie_jar if cookie.name in OAUTH_COOKIES}
+    if all(cookies.get(name) for name in OAUTH_COOKIES):
+        return cookies["OAuth_token"], cookies["OAuth_token_secret"]
+    return None
+
+
 print("🔍 Extraction des tokens Garmin depuis le navigateur")
 print()
 print("⚠️  PRÉREQUIS:")
@@ -24,52 +59,62 @@ print("   Vous devez être DÉJÀ CONNECTÉ à https://connect.garmin.com")
 print("   dans votre navigateur (Chrome, Firefox, Safari)")
 print()
 
-# Vérifier si déjà connecté
-response = input("Êtes-vous actuellement connecté à Garmin Connect dans votre navigateur? (o/n): ").lower()
-if response != 'o':
+browser_tokens = load_browser_tokens()
+if browser_tokens:
+    print("✅ Cookies OAuth trouvés automatiquement dans le navigateur")
+    oauth_token, oauth_token_secret = browser_tokens
+else:
+    # Méthode manuelle si l'extraction automatique n'a rien donné
+    if browser_cookie3 is None:
+        print("💡 pip install browser-cookie3 pour extraire les cookies automatiquement")
+        print()
+
+    # Vérifier si déjà connecté
+    response = input("Êtes-vous actuellement connecté à Garmin Connect dans votre navigateur? (o/n): ").lower()
+    if response != 'o':
+        print()
+        print("📱 Pour contourner le problème MFA:")
+        print()
+        print("1. Ouvrez votre navigateur")
+        print("2. Allez sur https://connect.garmin.com")
+        print("3. Connectez-vous (même avec MFA qui ne fonctionne pas)")
+        print("   - Si le MFA bloque, essayez:")
+        print("     • Désactiver temporairement le MFA dans les paramètres du compte")
+        print("     • Utiliser un autre appareil où vous êtes déjà connecté")
+        print("     • Contacter le support Garmin pour le problème MFA")
+        print()
+        sys.exit(1)
+
     print()
-    print("📱 Pour contourner le problème MFA:")
+    print("=" * 70)
+    print("MÉTHODE MANUELLE - Extraction des cookies")
+    print("=" * 70)
     print()
-    print("1. Ouvrez votre navigateur")
-    print("2. Allez sur https://connect.garmin.com")
-    print("3. Connectez-vous (même avec MFA qui ne fonctionne pas)")
-    print("   - Si le MFA bloque, essayez:")
-    print("     • Désactiver temporairement le MFA dans les paramètres du compte")
-    print("     • Utiliser un autre appareil où vous êtes déjà connecté")
-    print("     • Contacter le support Garmin pour le problème MFA")
+    print("Suivez ces étapes dans votre navigateur:")
+    print()
+    print("1. Allez sur https://connect.garmin.com (où vous êtes connecté)")
+    print()
+    print("2. Ouvrez les DevTools:")
+    print("   Chrome/Edge: Cmd+Option+I (Mac) ou F12 (Windows)")
+    print("   Firefox: Cmd+Option+I (Mac) ou F12 (Windows)")
+    print("   Safari: Cmd+Option+I (après avoir activé le menu Développeur)")
+    print()
+    print("3. Allez dans l'onglet 'Application' (Chrome) ou 'Storage' (Firefox)")
+    print()
+    print("4. Dans le menu de gauche:")
+    print("   → Cookies")
+    print("   → https://connect.garmin.com")
+    print()
+    print("5. Cherchez ces cookies et copiez leurs VALEURS:")
+    print()
+    print("   Cookie 'OAuth_token_secret' → Valeur: _____________")
+    print("   Cookie 'OAuth_token' → Valeur: _____________")
+    print()
+    print("6. Collez ces valeurs ci-dessous:")
     print()
-    sys.exit(1)
-
-print()
-print("=" * 70)
-print("MÉTHODE MANUELLE - Extraction des cookies")
-print("=" * 70)
-print()
-print("Suivez ces étapes dans votre navigateur:")
-print()
-print("1. Allez sur https://connect.garmin.com (où vous êtes connecté)")
-print()
-print("2. Ouvrez les DevTools:")
-print("   Chrome/Edge: Cmd+Option+I (Mac) ou F12 (Windows)")
-print("   Firefox: Cmd+Option+I (Mac) ou F12 (Windows)")
-print("   Safari: Cmd+Option+I (après avoir activé le menu Développeur)")
-print()
-print("3. Allez dans l'onglet 'Application' (Chrome) ou 'Storage' (Firefox)")
-print()
-print("4. Dans le menu de gauche:")
-print("   → Cookies")
-print("   → https://connect.garmin.com")
-print()
-print("5. Cherchez ces cookies et copiez leurs VALEURS:")
-print()
-print("   Cookie 'OAuth_token_secret' → Valeur: _____________")
-print("   Cookie 'OAuth_token' → Valeur: _____________")
-print()
-print("6. Collez ces valeurs ci-dessous:")
-print()
 
-oauth_token = input("OAuth_token (valeur complète): ").strip()
-oauth_token_secret = input("OAuth_token_secret (valeur complète): ").strip()
+    oauth_token = input("OAuth_token (valeur complète): ").strip()
+    oauth_token_secret = input("OAuth_token_secret (valeur complète): ").strip()
 
 if not oauth_token or not oauth_token_secret:
     print("\n❌ Tokens manquants!")
@@ -9,7 +9,7 @@ Usage:
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-import json
+import orjson
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -42,24 +42,32 @@ print()
 print("📥 Récupération des données...")
 print()
 
-daily_data = []
+# Jours de la semaine jusqu'à aujourd'hui, formatés une seule fois
+week_days = [
+    monday + timedelta(days=i)
+    for i in range((min(today, sunday).date() - monday.date()).days + 1)
+]
+date_strs = [day.strftime('%Y-%m-%d') for day in week_days]
+day_names = [day.strftime('%A') for day in week_days]  # Monday, Tuesday, etc.
+
+# Poids en une requête pour toute la semaine, sommeil sur la même session
+weights = service.get_weight_range(date_strs[0], date_strs[-1])
+sleeps = service.get_sleep_range(date_strs[0], date_strs[-1])
 
-current_date = monday
-while current_date <= min(today, sunday):
-    date_str = current_date.strftime('%Y-%m-%d')
-    day_name = current_date.strftime('%A')  # Monday, Tuesday, etc.
+daily_data = []
 
+for current_date, date_str, day_name in zip(week_days, date_strs, day_names):
     print(f"📆 {day_name} {current_date.strftime('%d/%m/%Y')}")
 
-    # Récupérer poids
-    weight = service.get_weight(date_str)
+    # Poids
+    weight = weights.get(date_str)
     if weight:
         print(f"   ⚖️  Poids: {weight:.1f} kg")
     else:
         print(f"   ⚖️  Poids: Non disponible")
 
-    # Récupérer sommeil
-    sleep = service.get_sleep(date_str)
+    # Sommeil
+    sleep = sleeps.get(date_str)
     if sleep:
         hours = sleep['duration_hours']
         quality = sleep['quality_score']
@@ -75,14 +83,12 @@ while current_date <= min(today, sunday):
     })
 
     print()
-    current_date += timedelta(days=1)
 
 # Sauvegarder les données
 output_file = Path(__file__).parent.parent / "data" / "garmin_current_week.json"
 output_file.parent.mkdir(parents=True, exist_ok=True)
 
-with open(output_file, 'w') as f:
-    json.dump(daily_data, f, indent=2, ensure_ascii=False)
+output_file.write_bytes(orjson.dumps(daily_data, option=orjson.OPT_INDENT_2))
 
 print("=" * 70)
 print(f"💾 Données sauvegardées: {output_file}")
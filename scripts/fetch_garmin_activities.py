@@ -5,19 +5,30 @@ Récupère les activités Garmin Connect pour une période donnée
 Utilise l'API Garmin Connect pour fetcher toutes les activités de la semaine S06
 (02/02/2026 au 08/02/2026) et affiche les données (distance, durée, calories, etc.)
 
+Les réponses Garmin sont gardées en cache disque (data/cache/garmin_api) : une
+relance sur la même semaine n'interroge pas Garmin avant --cache-ttl secondes.
+
 Usage:
-    python scripts/fetch_garmin_activities.py
+    python scripts/fetch_garmin_activities.py [--cache-ttl SECONDES]
 """
 
 import sys
+import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-import json
+import orjson
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.services.garmin_service import GarminService
+from src.disk_cache import DiskCache, DEFAULT_CACHE_TTL
+
+parser = argparse.ArgumentParser(description="Récupère les activités Garmin de la semaine S06")
+parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                    help=f"Durée de validité du cache disque en secondes, 0 pour le désactiver (défaut: {DEFAULT_CACHE_TTL})")
+args = parser.parse_args()
+cache = DiskCache(ttl=args.cache_ttl)
 
 print("🔍 Récupération Activités Garmin Connect - Semaine S06")
 print("=" * 70)
@@ -40,26 +51,15 @@ print()
 # Récupérer les activités
 print("📥 Récupération des activités...")
 
-# La méthode get_activities() retourne les activités récentes
-# On va fetcher activité par activité en utilisant start/limit
 all_activities = []
 
 try:
-    # Fetcher les dernières 100 activités (devrait couvrir la période)
-    activities = service.client.get_activities(0, 100)
-
-    # Filtrer par date (dans la plage S06)
-    for activity in activities:
-        # La date est au format ISO string "2026-02-03 10:30:00"
-        activity_date_str = activity.get('startTimeLocal', '')
-
-        if activity_date_str:
-            # Parser la date
-            activity_date = datetime.fromisoformat(activity_date_str.split(' ')[0])
-
-            # Vérifier si dans la plage
-            if START_DATE <= activity_date <= END_DATE:
-                all_activities.append(activity)
+    # Filtrage par date côté Garmin (startDate/endDate inclus) : pas de tri local
+    all_activities = cache.wrap(service.get_activities, "activities")(
+        START_DATE.strftime('%Y-%m-%d'),
+        END_DATE.strftime('%Y-%m-%d'),
+        limit=100
+    )
 
     print(f"✅ {len(all_activities)} activités trouvées dans la période")
     print()
@@ -70,6 +70,8 @@ try:
         print("=" * 70)
         print()
 
+        # Sortie de la boucle accumulée puis écrite en une fois
+        lines = []
         for idx, activity in enumerate(all_activities, 1):
             activity_id = activity.get('activityId')
             activity_name = activity.get('activityName', 'N/A')
@@ -80,9 +82,8 @@ try:
             calories = activity.get('calories', 0)
 
             # Convertir durée en HH:MM:SS
-            duration_h = int(duration_sec // 3600)
-            duration_m = int((duration_sec % 3600) // 60)
-            duration_s = int(duration_sec % 60)
+            duration_m, duration_s = divmod(int(duration_sec), 60)
+            duration_h, duration_m = divmod(duration_m, 60)
             duration_str = f"{duration_h:02d}:{duration_m:02d}:{duration_s:02d}"
 
             # Convertir distance en km (ou m pour natation)
@@ -92,32 +93,32 @@ try:
                 distance_km = distance_m / 1000.0
                 distance_str = f"{distance_km:.2f} km"
 
-            print(f"Activité #{idx}")
-            print(f"   ID: {activity_id}")
-            print(f"   URL: https://connect.garmin.com/app/activity/{activity_id}")
-            print(f"   Nom: {activity_name}")
-            print(f"   Type: {activity_type}")
-            print(f"   Date: {start_time}")
-            print(f"   Durée: {duration_str}")
-            print(f"   Distance: {distance_str}")
-            print(f"   Calories: {calories} kcal")
-            print()
+            lines.extend([
+                f"Activité #{idx}",
+                f"   ID: {activity_id}",
+                f"   URL: https://connect.garmin.com/app/activity/{activity_id}",
+                f"   Nom: {activity_name}",
+                f"   Type: {activity_type}",
+                f"   Date: {start_time}",
+                f"   Durée: {duration_str}",
+                f"   Distance: {distance_str}",
+                f"   Calories: {calories} kcal",
+                "",
+            ])
+        sys.stdout.write("\n".join(lines) + "\n")
 
         # Sauvegarder les données brutes
         output_file = Path(__file__).parent.parent / "data" / "garmin_activities_s06.json"
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w') as f:
-            json.dump(all_activities, f, indent=2, ensure_ascii=False)
+        output_file.write_bytes(orjson.dumps(all_activities, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
-        print("=" * 70)
-        print(f"💾 Données sauvegardées: {output_file}")
-        print()
-        print("🔗 URLs des activités:")
+        lines = ["=" * 70, f"💾 Données sauvegardées: {output_file}", "", "🔗 URLs des activités:"]
         for activity in all_activities:
             activity_id = activity.get('activityId')
             activity_name = activity.get('activityName', 'N/A')
-            print(f"   - {activity_name}: https://connect.garmin.com/app/activity/{activity_id}")
+            lines.append(f"   - {activity_name}: https://connect.garmin.com/app/activity/{activity_id}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     else:
         print("⚠️  Aucune activité trouvée pour la période S06")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Récupère en une seule passe les activités, le poids et le sommeil Garmin Connect (semaine S06)
+
+Équivalent de fetch_garmin_activities.py + fetch_garmin_weight_sleep.py,
+avec une seule connexion Garmin et toutes les requêtes lancées en parallèle.
+Produit les mêmes fichiers que les deux scripts :
+    data/garmin_activities_s06.json
+    data/garmin_weight_sleep_s06.json
+
+Les réponses Garmin sont gardées en cache disque (data/cache/garmin_api) : une
+relance sur la même semaine n'interroge pas Garmin avant --cache-ttl secondes.
+
+Usage:
+    python scripts/fetch_garmin_all.py [--cache-ttl SECONDES]
+"""
+
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+from datetime import datetime, timedelta
+import orjson
+
+import httpx
+
+# Ajouter le dossier parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.garmin_service import (
+    AsyncGarminService,
+    GarminService,
+    GARMIN_API_URL,
+    GARMIN_HTTP_LIMITS,
+)
+from src.disk_cache import DiskCache, DEFAULT_CACHE_TTL
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+ACTIVITIES_FILE = DATA_DIR / "garmin_activities_s06.json"
+WEIGHT_SLEEP_FILE = DATA_DIR / "garmin_weight_sleep_s06.json"
+
+# Nom anglais du jour indexé par datetime.weekday(), indépendant de la locale (strftime('%A'))
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Dates S06: du 02/02/2026 au 08/02/2026
+START_DATE = datetime(2026, 2, 2)
+END_DATE = datetime(2026, 2, 8)
+
+
+async def fetch_all(service: GarminService, dates: list, cache: DiskCache) -> tuple:
+    """Activités (client garth, dans un thread) + poids et sommeil (httpx) en parallèle"""
+    activities_task = asyncio.create_task(asyncio.to_thread(
+        cache.wrap(service.get_activities, "activities"), dates[0], dates[-1], limit=100
+    ))
+
+    async with httpx.AsyncClient(
+        base_url=GARMIN_API_URL,
+        timeout=30.0,
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=GARMIN_HTTP_LIMITS, retries=3)
+    ) as http:
+        garmin = AsyncGarminService(http, service)
+        weights, sleeps = await asyncio.gather(
+            cache.wrap(garmin.get_weight_range, "weight_range")(dates),
+            cache.wrap(garmin.get_sleep_range, "sleep_range")(dates)
+        )
+
+    return await activities_task, weights, sleeps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Récupère activités, poids et sommeil Garmin de la semaine S06")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                        help=f"Durée de validité du cache disque en secondes, 0 pour le désactiver (défaut: {DEFAULT_CACHE_TTL})")
+    args = parser.parse_args()
+
+    print("🔍 Récupération Activités + Poids & Sommeil Garmin Connect - Semaine S06")
+    print("=" * 70)
+    print()
+    print(f"📅 Période: {START_DATE.strftime('%d/%m/%Y')} → {END_DATE.strftime('%d/%m/%Y')}")
+    print()
+
+    # Connexion Garmin (unique pour toutes les requêtes)
+    print("🔐 Connexion à Garmin Connect...")
+    service = GarminService()
+    service.connect()
+    print("✅ Connexion réussie")
+    print()
+
+    print("📥 Récupération des données...")
+    days = [START_DATE + timedelta(days=i) for i in range((END_DATE - START_DATE).days + 1)]
+    date_strs = [day.strftime('%Y-%m-%d') for day in days]
+    activities, weights, sleeps = asyncio.run(fetch_all(service, date_strs, DiskCache(ttl=args.cache_ttl)))
+    print(f"✅ {len(activities)} activités trouvées dans la période")
+    print()
+
+    daily_data = [
+        {
+            'date': date_str,
+            'day_name': DAY_NAMES[day.weekday()],
+            'weight_kg': weights.get(date_str),
+            'sleep': sleeps.get(date_str)
+        }
+        for day, date_str in zip(days, date_strs)
+    ]
+
+    # Sauvegarder les données
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if activities:
+        ACTIVITIES_FILE.write_bytes(orjson.dumps(activities, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        print(f"💾 Activités sauvegardées: {ACTIVITIES_FILE}")
+    else:
+        print("⚠️  Aucune activité trouvée pour la période S06")
+    WEIGHT_SLEEP_FILE.write_bytes(orjson.dumps(daily_data, option=orjson.OPT_INDENT_2))
+    print(f"💾 Poids & sommeil sauvegardés: {WEIGHT_SLEEP_FILE}")
+    print()
+
+    print("📋 ACTIVITÉS S06")
+    print("=" * 70)
+    # Sorties des boucles accumulées puis écrites en une fois
+    lines = []
+    for activity in activities:
+        name = activity.get('activityName', 'N/A')
+        activity_type = activity.get('activityType', {}).get('typeKey', 'N/A')
+        start_time = activity.get('startTimeLocal', 'N/A')
+        lines.append(f"   - {name} ({activity_type}) - {start_time}")
+        lines.append(f"     https://connect.garmin.com/app/activity/{activity.get('activityId')}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    print("📊 RÉSUMÉ SEMAINE S06")
+    print("=" * 70)
+    lines = []
+    for data in daily_data:
+        weight = data['weight_kg']
+        sleep = data['sleep']
+        weight_str = f"{weight:.1f} kg" if weight else "N/A"
+        if sleep:
+            sleep_str = f"{sleep['duration_hours']:.1f}h (Q:{sleep['quality_score']})"
+        else:
+            sleep_str = "N/A"
+        lines.append(f"{data['day_name']:10s} {data['date']}: Poids={weight_str:10s} Sommeil={sleep_str}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    print()
+    print("=" * 70)
+    print("✅ Terminé")
+
+
+if __name__ == '__main__':
+    main()
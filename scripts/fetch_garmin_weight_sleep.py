@@ -2,24 +2,45 @@
 """
 Récupère le poids et le sommeil depuis Garmin Connect pour la semaine S06
 
+Les réponses Garmin sont gardées en cache disque (data/cache/garmin_api) : une
+relance sur la même semaine n'interroge pas Garmin avant --cache-ttl secondes.
+
 Usage:
-    python scripts/fetch_garmin_weight_sleep.py
+    python scripts/fetch_garmin_weight_sleep.py [--cache-ttl SECONDES]
 """
 
 import sys
+import argparse
+import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
-import json
+import orjson
+
+import httpx
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.services.garmin_service import GarminService
+from api.services.garmin_service import (
+    AsyncGarminService,
+    GarminService,
+    GARMIN_API_URL,
+    GARMIN_HTTP_LIMITS,
+)
+from src.disk_cache import DiskCache, DEFAULT_CACHE_TTL
+
+parser = argparse.ArgumentParser(description="Récupère poids et sommeil Garmin de la semaine S06")
+parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                    help=f"Durée de validité du cache disque en secondes, 0 pour le désactiver (défaut: {DEFAULT_CACHE_TTL})")
+args = parser.parse_args()
 
 print("🔍 Récupération Poids & Sommeil Garmin Connect - Semaine S06")
 print("=" * 70)
 print()
 
+# Nom anglais du jour indexé par datetime.weekday(), indépendant de la locale (strftime('%A'))
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 # Dates S06: du 02/02/2026 au 08/02/2026
 START_DATE = datetime(2026, 2, 2)
 END_DATE = datetime(2026, 2, 8)
@@ -34,34 +55,56 @@ service.connect()
 print("✅ Connexion réussie")
 print()
 
+
+async def fetch_week(service: GarminService, dates: list, cache: DiskCache) -> tuple:
+    """Poids et sommeil de tous les jours en parallèle (8 requêtes Garmin simultanées max)"""
+    async with httpx.AsyncClient(
+        base_url=GARMIN_API_URL,
+        timeout=30.0,
+        # HTTP/2 + pool partagé, nouvelles tentatives sur erreur de connexion
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=GARMIN_HTTP_LIMITS, retries=3)
+    ) as http:
+        garmin = AsyncGarminService(http, service)
+        return await asyncio.gather(
+            cache.wrap(garmin.get_weight_range, "weight_range")(dates),
+            cache.wrap(garmin.get_sleep_range, "sleep_range")(dates)
+        )
+
+
 # Récupérer poids et sommeil pour chaque jour
 print("📥 Récupération des données...")
 print()
 
+days = [START_DATE + timedelta(days=i) for i in range((END_DATE - START_DATE).days + 1)]
+weights, sleeps = asyncio.run(fetch_week(
+    service, [day.strftime('%Y-%m-%d') for day in days], DiskCache(ttl=args.cache_ttl)
+))
+
 daily_data = []
 
-current_date = START_DATE
-while current_date <= END_DATE:
+# Sortie de la boucle accumulée puis écrite en une fois
+lines = []
+for current_date in days:
     date_str = current_date.strftime('%Y-%m-%d')
-    day_name = current_date.strftime('%A')  # Monday, Tuesday, etc.
+    day_name = DAY_NAMES[current_date.weekday()]
 
-    print(f"📆 {day_name} {current_date.strftime('%d/%m/%Y')}")
+    lines.append(f"📆 {day_name} {current_date.strftime('%d/%m/%Y')}")
 
-    # Récupérer poids
-    weight = service.get_weight(date_str)
+    # Poids
+    weight = weights.get(date_str)
     if weight:
-        print(f"   ⚖️  Poids: {weight:.1f} kg")
+        lines.append(f"   ⚖️  Poids: {weight:.1f} kg")
     else:
-        print(f"   ⚖️  Poids: Non disponible")
+        lines.append(f"   ⚖️  Poids: Non disponible")
 
-    # Récupérer sommeil
-    sleep = service.get_sleep(date_str)
+    # Sommeil
+    sleep = sleeps.get(date_str)
     if sleep:
         hours = sleep['duration_hours']
         quality = sleep['quality_score']
-        print(f"   😴 Sommeil: {hours:.1f}h (qualité: {quality}/100)")
+        lines.append(f"   😴 Sommeil: {hours:.1f}h (qualité: {quality}/100)")
     else:
-        print(f"   😴 Sommeil: Non disponible")
+        lines.append(f"   😴 Sommeil: Non disponible")
 
     daily_data.append({
         'date': date_str,
@@ -70,15 +113,14 @@ while current_date <= END_DATE:
         'sleep': sleep
     })
 
-    print()
-    current_date += timedelta(days=1)
+    lines.append("")
+sys.stdout.write("\n".join(lines) + "\n")
 
 # Sauvegarder les données
 output_file = Path(__file__).parent.parent / "data" / "garmin_weight_sleep_s06.json"
 output_file.parent.mkdir(parents=True, exist_ok=True)
 
-with open(output_file, 'w') as f:
-    json.dump(daily_data, f, indent=2, ensure_ascii=False)
+output_file.write_bytes(orjson.dumps(daily_data, option=orjson.OPT_INDENT_2))
 
 print("=" * 70)
 print(f"💾 Données sauvegardées: {output_file}")
@@ -86,6 +128,7 @@ print()
 print("📊 RÉSUMÉ SEMAINE S06")
 print("=" * 70)
 
+lines = []
 for data in daily_data:
     day_name = data['day_name']
     date = data['date']
@@ -99,7 +142,8 @@ for data in daily_data:
     else:
         sleep_str = "N/A"
 
-    print(f"{day_name:10s} {date}: Poids={weight_str:10s} Sommeil={sleep_str}")
+    lines.append(f"{day_name:10s} {date}: Poids={weight_str:10s} Sommeil={sleep_str}")
+sys.stdout.write("\n".join(lines) + "\n")
 
 print()
 print("=" * 70)
@@ -2,25 +2,57 @@
 """
 Remplit le fichier Excel S06 (format .xlsx) avec les données RÉELLES depuis Garmin Connect
 
-Utilise openpyxl pour préserver les formules dans l'onglet Synthèse.
+Seules les cellules remplies sont réécrites dans l'archive .xlsx
+(src/xlsx_patcher.py) : formules de l'onglet Synthèse et mise en forme du
+modèle restent intactes. openpyxl sert de repli si le patch est impossible.
+
+Avec --rebuild, le fichier *_garmin.xlsx est régénéré de zéro par PyExcelerate :
+uniquement les feuilles du jour, valeurs du modèle + activités, sans formules
+ni mise en forme (onglet Synthèse absent).
 
 Usage:
-    python scripts/fill_excel_from_garmin_xlsx.py
+    python scripts/fill_excel_from_garmin_xlsx.py [--rebuild]
 """
 
 import sys
+import argparse
 from pathlib import Path
-import json
-from datetime import datetime
+from typing import Dict, Optional
+import orjson
+from datetime import datetime, time
 import re
 
+# Ajouter le dossier parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.xlsx_patcher import XlsxPatcher, XlsxPatchError
+
 try:
     from openpyxl import load_workbook
+except ImportError as e:
+    raise ImportError(
+        "openpyxl non installé : pip install -r requirements.txt "
+        "ou python -m scripts._bootstrap excel"
+    ) from e
+from openpyxl.utils.cell import coordinate_to_tuple
+
+# Lecture des valeurs du modèle pour --rebuild
+try:
+    from python_calamine import CalamineWorkbook
 except ImportError:
-    print("❌ openpyxl non installé. Installation...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "openpyxl"])
-    from openpyxl import load_workbook
+    CalamineWorkbook = None
+
+# Écriture rapide sans modèle objet pour --rebuild (pip install pyexcelerate)
+try:
+    from pyexcelerate import Workbook as FastWorkbook, Style, Format
+except ImportError:
+    FastWorkbook = None
+
+# Lecture en flux du tableau d'activités (optionnelle)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 EXCEL_FILE = Path("/Users/aptsdae/Documents/Triathlon/S06_Delalain C_2026.xlsx")
@@ -38,36 +70,31 @@ def meters_to_km(meters: float) -> float:
     return meters / 1000.0
 
 
+# Code de séance dans le nom d'activité : CAP, C ou N suivi de chiffres
+_WORKOUT_RE = re.compile(r'\b(CAP\d+|C\d+|N\d+)\b')
+
+
 def extract_workout_code(activity_name: str) -> str:
     """Extrait le code de workout (ex: 'Sciez - CAP17' → 'CAP17')"""
     # Pattern: CAP suivi de chiffres, ou C suivi de chiffres, ou N suivi de chiffres
-    match = re.search(r'\b(CAP\d+|C\d+|N\d+)\b', activity_name)
+    match = _WORKOUT_RE.search(activity_name)
     if match:
         return match.group(1)
     # Si pas de pattern trouvé, retourner le nom complet
     return activity_name
 
 
-# Mapping jour de la semaine → nom de feuille Excel
-DAY_SHEET_MAP = {
-    'Monday': 'Lundi',
-    'Tuesday': 'Mardi',
-    'Wednesday': 'Mercredi',
-    'Thursday': 'Jeudi',
-    'Friday': 'Vendredi',
-    'Saturday': 'Samedi',
-    'Sunday': 'Dimanche'
-}
+def iter_activities(path: Path):
+    """Itère sur les activités du fichier JSON, sans charger tout le tableau si ijson est installé"""
+    if ijson is None:
+        yield from orjson.loads(path.read_bytes())
+        return
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
 
-DAY_NAME_FR = {
-    'Monday': 'Lundi',
-    'Tuesday': 'Mardi',
-    'Wednesday': 'Mercredi',
-    'Thursday': 'Jeudi',
-    'Friday': 'Vendredi',
-    'Saturday': 'Samedi',
-    'Sunday': 'Dimanche'
-}
+
+# Feuille Excel (= nom du jour en français) indexée par datetime.weekday() : 0 = lundi
+DAY_SHEETS = ('Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche')
 
 # Mapping type d'activité → colonnes Excel (lettres de colonnes)
 # Natation: seance_col=F, volume_col=F (m), time_col=G (hh:min)
@@ -80,43 +107,144 @@ ACTIVITY_TYPE_COLUMNS = {
     'running': ('L', 'L', 'M'),
 }
 
+# Ligne 4 : "Séance n°" / Ligne 6 : VALEURS - Volume et Durée
+SEANCE_ROW = 4
+VOLUME_ROW = 6
+
+# Coordonnées (séance, volume, durée) précalculées par type d'activité
+CELLS = {
+    activity_type: (f'{seance_col}{SEANCE_ROW}', f'{volume_col}{VOLUME_ROW}', f'{time_col}{VOLUME_ROW}')
+    for activity_type, (seance_col, volume_col, time_col) in ACTIVITY_TYPE_COLUMNS.items()
+}
+
+
+def save_with_openpyxl(patcher: XlsxPatcher, output_file: Path) -> None:
+    """Repli : applique les cellules programmées via openpyxl (réécrit tout le classeur)"""
+    # keep_links=False : ne pas recharger les classeurs liés (liens externes)
+    wb = load_workbook(str(patcher.path), keep_links=False)
+    for sheet_name, cells in patcher.edits.items():
+        ws = wb[sheet_name]
+        for coordinate, (value, number_format) in cells.items():
+            ws[coordinate] = value
+            if number_format is not None:
+                ws[coordinate].number_format = number_format
+    wb.save(str(output_file))
+
+
+def _template_day_rows(path: Path) -> Dict[str, list]:
+    """
+    Valeurs des feuilles du jour du modèle (cellules vides à None), classeur ouvert une seule fois
+
+    Les autres feuilles (Synthèse et ses formules) ne sont pas lues.
+    """
+    if CalamineWorkbook is not None:
+        template = CalamineWorkbook.from_path(str(path))
+        return {
+            sheet_name: [
+                [None if value == "" else value for value in row]
+                for row in template.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+            ]
+            for sheet_name in DAY_SHEETS
+            if sheet_name in template.sheet_names
+        }
+
+    wb = load_workbook(str(path), read_only=True, data_only=True, keep_links=False)
+    try:
+        day_rows = {}
+        for sheet_name in DAY_SHEETS:
+            if sheet_name not in wb.sheetnames:
+                continue
+            ws = wb[sheet_name]
+            # La balise <dimension> peut être périmée (classeur patché) : bornes recalculées à la lecture
+            ws.reset_dimensions()
+            day_rows[sheet_name] = [list(row) for row in ws.iter_rows(values_only=True)]
+        return day_rows
+    finally:
+        wb.close()
+
+
+def save_rebuilt(patcher: XlsxPatcher, output_file: Path) -> None:
+    """Mode --rebuild : feuilles du jour régénérées (valeurs seules) via PyExcelerate"""
+    wb = FastWorkbook()
+    styles = {}
+    day_rows = _template_day_rows(patcher.path)
+
+    for sheet_name in DAY_SHEETS:
+        rows = day_rows.get(sheet_name, [])
+        # Les heures du modèle sont relues en datetime.time : même format hh:mm en sortie
+        styled = [
+            (row_idx, col_idx, 'hh:mm')
+            for row_idx, row in enumerate(rows, 1)
+            for col_idx, value in enumerate(row, 1)
+            if isinstance(value, time)
+        ]
+
+        for coordinate, (value, number_format) in patcher.edits.get(sheet_name, {}).items():
+            row_idx, col_idx = coordinate_to_tuple(coordinate)
+            rows.extend([] for _ in range(row_idx - len(rows)))
+            row = rows[row_idx - 1]
+            row.extend([None] * (col_idx - len(row)))
+            row[col_idx - 1] = value
+            if number_format is not None:
+                styled.append((row_idx, col_idx, number_format))
+
+        ws = wb.new_sheet(sheet_name, data=rows)
+        for row_idx, col_idx, number_format in styled:
+            if number_format not in styles:
+                styles[number_format] = Style(format=Format(number_format))
+            ws.set_cell_style(row_idx, col_idx, styles[number_format])
+
+    wb.save(str(output_file))
+
+
+def main(excel_file: Optional[Path] = None, rebuild: bool = False) -> Optional[Path]:
+    """
+    Remplit le classeur .xlsx (EXCEL_FILE par défaut)
+
+    Args:
+        excel_file: Modèle .xlsx à remplir
+        rebuild: Régénère le fichier de sortie (PyExcelerate) au lieu de patcher le modèle
+
+    Returns:
+        Chemin du fichier *_garmin.xlsx écrit, ou None si rien n'a été écrit
+    """
+    excel_file = excel_file or EXCEL_FILE
 
-def main():
     print("📊 Remplissage Excel (.xlsx) depuis Activités Garmin Connect")
     print("=" * 70)
     print()
 
     # Vérifier que le fichier .xlsx existe
-    if not EXCEL_FILE.exists():
-        print(f"❌ Fichier Excel introuvable: {EXCEL_FILE}")
+    if not excel_file.exists():
+        print(f"❌ Fichier Excel introuvable: {excel_file}")
         print("   Veuillez d'abord convertir le fichier .xls en .xlsx")
-        return
+        print("   (python scripts/fill_excel_from_garmin.py le fait automatiquement)")
+        return None
+
+    if rebuild and FastWorkbook is None:
+        print("❌ pyexcelerate non installé (requis pour --rebuild)")
+        print("💡 pip install pyexcelerate")
+        return None
 
     # Charger les activités Garmin
     if not ACTIVITIES_FILE.exists():
         print(f"❌ Fichier activités introuvable: {ACTIVITIES_FILE}")
         print("   Exécutez d'abord: python scripts/fetch_garmin_activities.py")
-        return
-
-    with open(ACTIVITIES_FILE) as f:
-        activities = json.load(f)
-
-    print(f"📂 Activités chargées: {len(activities)}")
-    for activity in activities:
-        name = activity.get('activityName', 'N/A')
-        activity_type = activity.get('activityType', {}).get('typeKey', 'N/A')
-        date_str = activity.get('startTimeLocal', 'N/A')
-        print(f"   - {name} ({activity_type}) - {date_str}")
-    print()
+        return None
 
     # Ouvrir le fichier Excel
-    print(f"📁 Ouverture: {EXCEL_FILE.name}")
-    wb = load_workbook(str(EXCEL_FILE))
+    print(f"📁 Ouverture: {excel_file.name}")
+    patcher = XlsxPatcher(excel_file)
 
     modifications = []
+    activity_count = 0
 
-    # Pour chaque activité
-    for activity in activities:
+    # Sortie de la boucle accumulée puis écrite en une fois
+    lines = []
+
+    # Pour chaque activité, lue au fil du fichier
+    for activity in iter_activities(ACTIVITIES_FILE):
+        activity_count += 1
         activity_id = activity.get('activityId')
         activity_name_raw = activity.get('activityName', 'N/A')
         activity_name = extract_workout_code(activity_name_raw)
@@ -127,38 +255,26 @@ def main():
 
         # Parser la date pour trouver le jour de la semaine
         if not start_time_local:
-            print(f"⚠️  Pas de date pour {activity_name} - ignoré")
+            lines.append(f"⚠️  Pas de date pour {activity_name} - ignoré")
             continue
 
         activity_datetime = datetime.fromisoformat(start_time_local)
-        day_of_week = activity_datetime.strftime('%A')
 
         # Trouver les colonnes pour ce type d'activité
-        if activity_type not in ACTIVITY_TYPE_COLUMNS:
-            print(f"⚠️  Type inconnu '{activity_type}' pour {activity_name} - ignoré")
+        if activity_type not in CELLS:
+            lines.append(f"⚠️  Type inconnu '{activity_type}' pour {activity_name} - ignoré")
             continue
 
-        seance_col, volume_col, time_col = ACTIVITY_TYPE_COLUMNS[activity_type]
+        seance_cell, volume_cell, time_cell = CELLS[activity_type]
 
         # Récupérer la feuille du jour
-        if day_of_week not in DAY_SHEET_MAP:
-            print(f"⚠️  Jour invalide '{day_of_week}' - ignoré")
-            continue
-
-        sheet_name = DAY_SHEET_MAP[day_of_week]
-        if sheet_name not in wb.sheetnames:
-            print(f"⚠️  Feuille '{sheet_name}' introuvable - ignoré")
+        sheet_name = DAY_SHEETS[activity_datetime.weekday()]
+        if sheet_name not in patcher.sheetnames:
+            lines.append(f"⚠️  Feuille '{sheet_name}' introuvable - ignoré")
             continue
 
-        ws = wb[sheet_name]
-
-        # Ligne 4 : "Séance n°"
-        # Ligne 6 : VALEURS - Volume et Durée
-        seance_row = 4
-        volume_row = 6
-
         # Écrire le nom de la séance (ligne 4)
-        ws[f'{seance_col}{seance_row}'] = activity_name
+        patcher.set(sheet_name, seance_cell, activity_name)
 
         # Écrire volume (distance) - ligne 6
         if activity_type == 'lap_swimming':
@@ -168,19 +284,17 @@ def main():
             volume_value = meters_to_km(distance_m)
             volume_unit = 'km'
 
-        ws[f'{volume_col}{volume_row}'] = volume_value
+        patcher.set(sheet_name, volume_cell, volume_value)
 
         # Écrire durée (hh:mm) - ligne 6 - fraction de jour
         excel_time = seconds_to_excel_time(duration_sec)
-        ws[f'{time_col}{volume_row}'] = excel_time
-        ws[f'{time_col}{volume_row}'].number_format = 'hh:mm'
+        patcher.set(sheet_name, time_cell, excel_time, number_format='hh:mm')
 
         # Convertir durée en format lisible
-        duration_h = int(duration_sec // 3600)
-        duration_m = int((duration_sec % 3600) // 60)
+        duration_h, duration_m = divmod(int(duration_sec) // 60, 60)
         duration_str = f"{duration_h:02d}:{duration_m:02d}"
 
-        jour_fr = DAY_NAME_FR[day_of_week]
+        jour_fr = sheet_name
 
         modifications.append({
             'name': activity_name,
@@ -188,31 +302,51 @@ def main():
             'jour': jour_fr,
             'volume': f"{volume_value:.2f} {volume_unit}",
             'duration': duration_str,
-            'cells': f"{seance_col}{seance_row}, {volume_col}{volume_row}, {time_col}{volume_row}"
+            'cells': f"{seance_cell}, {volume_cell}, {time_cell}"
         })
 
-        print(f"✅ {activity_name:15s} ({activity_type:15s}) → {jour_fr:9s}")
-        print(f"   └─ Séance: {activity_name} (cellule {seance_col}{seance_row})")
-        print(f"   └─ Volume: {volume_value:.2f} {volume_unit} (cellule {volume_col}{volume_row})")
-        print(f"   └─ Durée: {duration_str} (cellule {time_col}{volume_row})")
+        lines.append(f"✅ {activity_name:15s} ({activity_type:15s}) → {jour_fr:9s}")
+        lines.append(f"   └─ Séance: {activity_name} (cellule {seance_cell})")
+        lines.append(f"   └─ Volume: {volume_value:.2f} {volume_unit} (cellule {volume_cell})")
+        lines.append(f"   └─ Durée: {duration_str} (cellule {time_cell})")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print()
+    print(f"📂 Activités lues: {activity_count}")
     print("=" * 70)
 
     # Sauvegarder
-    output_file = EXCEL_FILE.parent / f"{EXCEL_FILE.stem}_garmin{EXCEL_FILE.suffix}"
-    wb.save(str(output_file))
+    output_file = excel_file.parent / f"{excel_file.stem}_garmin{excel_file.suffix}"
+    if rebuild:
+        save_rebuilt(patcher, output_file)
+    else:
+        try:
+            patcher.save(output_file)
+        except XlsxPatchError as e:
+            print(f"⚠️  Patch .xlsx impossible ({e}) - écriture via openpyxl")
+            save_with_openpyxl(patcher, output_file)
 
     print(f"✅ Fichier sauvegardé: {output_file}")
     print()
     print(f"📊 {len(modifications)} activités remplies:")
-    for mod in modifications:
-        print(f"   - {mod['name']:15s} ({mod['jour']:9s}): {mod['volume']:12s} / {mod['duration']}")
+    sys.stdout.write("".join(
+        f"   - {mod['name']:15s} ({mod['jour']:9s}): {mod['volume']:12s} / {mod['duration']}\n"
+        for mod in modifications
+    ))
     print()
 
-    print("💡 Le fichier .xlsx préserve les formules de l'onglet Synthèse")
-    print("💡 Uploadez ce fichier vers OneDrive pour voir les totaux dans Excel Online")
+    if rebuild:
+        print("💡 Fichier régénéré : feuilles du jour uniquement, sans formules")
+    else:
+        print("💡 Le fichier .xlsx préserve les formules de l'onglet Synthèse")
+        print("💡 Uploadez ce fichier vers OneDrive pour voir les totaux dans Excel Online")
+
+    return output_file
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Remplit le fichier Excel S06 (.xlsx) depuis les activités Garmin")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Régénère le fichier de sortie (PyExcelerate, valeurs seules) au lieu de patcher le modèle")
+    args = parser.parse_args()
+    main(rebuild=args.rebuild)
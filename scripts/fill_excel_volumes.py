@@ -5,44 +5,88 @@ Remplit automatiquement les volumes (durée) dans le fichier Excel S06
 Lit les workouts parsés et remplit les colonnes hh:min pour chaque discipline
 dans les feuilles quotidiennes (Lundi-Dimanche)
 
+Le modèle .xls est converti une fois en .xlsx par LibreOffice headless puis
+rempli avec openpyxl (seules les cellules ciblées sont modifiées).
+
 Usage:
     python scripts/fill_excel_volumes.py
 """
 
 import sys
+import copy
 from pathlib import Path
-import json
+import os
+import re
+import subprocess
 from datetime import datetime
+from typing import Optional
 
-# Importer xlrd pour lire et xlwt pour écrire .xls
+# Cache binaire des workouts parsés (optionnel)
 try:
-    import xlrd
-    import xlwt
-    from xlutils.copy import copy as xl_copy
+    import msgpack
 except ImportError:
-    print("❌ xlrd/xlwt/xlutils non installés. Installation...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "xlrd", "xlwt", "xlutils"])
-    import xlrd
-    import xlwt
-    from xlutils.copy import copy as xl_copy
+    msgpack = None
 
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from fill_excel_from_garmin import convert_xls_to_xlsx
+from src.workout_cache import load_workouts
+
 
 EXCEL_FILE = Path("/Users/aptsdae/Documents/Triathlon/S06_Delalain C_2026.xls")
 WORKOUT_FILE = Path(__file__).parent.parent / "data" / "workouts_cache" / "S06_workouts_v6_near_final.json"
 
+# Volume natation dans la description d'une série: "2500 m" ou "2500m"
+_SWIM_M_RE = re.compile(r'(\d+)\s*m\b', re.IGNORECASE)
+
+
+def duration_to_seconds(duration: str) -> int:
+    """Convertit une durée d'intervalle "MM:SS" (ou "MM") en secondes"""
+    colon = duration.find(':')
+    if colon == -1:
+        return int(duration) * 60
+    return int(duration[:colon]) * 60 + int(duration[colon + 1:])
+
+
+def add_duration_seconds(data: dict) -> dict:
+    """Ajoute duration_seconds (int) à chaque intervalle pour éviter de reparser "MM:SS" à l'usage"""
+    for workout in data.get('workouts', []):
+        for interval in workout.get('intervals') or []:
+            if isinstance(interval.get('duration'), str):
+                interval['duration_seconds'] = duration_to_seconds(interval['duration'])
+    return data
+
+
+def load_workouts_msgpack(path: Path) -> dict:
+    """
+    Charge les workouts parsés, via le cache msgpack voisin (.msgpack) s'il est à jour
 
-def parse_duration_to_minutes(duration_str: str) -> int:
-    """Convertit durée MM:SS en minutes totales"""
-    if ':' in duration_str:
-        parts = duration_str.split(':')
-        return int(parts[0]) * 60 + int(parts[1])
-    else:
-        return int(duration_str) * 60
+    Sinon le JSON est lu par src.workout_cache (partagé, donc copié avant
+    d'ajouter les durées d'intervalles en secondes, duration_seconds) puis le
+    cache msgpack est réécrit. Sans msgpack, seule la lecture JSON a lieu.
+    """
+    cache_path = path.with_suffix('.msgpack')
+    if msgpack is not None:
+        try:
+            if cache_path.stat().st_mtime >= path.stat().st_mtime:
+                return msgpack.unpackb(cache_path.read_bytes(), raw=False)
+        except (OSError, ValueError):
+            pass  # Cache absent ou illisible : relecture du JSON
+
+    data = add_duration_seconds(copy.deepcopy(load_workouts(path)))
+
+    if msgpack is not None:
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            tmp_path.write_bytes(msgpack.packb(data, use_bin_type=True))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Cache msgpack non écrit: {e}")
+    return data
 
 
 def minutes_to_excel_time(minutes: int) -> float:
@@ -55,12 +99,16 @@ def minutes_to_excel_time(minutes: int) -> float:
 
 def get_workout_duration_minutes(workout_json: dict) -> int:
     """Calcule la durée totale d'un workout en minutes"""
-    # Si workout structuré avec intervalles
-    if workout_json.get('intervals') and len(workout_json['intervals']) > 0:
-        total_seconds = sum(
-            parse_duration_to_minutes(interval['duration'])
-            for interval in workout_json['intervals']
-        )
+    # Si workout structuré avec intervalles : somme des durées en secondes
+    # (duration_seconds précalculé par load_workouts_msgpack, sinon "MM:SS" des anciens caches)
+    intervals = workout_json.get('intervals')
+    if intervals:
+        total_seconds = 0
+        for interval in intervals:
+            seconds = interval.get('duration_seconds')
+            if seconds is None:
+                seconds = duration_to_seconds(interval['duration'])
+            total_seconds += seconds
         return total_seconds // 60
 
     # Sinon utiliser duration_total (format "0h45" ou "1h00")
@@ -79,9 +127,7 @@ def get_swim_volume_meters(workout_json: dict) -> int:
     # Chercher dans les series pour "2500 m" ou similaire
     for serie in workout_json.get('series', []):
         desc = serie.get('description', '')
-        # Pattern: "2500 m" ou "2500m"
-        import re
-        match = re.search(r'(\d+)\s*m\b', desc, re.IGNORECASE)
+        match = _SWIM_M_RE.search(desc)
         if match:
             return int(match.group(1))
     return 0
@@ -95,16 +141,23 @@ def estimate_swim_duration_minutes(meters: int) -> int:
     return int(meters / 50)
 
 
-# Mapping jour → index de feuille (0-based)
-DAY_SHEET_MAP = {
-    'Lundi': 2,
-    'Mardi': 3,
-    'Mercredi': 4,
-    'Jeudi': 5,
-    'Vendredi': 6,
-    'Samedi': 7,
-    'Dimanche': 8
-}
+class XlsxVolumeWriter:
+    """Écrit les volumes dans la conversion .xlsx du modèle (openpyxl)"""
+
+    def __init__(self, xlsx_path: Path):
+        self.workbook = load_workbook(xlsx_path)
+        self.output_file = xlsx_path.parent / f"{xlsx_path.stem}_filled.xlsx"
+
+    def write(self, jour: str, row_idx: int, col_idx: int, value: float) -> None:
+        self.workbook[jour].cell(row=row_idx + 1, column=col_idx + 1, value=value)
+
+    def write_time(self, jour: str, row_idx: int, col_idx: int, excel_time: float) -> None:
+        cell = self.workbook[jour].cell(row=row_idx + 1, column=col_idx + 1, value=excel_time)
+        cell.number_format = 'hh:mm'
+
+    def save(self) -> None:
+        self.workbook.save(self.output_file)
+
 
 # Mapping code workout → (jour, discipline_col_volume, discipline_col_time)
 # Colonnes pour chaque discipline (basé sur ligne 5 des feuilles journalières):
@@ -124,104 +177,144 @@ WORKOUT_MAPPING = {
 }
 
 
+# La ligne pour "Volume total" est ligne 5 (index 4)
+VOLUME_ROW_IDX = 4
+
+# Lettres des colonnes A-Z indexées depuis 0
+_COL = tuple(chr(65 + i) for i in range(26))
+
+
+def column_letter(col_idx: int) -> str:
+    """Lettre de colonne Excel pour un index 0-based (au-delà de Z : AA, AB...)"""
+    return _COL[col_idx] if col_idx < 26 else get_column_letter(col_idx + 1)
+
+
+# Coordonnées précalculées : code → (jour, col_volume, col_time, cellule volume, cellule durée)
+WORKOUT_CELLS = {
+    code: (
+        jour,
+        col_volume,
+        col_time,
+        f"{column_letter(col_volume)}{VOLUME_ROW_IDX + 1}" if col_volume is not None else None,
+        f"{column_letter(col_time)}{VOLUME_ROW_IDX + 1}",
+    )
+    for code, (jour, col_volume, col_time) in WORKOUT_MAPPING.items()
+}
+
+
+def fill_swim(writer, code: str, workout: dict, jour: str, col_volume, col_time,
+              volume_cell, time_cell, lines: list) -> dict:
+    """Natation : volume en mètres + durée estimée depuis le volume (messages ajoutés à lines)"""
+    meters = get_swim_volume_meters(workout)
+    duration_min = estimate_swim_duration_minutes(meters)
+
+    # Écrire volume (mètres)
+    if col_volume is not None and meters > 0:
+        writer.write(jour, VOLUME_ROW_IDX, col_volume, float(meters))
+        lines.append(f"✅ {code:6s} → {jour:9s} : {meters} m (cellule {volume_cell})")
+
+    # Écrire durée (hh:mm)
+    if col_time is not None and duration_min > 0:
+        excel_time = minutes_to_excel_time(duration_min)
+        writer.write_time(jour, VOLUME_ROW_IDX, col_time, excel_time)
+        lines.append(f"   └─ Durée estimée : {duration_min} min (cellule {time_cell})")
+
+    return {
+        'code': code,
+        'jour': jour,
+        'volume_m': meters,
+        'duration_min': duration_min,
+        'cells': f"{volume_cell or ''}, {time_cell}"
+    }
+
+
+def fill_duration(writer, code: str, workout: dict, jour: str, col_volume, col_time,
+                  volume_cell, time_cell, lines: list) -> Optional[dict]:
+    """Cyclisme et Course à pied : juste durée (messages ajoutés à lines)"""
+    duration_min = get_workout_duration_minutes(workout)
+    if col_time is None or duration_min <= 0:
+        return None
+
+    excel_time = minutes_to_excel_time(duration_min)
+    writer.write_time(jour, VOLUME_ROW_IDX, col_time, excel_time)
+    lines.append(f"✅ {code:6s} → {jour:9s} : {duration_min} min (cellule {time_cell})")
+
+    return {
+        'code': code,
+        'jour': jour,
+        'duration_min': duration_min,
+        'cells': time_cell
+    }
+
+
+# Remplissage selon le type de workout (fill_duration par défaut)
+WORKOUT_HANDLERS = {
+    'Natation': fill_swim,
+}
+
+
 def main():
     print("📊 Remplissage automatique du fichier Excel S06")
     print("=" * 70)
     print()
 
     # Charger les workouts
-    with open(WORKOUT_FILE) as f:
-        data = json.load(f)
+    data = load_workouts_msgpack(WORKOUT_FILE)
 
     workouts = {w['code']: w for w in data['workouts']}
 
-    print(f"📂 Workouts chargés: {len(workouts)}")
+    # Sorties des boucles accumulées puis écrites en une fois
+    lines = [f"📂 Workouts chargés: {len(workouts)}"]
     for code in sorted(workouts.keys()):
         w = workouts[code]
         duration_min = get_workout_duration_minutes(w)
-        print(f"   - {code:6s} ({w['type']:12s}): {duration_min} min")
-    print()
+        lines.append(f"   - {code:6s} ({w['type']:12s}): {duration_min} min")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Ouvrir le fichier Excel
-    print(f"📁 Ouverture: {EXCEL_FILE.name}")
-    workbook_read = xlrd.open_workbook(str(EXCEL_FILE), formatting_info=True)
-    workbook_write = xl_copy(workbook_read)
+    excel_file = EXCEL_FILE
+    if excel_file.suffix.lower() == '.xls':
+        try:
+            excel_file = convert_xls_to_xlsx(excel_file)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"❌ Conversion .xls → .xlsx impossible: {e}")
+            print("💡 Installez LibreOffice (soffice) ou convertissez le fichier manuellement")
+            sys.exit(1)
+
+    print(f"📁 Ouverture: {excel_file.name}")
+    writer = XlsxVolumeWriter(excel_file)
 
     modifications = []
+    lines = []
 
     # Pour chaque workout à mapper
-    for code, (jour, col_volume, col_time) in WORKOUT_MAPPING.items():
+    for code, (jour, col_volume, col_time, volume_cell, time_cell) in WORKOUT_CELLS.items():
         if code not in workouts:
-            print(f"⚠️  {code} non trouvé dans les workouts parsés")
+            lines.append(f"⚠️  {code} non trouvé dans les workouts parsés")
             continue
 
         workout = workouts[code]
-
-        # Récupérer la feuille du jour
-        sheet_idx = DAY_SHEET_MAP[jour]
-        sheet_write = workbook_write.get_sheet(sheet_idx)
-
-        # La ligne pour "Volume total" est ligne 5 (index 4)
-        row_idx = 4
-
-        # Traitement spécial pour natation
-        if workout['type'] == 'Natation':
-            meters = get_swim_volume_meters(workout)
-            duration_min = estimate_swim_duration_minutes(meters)
-
-            # Écrire volume (mètres)
-            if col_volume is not None and meters > 0:
-                sheet_write.write(row_idx, col_volume, float(meters))
-                print(f"✅ {code:6s} → {jour:9s} : {meters} m (cellule {chr(65 + col_volume)}{row_idx + 1})")
-
-            # Écrire durée (hh:mm)
-            if col_time is not None and duration_min > 0:
-                excel_time = minutes_to_excel_time(duration_min)
-                style_time = xlwt.XFStyle()
-                style_time.num_format_str = 'hh:mm'
-                sheet_write.write(row_idx, col_time, excel_time, style_time)
-                print(f"   └─ Durée estimée : {duration_min} min (cellule {chr(65 + col_time)}{row_idx + 1})")
-
-            modifications.append({
-                'code': code,
-                'jour': jour,
-                'volume_m': meters,
-                'duration_min': duration_min,
-                'cells': f"{chr(65 + col_volume) if col_volume else ''}{row_idx + 1}, {chr(65 + col_time)}{row_idx + 1}"
-            })
-
-        else:
-            # Cyclisme et Course à pied : juste durée
-            duration_min = get_workout_duration_minutes(workout)
-
-            if col_time is not None and duration_min > 0:
-                excel_time = minutes_to_excel_time(duration_min)
-                style_time = xlwt.XFStyle()
-                style_time.num_format_str = 'hh:mm'
-                sheet_write.write(row_idx, col_time, excel_time, style_time)
-
-                modifications.append({
-                    'code': code,
-                    'jour': jour,
-                    'duration_min': duration_min,
-                    'cell': f"{chr(65 + col_time)}{row_idx + 1}"
-                })
-
-                print(f"✅ {code:6s} → {jour:9s} : {duration_min} min (cellule {chr(65 + col_time)}{row_idx + 1})")
+        fill = WORKOUT_HANDLERS.get(workout['type'], fill_duration)
+        modification = fill(writer, code, workout, jour, col_volume, col_time, volume_cell, time_cell, lines)
+        if modification is not None:
+            modifications.append(modification)
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print()
     print("=" * 70)
 
     # Sauvegarder
-    output_file = EXCEL_FILE.parent / f"{EXCEL_FILE.stem}_filled{EXCEL_FILE.suffix}"
-    workbook_write.save(str(output_file))
+    writer.save()
+    output_file = writer.output_file
 
     print(f"✅ Fichier sauvegardé: {output_file}")
     print()
-    print(f"📊 {len(modifications)} volumes remplis:")
+    lines = [f"📊 {len(modifications)} volumes remplis:"]
     for mod in modifications:
-        print(f"   - {mod['code']:6s} ({mod['jour']:9s}): {mod['duration_min']} min → {mod['cell']}")
-    print()
+        lines.append(f"   - {mod['code']:6s} ({mod['jour']:9s}): {mod['duration_min']} min → {mod['cells']}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print("💡 Vérifier le fichier Excel:")
     print(f"   open '{output_file}'")
@@ -9,32 +9,41 @@ Usage:
 """
 
 import sys
+import os
+import time
+import functools
 from pathlib import Path
 import json
-from datetime import datetime
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
 import re
 
-# Google Sheets API
+import httpx
+
 try:
-    from google.oauth2.credentials import Credentials
-    from google.auth.transport.requests import Request
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
+    import orjson
+except ImportError:
+    orjson = None
+
+# Lecture en flux du tableau d'activités (optionnelle)
+try:
+    import ijson
 except ImportError:
-    print("❌ google-api-python-client non installé. Installation...")
-    import subprocess
-    subprocess.check_call([
-        sys.executable, "-m", "pip", "install",
-        "google-api-python-client",
-        "google-auth-httplib2",
-        "google-auth-oauthlib"
-    ])
+    ijson = None
+
+# Google Sheets API
+try:
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
     from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
+    from googleapiclient.discovery import build, build_from_document
     from googleapiclient.errors import HttpError
+except ImportError as e:
+    raise ImportError(
+        "google-api-python-client non installé : pip install -r requirements.txt "
+        "ou python -m scripts._bootstrap sheets"
+    ) from e
 
 
 # ID du fichier Google Sheets (extrait de l'URL)
@@ -47,6 +56,17 @@ ACTIVITIES_FILE = Path(__file__).parent.parent / "data" / "garmin_activities_s06
 TOKEN_FILE = Path(__file__).parent.parent / "credentials" / "token.json"
 CREDENTIALS_FILE = Path(__file__).parent.parent / "credentials" / "credentials.json"
 
+# Document de découverte de l'API Sheets v4, gardé en local pour éviter un aller-retour réseau par exécution
+DISCOVERY_FILE = Path(__file__).parent.parent / "credentials" / "sheets_v4_discovery.json"
+DISCOVERY_URL = "https://sheets.googleapis.com/$discovery/rest?version=v4"
+DISCOVERY_MAX_AGE = 30 * 24 * 3600  # 30 jours
+
+# Créer le répertoire credentials s'il n'existe pas (token et document de découverte)
+TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+# Code de workout dans le nom d'activité Garmin (CAP17, C16, N5...)
+_CODE_RE = re.compile(r'\b(CAP\d+|C\d+|N\d+)\b')
+
 
 def seconds_to_duration_string(seconds: float) -> str:
     """Convertit secondes en format hh:mm pour Google Sheets"""
@@ -62,37 +82,26 @@ def meters_to_km(meters: float) -> float:
 
 def extract_workout_code(activity_name: str) -> str:
     """Extrait le code de workout (ex: 'Sciez - CAP17' → 'CAP17')"""
-    match = re.search(r'\b(CAP\d+|C\d+|N\d+)\b', activity_name)
+    match = _CODE_RE.search(activity_name)
     if match:
         return match.group(1)
     return activity_name
 
 
-# Mapping jour de la semaine → nom de feuille Google Sheets
-DAY_SHEET_MAP = {
-    'Monday': 'Lundi',
-    'Tuesday': 'Mardi',
-    'Wednesday': 'Mercredi',
-    'Thursday': 'Jeudi',
-    'Friday': 'Vendredi',
-    'Saturday': 'Samedi',
-    'Sunday': 'Dimanche'
-}
+# Nom de feuille Google Sheets indexé par datetime.weekday() (0 = lundi)
+_WEEKDAY_FR = ('Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche')
 
-DAY_NAME_FR = {
-    'Monday': 'Lundi',
-    'Tuesday': 'Mardi',
-    'Wednesday': 'Mercredi',
-    'Thursday': 'Jeudi',
-    'Friday': 'Vendredi',
-    'Saturday': 'Samedi',
-    'Sunday': 'Dimanche'
-}
+
+@functools.lru_cache(maxsize=16)
+def weekday_fr(ymd: str) -> str:
+    """Feuille du jour pour une date AAAA-MM-JJ (mémorisé : plusieurs activités par jour)"""
+    return _WEEKDAY_FR[date.fromisoformat(ymd).weekday()]
 
 # Mapping type d'activité → colonnes Google Sheets (lettres)
 # Natation: seance_col=F, volume_col=F (m), time_col=G (hh:min)
 # Cyclisme: seance_col=I, volume_col=I (km), time_col=J (hh:min)
 # Course à pied: seance_col=L, volume_col=L (km), time_col=M (hh:min)
+# time_col suit toujours volume_col : volume et durée partent dans une même plage
 ACTIVITY_TYPE_COLUMNS = {
     'lap_swimming': ('F', 'F', 'G'),
     'indoor_cycling': ('I', 'I', 'J'),
@@ -101,13 +110,46 @@ ACTIVITY_TYPE_COLUMNS = {
 }
 
 
+def load_sheets_discovery():
+    """
+    Document de découverte Sheets v4 depuis le cache local, retéléchargé après 30 jours
+
+    Returns:
+        Document JSON (str), ou None si aucun cache et téléchargement impossible
+    """
+    if DISCOVERY_FILE.exists() and time.time() - DISCOVERY_FILE.stat().st_mtime < DISCOVERY_MAX_AGE:
+        return DISCOVERY_FILE.read_text()
+
+    try:
+        response = httpx.get(DISCOVERY_URL, timeout=30.0)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"⚠️  Document de découverte Sheets non téléchargé: {e}")
+        # Un cache périmé reste préférable à un échec
+        return DISCOVERY_FILE.read_text() if DISCOVERY_FILE.exists() else None
+
+    tmp_file = DISCOVERY_FILE.with_suffix('.tmp')
+    tmp_file.write_text(response.text)
+    os.replace(tmp_file, DISCOVERY_FILE)
+    return response.text
+
+
+def iter_activities(path: Path):
+    """Itère sur les activités du fichier JSON, sans charger tout le tableau si ijson est installé"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    elif orjson is not None:
+        yield from orjson.loads(path.read_bytes())
+    else:
+        with open(path) as f:
+            yield from json.load(f)
+
+
 def get_google_sheets_service():
     """Authentifie et retourne le service Google Sheets API"""
     creds = None
 
-    # Créer le répertoire credentials s'il n'existe pas
-    TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-
     # Charger les credentials existants
     if TOKEN_FILE.exists():
         creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
@@ -139,7 +181,10 @@ def get_google_sheets_service():
         with open(TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
 
-    return build('sheets', 'v4', credentials=creds)
+    discovery = load_sheets_discovery()
+    if discovery is not None:
+        return build_from_document(discovery, credentials=creds)
+    return build('sheets', 'v4', credentials=creds, cache_discovery=False)
 
 
 def main():
@@ -153,56 +198,67 @@ def main():
         print("   Exécutez d'abord: python scripts/fetch_garmin_activities.py")
         return
 
-    with open(ACTIVITIES_FILE) as f:
-        activities = json.load(f)
-
-    print(f"📂 Activités chargées: {len(activities)}")
-    for activity in activities:
-        name = activity.get('activityName', 'N/A')
-        activity_type = activity.get('activityType', {}).get('typeKey', 'N/A')
-        date_str = activity.get('startTimeLocal', 'N/A')
-        print(f"   - {name} ({activity_type}) - {date_str}")
-    print()
-
-    # Authentifier avec Google Sheets API
-    print("🔐 Authentification Google Sheets...")
-    service = get_google_sheets_service()
-    print("✅ Authentifié")
-    print()
+    # Un seul passage sur le fichier, lu en flux si ijson est installé.
+    # entries : (date, colonnes de la discipline, feuille, type, code, durée, distance)
+    entries = []
+    # Sorties des boucles accumulées puis écrites en une fois
+    loaded_lines = []
+    lines = []
+    for activity in iter_activities(ACTIVITIES_FILE):
+        activity_name_raw = activity.get('activityName', 'N/A')
+        type_key = activity.get('activityType', {}).get('typeKey')
+        start_time_local = activity.get('startTimeLocal', '')
+        loaded_lines.append(f"   - {activity_name_raw} ({type_key or 'N/A'}) - {start_time_local or 'N/A'}")
 
-    modifications = []
-    batch_update_data = []
+        activity_type = type_key or 'unknown'
 
-    # Pour chaque activité
-    for activity in activities:
-        activity_name_raw = activity.get('activityName', 'N/A')
         activity_name = extract_workout_code(activity_name_raw)
-        activity_type = activity.get('activityType', {}).get('typeKey', 'unknown')
-        start_time_local = activity.get('startTimeLocal', '')
-        duration_sec = activity.get('duration', 0)
-        distance_m = activity.get('distance', 0)
 
         # Parser la date pour trouver le jour de la semaine
-        if not start_time_local:
-            print(f"⚠️  Pas de date pour {activity_name} - ignoré")
+        if not start_time_local or not start_time_local[0].isdigit():
+            lines.append(f"⚠️  Pas de date pour {activity_name} - ignoré")
             continue
 
-        activity_datetime = datetime.fromisoformat(start_time_local)
-        day_of_week = activity_datetime.strftime('%A')
+        sheet_name = weekday_fr(start_time_local[:10])
 
         # Trouver les colonnes pour ce type d'activité
         if activity_type not in ACTIVITY_TYPE_COLUMNS:
-            print(f"⚠️  Type inconnu '{activity_type}' pour {activity_name} - ignoré")
+            lines.append(f"⚠️  Type inconnu '{activity_type}' pour {activity_name} - ignoré")
             continue
 
-        seance_col, volume_col, time_col = ACTIVITY_TYPE_COLUMNS[activity_type]
+        entries.append((
+            start_time_local[:10],
+            ACTIVITY_TYPE_COLUMNS[activity_type],
+            sheet_name,
+            activity_type,
+            activity_name,
+            activity.get('duration') or 0,
+            activity.get('distance') or 0,
+        ))
 
-        # Récupérer le nom de la feuille
-        if day_of_week not in DAY_SHEET_MAP:
-            print(f"⚠️  Jour invalide '{day_of_week}' - ignoré")
-            continue
+    loaded_lines.insert(0, f"📂 Activités chargées: {len(loaded_lines)}")
+    loaded_lines.append("")
+    sys.stdout.write("\n".join(loaded_lines) + "\n")
+
+    # Authentifier avec Google Sheets API
+    print("🔐 Authentification Google Sheets...")
+    service = get_google_sheets_service()
+    print("✅ Authentifié")
+    print()
+
+    modifications = []
+    batch_update_data = []
 
-        sheet_name = DAY_SHEET_MAP[day_of_week]
+    # Une écriture par jour et discipline : les séances d'un même jour sont cumulées
+    # au lieu de s'écraser dans les mêmes cellules
+    entries.sort(key=itemgetter(0, 1))
+    for (_, columns), group in groupby(entries, key=itemgetter(0, 1)):
+        group = list(group)
+        seance_col, volume_col, time_col = columns
+        sheet_name, activity_type = group[0][2], group[0][3]
+        activity_name = ' + '.join(entry[4] for entry in group)
+        duration_sec = sum(entry[5] for entry in group)
+        distance_m = sum(entry[6] for entry in group)
 
         # Lignes: 4 pour séance, 6 pour données
         seance_row = 4
@@ -225,40 +281,33 @@ def main():
             'values': [[activity_name]]
         })
 
-        # 2. Volume
-        batch_update_data.append({
-            'range': f'{sheet_name}!{volume_col}{volume_row}',
-            'values': [[volume_value]]
-        })
-
-        # 3. Durée
+        # 2. Volume + durée : colonnes adjacentes de la ligne 6, une seule plage
         batch_update_data.append({
-            'range': f'{sheet_name}!{time_col}{volume_row}',
-            'values': [[duration_str]]
+            'range': f'{sheet_name}!{volume_col}{volume_row}:{time_col}{volume_row}',
+            'values': [[volume_value, duration_str]]
         })
 
-        jour_fr = DAY_NAME_FR[day_of_week]
-
         modifications.append({
             'name': activity_name,
             'type': activity_type,
-            'jour': jour_fr,
+            'jour': sheet_name,
             'volume': f"{volume_value:.2f} {volume_unit}",
             'duration': duration_str,
             'cells': f"{seance_col}{seance_row}, {volume_col}{volume_row}, {time_col}{volume_row}"
         })
 
-        print(f"✅ {activity_name:15s} ({activity_type:15s}) → {jour_fr:9s}")
-        print(f"   └─ Séance: {activity_name} (cellule {seance_col}{seance_row})")
-        print(f"   └─ Volume: {volume_value:.2f} {volume_unit} (cellule {volume_col}{volume_row})")
-        print(f"   └─ Durée: {duration_str} (cellule {time_col}{volume_row})")
+        lines.append(f"✅ {activity_name:15s} ({activity_type:15s}) → {sheet_name:9s}")
+        lines.append(f"   └─ Séance: {activity_name} (cellule {seance_col}{seance_row})")
+        lines.append(f"   └─ Volume: {volume_value:.2f} {volume_unit} (cellule {volume_col}{volume_row})")
+        lines.append(f"   └─ Durée: {duration_str} (cellule {time_col}{volume_row})")
 
-    print()
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
     print("=" * 70)
 
     # Exécuter toutes les mises à jour en une seule requête batch
     if batch_update_data:
-        print(f"📝 Écriture de {len(batch_update_data)} cellules dans Google Sheets...")
+        print(f"📝 Écriture de {len(batch_update_data)} plages dans Google Sheets...")
 
         body = {
             'valueInputOption': 'USER_ENTERED',
@@ -277,10 +326,11 @@ def main():
             return
 
     print()
-    print(f"📊 {len(modifications)} activités remplies:")
+    lines = [f"📊 {len(modifications)} activités remplies:"]
     for mod in modifications:
-        print(f"   - {mod['name']:15s} ({mod['jour']:9s}): {mod['volume']:12s} / {mod['duration']}")
-    print()
+        lines.append(f"   - {mod['name']:15s} ({mod['jour']:9s}): {mod['volume']:12s} / {mod['duration']}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print("💡 Les formules de l'onglet Synthèse se recalculent automatiquement")
     print(f"💡 Vérifiez le fichier: https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}")
@@ -13,30 +13,127 @@ Usage:
 """
 
 import os
+import select
 import sys
 from pathlib import Path
+from typing import Optional
+import threading
 import time
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-import garth
+from _garmin_session import run_auth
 
-# Charger .env
-load_dotenv()
+# Surveillance du fichier MFA par événements système (inotify/FSEvents/kqueue) ;
+# sans watchdog : kqueue de la stdlib sur macOS/BSD, sinon polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
 
-GARMIN_EMAIL = os.getenv('GARMIN_EMAIL')
-GARMIN_PASSWORD = os.getenv('GARMIN_PASSWORD')
 MFA_FILE = Path("/tmp/garmin_mfa_code.txt")
 
-if not GARMIN_EMAIL or not GARMIN_PASSWORD:
-    print("❌ GARMIN_EMAIL ou GARMIN_PASSWORD manquant dans .env")
-    sys.exit(1)
 
-print("🔐 Authentification Garmin Connect avec MFA via fichier")
-print(f"📧 Email: {GARMIN_EMAIL}")
-print()
+def _read_mfa_code() -> str:
+    """Contenu du fichier MFA, chaîne vide s'il n'existe pas (encore)"""
+    try:
+        return MFA_FILE.read_text().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def wait_mfa_code_watchdog(max_wait: float) -> Optional[str]:
+    """
+    Attend le code MFA sans polling : réveil à chaque événement sur MFA_FILE
+
+    Le fichier est relu à chaque création/écriture/fermeture ; un fichier encore
+    vide (écriture en cours) fait simplement attendre l'événement suivant.
+    """
+    changed = threading.Event()
+
+    class MfaFileHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            paths = (event.src_path, getattr(event, 'dest_path', ''))
+            if any(path and Path(os.fsdecode(path)) == MFA_FILE for path in paths):
+                changed.set()
+
+    observer = Observer()
+    observer.schedule(MfaFileHandler(), str(MFA_FILE.parent))
+    observer.start()
+    deadline = time.monotonic() + max_wait
+    try:
+        while True:
+            # Relu aussi au démarrage : fichier écrit avant que l'observer soit prêt
+            mfa_code = _read_mfa_code()
+            if mfa_code:
+                return mfa_code
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not changed.wait(remaining):
+                return None
+            changed.clear()
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def wait_mfa_code_kqueue(max_wait: float) -> Optional[str]:
+    """
+    Repli sans watchdog sur macOS/BSD : kqueue (stdlib) sur le dossier puis sur le fichier MFA
+
+    Le processus reste bloqué dans kqueue.control() : réveil immédiat à la
+    création ou à l'écriture du fichier, et Ctrl-C interrompt l'attente aussitôt.
+    """
+    kq = select.kqueue()
+    watch_flags = select.KQ_EV_ADD | select.KQ_EV_CLEAR
+    open_flags = getattr(os, 'O_EVTONLY', os.O_RDONLY)
+    dir_fd = os.open(MFA_FILE.parent, open_flags)
+    file_fd = None
+    try:
+        kq.control([select.kevent(dir_fd, filter=select.KQ_FILTER_VNODE, flags=watch_flags,
+                                  fflags=select.KQ_NOTE_WRITE)], 0)
+        deadline = time.monotonic() + max_wait
+        while True:
+            mfa_code = _read_mfa_code()
+            if mfa_code:
+                return mfa_code
+
+            # Fichier créé mais encore vide : surveiller aussi ses écritures, puis relire
+            if file_fd is None and MFA_FILE.exists():
+                file_fd = os.open(MFA_FILE, open_flags)
+                kq.control([select.kevent(file_fd, filter=select.KQ_FILTER_VNODE, flags=watch_flags,
+                                          fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND)], 0)
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not kq.control(None, 1, remaining):
+                return None
+    finally:
+        if file_fd is not None:
+            os.close(file_fd)
+        os.close(dir_fd)
+        kq.close()
+
+
+def wait_mfa_code_polling(max_wait: float) -> Optional[str]:
+    """Dernier repli (ni watchdog ni kqueue) : vérifie l'existence du fichier toutes les secondes"""
+    start_time = time.time()
+
+    while not MFA_FILE.exists():
+        elapsed = time.time() - start_time
+        if elapsed > max_wait:
+            return None
+
+        # Afficher un point toutes les 5 secondes
+        if int(elapsed) % 5 == 0:
+            print(".", end="", flush=True)
+
+        time.sleep(1)
+
+    time.sleep(0.5)  # Petit délai pour être sûr que l'écriture est finie
+    return _read_mfa_code()
+
 
 def prompt_mfa_from_file():
     """
@@ -67,26 +164,19 @@ def prompt_mfa_from_file():
 
     # Attendre que le fichier soit créé (max 5 minutes)
     max_wait = 300  # 5 minutes
-    start_time = time.time()
-
-    while not MFA_FILE.exists():
-        elapsed = time.time() - start_time
-        if elapsed > max_wait:
-            print(f"\n❌ Timeout après {max_wait}s - fichier non créé")
-            return None
-
-        # Afficher un point toutes les 5 secondes
-        if int(elapsed) % 5 == 0:
-            print(".", end="", flush=True)
-
-        time.sleep(1)
-
-    # Lire le code du fichier
-    time.sleep(0.5)  # Petit délai pour être sûr que l'écriture est finie
-    mfa_code = MFA_FILE.read_text().strip()
+    if Observer is not None:
+        mfa_code = wait_mfa_code_watchdog(max_wait)
+    elif hasattr(select, 'kqueue'):
+        mfa_code = wait_mfa_code_kqueue(max_wait)
+    else:
+        mfa_code = wait_mfa_code_polling(max_wait)
+
+    if mfa_code is None:
+        print(f"\n❌ Timeout après {max_wait}s - fichier non créé")
+        return None
 
     # Nettoyer le fichier
-    MFA_FILE.unlink()
+    MFA_FILE.unlink(missing_ok=True)
 
     if not mfa_code:
         print("\n❌ Fichier vide!")
@@ -97,58 +187,14 @@ def prompt_mfa_from_file():
 
     return mfa_code
 
-try:
-    # Tenter de reprendre session existante
-    garth_dir = Path.home() / ".garth"
-    if garth_dir.exists():
-        print("📂 Session garth existante trouvée, tentative de reprise...")
-        try:
-            garth.resume(str(garth_dir))
-            garth.client.username = GARMIN_EMAIL
-            print("✅ Session garth reprise avec succès!")
-            print(f"👤 Connecté en tant que: {garth.client.username}")
-            sys.exit(0)
-        except Exception as e:
-            print(f"⚠️  Session invalide ({e}), nouvelle connexion nécessaire...")
-            print()
-
-    # Connexion avec MFA via fichier
-    print("🔑 Connexion en cours...")
-    print("💡 Le code MFA sera demandé via fichier si nécessaire")
-    print()
 
-    # Important: passer la fonction prompt_mfa à garth.login()
-    garth.login(GARMIN_EMAIL, GARMIN_PASSWORD, prompt_mfa=prompt_mfa_from_file)
-
-    # Sauvegarder la session
-    garth.save(str(garth_dir))
-
-    print()
-    print("="*70)
-    print("✅ AUTHENTIFICATION RÉUSSIE!")
-    print("="*70)
-    print(f"📁 Tokens sauvegardés dans {garth_dir}")
-    print()
-    print("💡 L'API peut maintenant se connecter sans MFA")
-    print("   Les tokens sont valides pendant ~1 an")
-    print()
-    print("🎯 Prochaine étape:")
-    print("   python scripts/test_upload_c16.py")
-
-except KeyboardInterrupt:
-    print("\n⚠️  Authentification annulée")
-    if MFA_FILE.exists():
-        MFA_FILE.unlink()
-    sys.exit(1)
-except Exception as e:
-    print(f"\n❌ Erreur: {e}")
-    print()
-    print("💡 Vérifiez:")
-    print("   1. Email/password corrects dans .env")
-    print("   2. Code MFA valide (essayez à nouveau)")
-    print("   3. Connexion internet stable")
-    import traceback
-    traceback.print_exc()
-    if MFA_FILE.exists():
-        MFA_FILE.unlink()
-    sys.exit(1)
+if __name__ == '__main__':
+    try:
+        run_auth(
+            "Authentification Garmin Connect avec MFA via fichier",
+            prompt_mfa=prompt_mfa_from_file,
+            login_hint="Le code MFA sera demandé via fichier si nécessaire"
+        )
+    finally:
+        # Ne jamais laisser un code MFA traîner dans /tmp
+        MFA_FILE.unlink(missing_ok=True)
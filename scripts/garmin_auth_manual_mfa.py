@@ -9,30 +9,14 @@ Usage:
     python scripts/garmin_auth_manual_mfa.py
 """
 
-import os
 import sys
 from pathlib import Path
-import time
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-import garth
+from _garmin_session import run_auth
 
-# Charger .env
-load_dotenv()
-
-GARMIN_EMAIL = os.getenv('GARMIN_EMAIL')
-GARMIN_PASSWORD = os.getenv('GARMIN_PASSWORD')
-
-if not GARMIN_EMAIL or not GARMIN_PASSWORD:
-    print("❌ GARMIN_EMAIL ou GARMIN_PASSWORD manquant dans .env")
-    sys.exit(1)
-
-print("🔐 Authentification Garmin Connect avec MFA manuel")
-print(f"📧 Email: {GARMIN_EMAIL}")
-print()
 
 def prompt_mfa_manual():
     """
@@ -65,54 +49,10 @@ def prompt_mfa_manual():
 
     return mfa_code
 
-try:
-    # Tenter de reprendre session existante
-    garth_dir = Path.home() / ".garth"
-    if garth_dir.exists():
-        print("📂 Session garth existante trouvée, tentative de reprise...")
-        try:
-            garth.resume(str(garth_dir))
-            garth.client.username = GARMIN_EMAIL
-            print("✅ Session garth reprise avec succès!")
-            print(f"👤 Connecté en tant que: {garth.client.username}")
-            sys.exit(0)
-        except Exception as e:
-            print(f"⚠️  Session invalide ({e}), nouvelle connexion nécessaire...")
-            print()
-
-    # Connexion avec MFA manuel
-    print("🔑 Connexion en cours...")
-    print("💡 Un code MFA vous sera demandé si nécessaire")
-    print()
-
-    # Important: passer la fonction prompt_mfa à garth.login()
-    garth.login(GARMIN_EMAIL, GARMIN_PASSWORD, prompt_mfa=prompt_mfa_manual)
-
-    # Sauvegarder la session
-    garth.save(str(garth_dir))
 
-    print()
-    print("="*60)
-    print("✅ AUTHENTIFICATION RÉUSSIE!")
-    print("="*60)
-    print(f"📁 Tokens sauvegardés dans {garth_dir}")
-    print()
-    print("💡 L'API peut maintenant se connecter sans MFA")
-    print("   Les tokens sont valides pendant ~1 an")
-    print()
-    print("🎯 Prochaine étape:")
-    print("   python scripts/test_upload_c16.py")
-
-except KeyboardInterrupt:
-    print("\n⚠️  Authentification annulée")
-    sys.exit(1)
-except Exception as e:
-    print(f"\n❌ Erreur: {e}")
-    print()
-    print("💡 Vérifiez:")
-    print("   1. Email/password corrects dans .env")
-    print("   2. Code MFA valide (essayez à nouveau)")
-    print("   3. Connexion internet stable")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+if __name__ == '__main__':
+    run_auth(
+        "Authentification Garmin Connect avec MFA manuel",
+        prompt_mfa=prompt_mfa_manual,
+        login_hint="Un code MFA vous sera demandé si nécessaire"
+    )
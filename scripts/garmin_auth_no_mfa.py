@@ -6,109 +6,110 @@ Tente de se connecter en utilisant garth avec différentes méthodes
 pour contourner le problème MFA.
 
 Usage:
-    python scripts/garmin_auth_no_mfa.py
+    python scripts/garmin_auth_no_mfa.py [--verbose]
 """
 
 import os
 import sys
+import argparse
+import logging
 from pathlib import Path
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
-import garth
+from _garmin_session import (
+    GARMIN_EMAIL,
+    GARMIN_PASSWORD,
+    GARTH_DIR,
+    HTTP_STATUS_HINTS,
+    GarthException,
+    GarthHTTPError,
+    http_status,
+    is_mfa_error,
+    login_session,
+    resume_session,
+)
+
+log = logging.getLogger(__name__)
+
+MFA_HELP = """💡 Le compte a MFA ACTIVÉ
+
+Solutions:
+
+1. DÉSACTIVER LE MFA TEMPORAIREMENT:
+   • Aller sur https://www.garmin.com/account
+   • Sécurité → Authentification à deux facteurs → Désactiver
+   • Relancer ce script
+   • Réactiver le MFA après l'upload
+
+2. CONTACTER GARMIN SUPPORT:
+   • Signaler que vous ne recevez pas les codes MFA
+   • Demander reset du MFA
+
+3. UTILISER UN AUTRE COMPTE (si possible):
+   • Créer un compte Garmin test sans MFA
+   • Tester l'upload sur ce compte"""
+
+CHECK_HELP = """💡 Vérifiez:
+   1. Email/password corrects dans .env
+   2. Connexion internet stable
+   3. Compte Garmin actif et non bloqué"""
+
+
+def report_failure(error: Exception, help_text: str) -> None:
+    """Affiche l'échec, l'aide adaptée (traceback en --verbose) puis quitte"""
+    log.error("\n%s\n❌ ÉCHEC DE L'AUTHENTIFICATION\n%s", "=" * 70, "=" * 70)
+    log.error("Erreur: %s\n", error)
+    log.error(help_text)
+    log.debug("", exc_info=True)
+    sys.exit(1)
 
-# Charger .env
-load_dotenv()
 
-GARMIN_EMAIL = os.getenv('GARMIN_EMAIL')
-GARMIN_PASSWORD = os.getenv('GARMIN_PASSWORD')
+arg_parser = argparse.ArgumentParser(description="Authentification Garmin Connect sans MFA")
+arg_parser.add_argument('--verbose', action='store_true', help="Traceback complète en cas d'erreur")
+args = arg_parser.parse_args()
+logging.basicConfig(
+    level=logging.DEBUG if args.verbose else os.getenv('LOGLEVEL', 'INFO'),
+    format='%(message)s',
+    stream=sys.stdout
+)
 
 if not GARMIN_EMAIL or not GARMIN_PASSWORD:
-    print("❌ GARMIN_EMAIL ou GARMIN_PASSWORD manquant dans .env")
+    log.error("❌ GARMIN_EMAIL ou GARMIN_PASSWORD manquant dans .env")
     sys.exit(1)
 
-print("🔐 Authentification Garmin Connect SANS MFA")
-print(f"📧 Email: {GARMIN_EMAIL}")
-print()
-print("💡 Cette méthode utilise garth.login() sans prompt_mfa")
-print("   Si le compte n'a PAS de MFA activé, cela devrait fonctionner")
-print()
+log.info("🔐 Authentification Garmin Connect SANS MFA")
+log.info("📧 Email: %s\n", GARMIN_EMAIL)
+log.info("💡 Cette méthode utilise garth.login() sans prompt_mfa")
+log.info("   Si le compte n'a PAS de MFA activé, cela devrait fonctionner\n")
 
 try:
     # Tenter de reprendre session existante
-    garth_dir = Path.home() / ".garth"
-    if garth_dir.exists():
-        print("📂 Session garth existante trouvée, tentative de reprise...")
-        try:
-            garth.resume(str(garth_dir))
-            garth.client.username = GARMIN_EMAIL
-            print("✅ Session garth reprise avec succès!")
-            print(f"👤 Connecté en tant que: {garth.client.username}")
-            sys.exit(0)
-        except Exception as e:
-            print(f"⚠️  Session invalide ({e}), nouvelle connexion nécessaire...")
-            print()
+    if resume_session() is not None:
+        log.info("✅ Session garth reprise avec succès!")
+        log.info("👤 Connecté en tant que: %s", GARMIN_EMAIL)
+        sys.exit(0)
 
     # Connexion SANS MFA
-    print("🔑 Tentative de connexion sans MFA...")
-    print()
+    log.info("🔑 Tentative de connexion sans MFA...\n")
 
     # Si le compte a MFA désactivé, cela fonctionnera
     # Si le compte a MFA activé, cela échouera avec une erreur claire
-    garth.login(GARMIN_EMAIL, GARMIN_PASSWORD)
-
-    # Sauvegarder la session
-    garth.save(str(garth_dir))
-
-    print()
-    print("="*70)
-    print("✅ AUTHENTIFICATION RÉUSSIE!")
-    print("="*70)
-    print(f"📁 Tokens sauvegardés dans {garth_dir}")
-    print()
-    print("💡 L'API peut maintenant se connecter sans MFA")
-    print("   Les tokens sont valides pendant ~1 an")
-    print()
-    print("🎯 Prochaine étape:")
-    print("   python scripts/test_upload_c16.py")
-
+    # (la session est sauvegardée dans ~/.garth)
+    login_session()
+
+    log.info("\n%s\n✅ AUTHENTIFICATION RÉUSSIE!\n%s", "=" * 70, "=" * 70)
+    log.info("📁 Tokens sauvegardés dans %s\n", GARTH_DIR)
+    log.info("💡 L'API peut maintenant se connecter sans MFA")
+    log.info("   Les tokens sont valides pendant ~1 an\n")
+    log.info("🎯 Prochaine étape:")
+    log.info("   python scripts/test_upload_c16.py")
+
+except GarthHTTPError as e:
+    hint = HTTP_STATUS_HINTS.get(http_status(e))
+    report_failure(e, f"{hint}\n\n{CHECK_HELP}" if hint else CHECK_HELP)
+except GarthException as e:
+    report_failure(e, MFA_HELP if is_mfa_error(e) else CHECK_HELP)
 except Exception as e:
-    print()
-    print("="*70)
-    print("❌ ÉCHEC DE L'AUTHENTIFICATION")
-    print("="*70)
-    print(f"Erreur: {e}")
-    print()
-
-    error_str = str(e).lower()
-
-    if "mfa" in error_str or "verification" in error_str:
-        print("💡 Le compte a MFA ACTIVÉ")
-        print()
-        print("Solutions:")
-        print()
-        print("1. DÉSACTIVER LE MFA TEMPORAIREMENT:")
-        print("   • Aller sur https://www.garmin.com/account")
-        print("   • Sécurité → Authentification à deux facteurs → Désactiver")
-        print("   • Relancer ce script")
-        print("   • Réactiver le MFA après l'upload")
-        print()
-        print("2. CONTACTER GARMIN SUPPORT:")
-        print("   • Signaler que vous ne recevez pas les codes MFA")
-        print("   • Demander reset du MFA")
-        print()
-        print("3. UTILISER UN AUTRE COMPTE (si possible):")
-        print("   • Créer un compte Garmin test sans MFA")
-        print("   • Tester l'upload sur ce compte")
-    else:
-        print("💡 Vérifiez:")
-        print("   1. Email/password corrects dans .env")
-        print("   2. Connexion internet stable")
-        print("   3. Compte Garmin actif et non bloqué")
-
-    print()
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+    report_failure(e, CHECK_HELP)
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Upload de séances vers Garmin Connect (point d'entrée unique)
+
+Sous-commandes:
+    weekly <pdf_path> [--dry-run] [--sequential]   Toutes les séances d'une semaine
+    codes <code> [<code> ...] --pdf <pdf_path>     Séances choisies d'un PDF
+    all-cycling                                    Séances cyclisme du cache S06
+    test-c16                                       Séance C16 du cache S06 (test)
+
+upload_weekly_workouts.py, upload_workouts.py, upload_all_cycling.py et
+test_upload_c16.py ne sont plus que des raccourcis vers ces sous-commandes.
+
+Usage:
+    python scripts/upload.py <sous-commande> [options] [--verbose]
+
+Exemple:
+    python scripts/upload.py weekly "/Users/aptsdae/Documents/Triathlon/Séances S07 (09_02 au 15_02)_Delalain C_2026.pdf"
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import orjson
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pdf_parser_v3 import parse_cached
+from api.services.garmin_service import (
+    AsyncGarminService,
+    GarminService,
+    GARMIN_API_URL,
+    GARMIN_HTTP_LIMITS,
+    GARTH_DIR,
+)
+from src.garmin_workout_converter import convert_to_garmin_cycling_workout, convert_to_garmin_running_workout
+from src.workout_validation import validate_workout_for_upload
+from src.workout_cache import load_workouts
+
+log = logging.getLogger(__name__)
+
+# Cache JSON des séances S06 (all-cycling, test-c16)
+S06_WORKOUTS_FILE = Path(__file__).parent.parent / "data" / "workouts_cache" / "S06_workouts_v6_near_final.json"
+
+# Uploads Garmin simultanés (reste sous la limite de débit de Garmin Connect)
+UPLOAD_CONCURRENCY = 4
+
+_CONVERTERS = {
+    'Cyclisme': convert_to_garmin_cycling_workout,
+    'Course à pied': convert_to_garmin_running_workout,
+}
+
+# Workouts déjà convertis au format Garmin, par (code, date, type) : un nouvel
+# essai ou un second passage dans le même processus ne reconvertit pas
+_CONV_CACHE: Dict[tuple, dict] = {}
+
+
+def convert_cached(workout: dict, type_label: str) -> dict:
+    """Workout au format Garmin (converti au premier appel seulement)"""
+    key = (workout['code'], workout.get('date'), type_label)
+    converted = _CONV_CACHE.get(key)
+    if converted is None:
+        converted = _CONV_CACHE[key] = _CONVERTERS[type_label](workout)
+    return converted
+
+
+async def upload_concurrently(service: GarminService, workouts: list) -> list:
+    """
+    Upload les workouts (couples (workout, workout converti)) en parallèle
+    (UPLOAD_CONCURRENCY max) via httpx
+
+    Returns:
+        Réponse Garmin ou exception pour chaque workout, dans l'ordre
+    """
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        base_url=GARMIN_API_URL,
+        timeout=30.0,
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=GARMIN_HTTP_LIMITS, retries=3)
+    ) as http:
+        garmin = AsyncGarminService(http, service)
+
+        async def one(workout: dict, converted: dict):
+            async with semaphore:
+                return await garmin.upload_workout(workout, converted=converted)
+
+        return await asyncio.gather(*[one(*item) for item in workouts], return_exceptions=True)
+
+
+def connect_garmin() -> GarminService:
+    """Service Garmin connecté (reprise de session ~/.garth ou login)"""
+    garmin = GarminService()
+    garmin.connect()
+    return garmin
+
+
+def load_cached_workouts(path: Path = S06_WORKOUTS_FILE) -> list:
+    """Séances d'un cache JSON parsé (data/workouts_cache), lu une fois par processus"""
+    return load_workouts(path)['workouts']
+
+
+def upload_weekly_workouts(pdf_path: str, dry_run: bool = False, sequential: bool = False):
+    """
+    Parse et upload toutes les séances d'une semaine
+
+    Args:
+        pdf_path: Chemin vers le PDF de la semaine
+        dry_run: Conversion locale uniquement, sans upload
+        sequential: Uploads un par un (client garth) au lieu d'uploads parallèles
+    """
+
+    # Connexion Garmin (réseau) lancée en arrière-plan pendant le parsing du PDF (CPU),
+    # seulement si une session ~/.garth existe : un login complet peut demander le
+    # code MFA (input()), qui doit rester au premier plan
+    garmin_future = None
+    if not dry_run and GARTH_DIR.exists():
+        executor = ThreadPoolExecutor(max_workers=1)
+        garmin_future = executor.submit(connect_garmin)
+        executor.shutdown(wait=False)
+
+    log.info("📄 Parsing du PDF: %s\n", pdf_path)
+
+    # Parser le PDF (résultat réutilisé tant que le PDF ne change pas)
+    try:
+        result = parse_cached(pdf_path)
+    except Exception:
+        # Ne pas laisser la connexion tourner seule (thread non daemon) après l'échec
+        if garmin_future is not None and not garmin_future.cancel():
+            log.info("⏳ Attente de la connexion Garmin en cours avant arrêt...")
+            try:
+                garmin_future.result()
+            except Exception as e:
+                log.warning("⚠️  Connexion Garmin échouée: %s", e)
+        raise
+
+    week = result.get('week', 'Unknown')
+    period = result.get('period', 'Unknown')
+
+    log.info("=" * 80)
+    log.info("SEMAINE: %s", week)
+    log.info("PÉRIODE: %s", period)
+    log.info("TOTAL: %d séances", len(result['workouts']))
+    log.info("=" * 80)
+
+    # Grouper par type (une seule passe)
+    buckets = defaultdict(list)
+    for w in result['workouts']:
+        buckets[w['type']].append(w)
+    cycling, running, swimming = buckets['Cyclisme'], buckets['Course à pied'], buckets['Natation']
+
+    log.info("\n🚴 Cyclisme: %d séances", len(cycling))
+    log.info("🏃 Course à pied: %d séances", len(running))
+    log.info("🏊 Natation: %d séances", len(swimming))
+
+    garmin = None
+    if dry_run:
+        log.info("\n🧪 Mode DRY-RUN: conversion locale uniquement (aucun upload Garmin)\n")
+    else:
+        # Connexion à Garmin
+        log.info("\n🔐 Connexion à Garmin Connect...")
+        garmin = garmin_future.result() if garmin_future is not None else connect_garmin()
+        log.info("✅ Connecté\n")
+
+    log.info("=" * 80)
+    log.info("📤 TRAITEMENT DES SÉANCES")
+    log.info("=" * 80)
+
+    uploaded = []
+    skipped = []
+    errors = []
+
+    # Séances à uploader (avec intervalles et valides) : (workout, type)
+    pending = []
+    for workouts, type_label, skip_reason, skip_message in (
+        (cycling, 'Cyclisme', 'Pas d\'intervalles', 'Séance sans intervalles'),
+        (running, 'Course à pied', 'Séance libre', 'Séance libre'),
+    ):
+        for workout in workouts:
+            code = workout['code']
+
+            # Vérifier si la séance a des intervalles
+            if not workout.get('intervals'):
+                skipped.append({
+                    'code': code,
+                    'date': workout.get('date'),
+                    'reason': skip_reason
+                })
+                log.warning("\n⚠️  %s - %s (skip)", code, skip_message)
+                continue
+
+            log.info("\n📤 %s (%s)", code, type_label)
+            log.info("   - Date: %s", workout.get('date'))
+            log.info("   - Durée: %s", workout.get('duration_total'))
+            log.info("   - %d intervalles", len(workout['intervals']))
+
+            validation_errors = validate_workout_for_upload(workout)
+            if validation_errors:
+                for err in validation_errors:
+                    log.error("   ❌ Validation: %s", err)
+                errors.append({
+                    'code': code,
+                    'date': workout.get('date'),
+                    'error': '; '.join(validation_errors)
+                })
+                continue
+
+            pending.append((workout, type_label))
+
+    # Conversion au format Garmin (une erreur de conversion devient le résultat de la séance)
+    results = []
+    for workout, type_label in pending:
+        try:
+            results.append(convert_cached(workout, type_label))
+        except Exception as e:
+            results.append(e)
+    to_upload = [i for i, converted in enumerate(results) if not isinstance(converted, Exception)]
+
+    # Conversion seule (dry-run), upload séquentiel, ou uploads Garmin en parallèle
+    if dry_run:
+        for i in to_upload:
+            results[i] = {'workoutId': 'DRY_RUN'}
+    elif sequential or not to_upload:
+        for i in to_upload:
+            try:
+                results[i] = garmin.upload_workout(pending[i][0], converted=results[i])
+            except Exception as e:
+                results[i] = e
+    else:
+        log.info("\n🔄 Upload de %d séances en parallèle (%d max)...", len(to_upload), UPLOAD_CONCURRENCY)
+        responses = asyncio.run(upload_concurrently(garmin, [(pending[i][0], results[i]) for i in to_upload]))
+        for i, response in zip(to_upload, responses):
+            results[i] = response
+
+    log.info("")
+    for (workout, type_label), result in zip(pending, results):
+        code = workout['code']
+        if isinstance(result, Exception):
+            log.error("   ❌ %s - Erreur: %s", code, result, exc_info=result if log.isEnabledFor(logging.DEBUG) else None)
+            errors.append({
+                'code': code,
+                'date': workout.get('date'),
+                'error': str(result)
+            })
+            continue
+
+        workout_id = result.get('workoutId', 'unknown')
+        if dry_run:
+            log.info("   ✅ %s - Conversion OK (dry-run)", code)
+        else:
+            log.info("   ✅ %s - Uploadé - ID: %s", code, workout_id)
+
+        uploaded.append({
+            'code': code,
+            'type': type_label,
+            'date': workout.get('date'),
+            'workout_id': workout_id
+        })
+
+    # TODO: Natation (quand converter sera implémenté)
+    if swimming:
+        log.warning("\n⚠️  %d séances de natation non uploadées (converter non implémenté)", len(swimming))
+        for w in swimming:
+            skipped.append({
+                'code': w['code'],
+                'date': w.get('date'),
+                'reason': 'Natation non supportée'
+            })
+
+    # Résumé final
+    log.info("\n%s", "=" * 80)
+    log.info("📊 RÉSUMÉ")
+    log.info("%s\n", "=" * 80)
+
+    if uploaded:
+        log.info("✅ %d séances uploadées:\n", len(uploaded))
+        for w in uploaded:
+            log.info("  • %s - %s (%s) - ID: %s", w['code'], w['type'], w['date'], w['workout_id'])
+
+    if skipped:
+        log.warning("\n⚠️  %d séances ignorées:\n", len(skipped))
+        for w in skipped:
+            log.warning("  • %s (%s) - %s", w['code'], w['date'], w['reason'])
+
+    if errors:
+        log.error("\n❌ %d erreurs:\n", len(errors))
+        for w in errors:
+            log.error("  • %s (%s) - %s", w['code'], w['date'], w['error'])
+
+    log.info("")
+
+    # Sauvegarder le résultat
+    output_file = f"data/workouts_cache/{week}_upload_result.json"
+    Path(output_file).write_bytes(orjson.dumps({
+        'week': week,
+        'period': period,
+        'dry_run': dry_run,
+        'uploaded': uploaded,
+        'skipped': skipped,
+        'errors': errors
+    }, option=orjson.OPT_INDENT_2))
+
+    log.info("💾 Résultat sauvegardé: %s", output_file)
+
+
+def upload_codes(codes: List[str], pdf_path: str) -> None:
+    """Parse un PDF et uploade les séances demandées, une par une"""
+    log.info("🚴 Upload %s vers Garmin Connect", " et ".join(codes))
+    log.info("=" * 70)
+    log.info("")
+
+    # Parser les workouts (résultat réutilisé tant que le PDF ne change pas)
+    log.info("📄 Parsing des séances depuis PDF...")
+    all_workouts = parse_cached(pdf_path).get('workouts', [])
+
+    # Filtrer les codes demandés (index par code)
+    by_code = {w.get('code', ''): w for w in all_workouts}
+    parsed_workouts = [by_code[code] for code in codes if code in by_code]
+    for workout in parsed_workouts:
+        log.info("   ✅ %s parsé : %d intervalles", workout['code'], len(workout.get('intervals', [])))
+
+    log.info("")
+    log.info("✅ %d séances parsées", len(parsed_workouts))
+    log.info("")
+
+    # Connexion Garmin
+    log.info("🔐 Connexion à Garmin Connect...")
+    service = connect_garmin()
+    log.info("✅ Connexion réussie")
+    log.info("")
+
+    # Upload des workouts
+    log.info("📤 Upload des séances...")
+    for workout in parsed_workouts:
+        workout_code = workout['code']
+
+        log.info("   Uploading %s (%s)...", workout_code, workout['type'])
+
+        try:
+            result = service.upload_workout(workout)
+            workout_id = result.get('workoutId', 'unknown')
+            log.info("   ✅ %s uploadé - ID: %s", workout_code, workout_id)
+            log.info("      URL: https://connect.garmin.com/modern/workout/%s", workout_id)
+        except Exception as e:
+            log.error("   ❌ Erreur upload %s: %s", workout_code, e, exc_info=log.isEnabledFor(logging.DEBUG))
+
+    log.info("")
+    log.info("=" * 70)
+    log.info("✅ Terminé")
+
+
+def upload_all_cycling(path: Path = S06_WORKOUTS_FILE) -> None:
+    """Uploade toutes les séances cyclisme d'un cache JSON (UPLOAD_CONCURRENCY en parallèle)"""
+    log.info("🚀 Upload Workouts Cyclisme S06 vers Garmin Connect")
+    log.info("=" * 70)
+    log.info("")
+
+    # Grouper les workouts par type en une passe, puis garder le cyclisme
+    workouts_by_type = defaultdict(list)
+    for w in load_cached_workouts(path):
+        workouts_by_type[w.get('type')].append(w)
+    cycling_workouts = workouts_by_type['Cyclisme']
+
+    log.info("📂 Workouts cyclisme trouvés : %d", len(cycling_workouts))
+    for w in cycling_workouts:
+        log.info("   - %s: %s", w['code'], w.get('description', 'N/A'))
+    log.info("")
+
+    # Connexion Garmin
+    log.info("🔐 Connexion à Garmin Connect...")
+    service = connect_garmin()
+    log.info("✅ Connexion réussie")
+    log.info("")
+
+    def convert_and_upload(workout_json: dict):
+        """Convertit une fois (aperçu + upload) puis uploade ; retourne (workout Garmin, réponse)"""
+        garmin_workout = convert_cached(workout_json, 'Cyclisme')
+        return garmin_workout, service.upload_workout(workout_json, converted=garmin_workout)
+
+    # Upload des workouts en parallèle (requêtes bloquantes : un thread par upload en cours)
+    uploaded = []
+    errors = []
+
+    log.info("📤 Upload de %d workouts (%d en parallèle)...", len(cycling_workouts), UPLOAD_CONCURRENCY)
+    log.info("")
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+        futures = {executor.submit(convert_and_upload, w): w for w in cycling_workouts}
+
+        for future in as_completed(futures):
+            code = futures[future]['code']
+            log.info("📤 %s", code)
+
+            try:
+                garmin_workout, result = future.result()
+            except Exception as e:
+                log.error("   ❌ Erreur: %s", e, exc_info=log.isEnabledFor(logging.DEBUG))
+                errors.append({'code': code, 'error': str(e)})
+                log.info("")
+                continue
+
+            duration_min = garmin_workout['estimatedDurationInSecs'] // 60
+            num_steps = len(garmin_workout['workoutSegments'][0]['workoutSteps'])
+            log.info("   Durée: %d min, Steps: %d", duration_min, num_steps)
+
+            workout_id = result.get('workoutId', 'UNKNOWN')
+            workout_name = result.get('workoutName', code)
+
+            uploaded.append({
+                'code': code,
+                'id': workout_id,
+                'name': workout_name
+            })
+
+            log.info("   ✅ Workout ID: %s", workout_id)
+            log.info("")
+
+    # Résumé
+    log.info("=" * 70)
+    log.info("📊 RÉSUMÉ")
+    log.info("=" * 70)
+    log.info("")
+
+    if uploaded:
+        log.info("✅ %d workouts uploadés avec succès:", len(uploaded))
+        for w in uploaded:
+            log.info("   - %-6s → ID: %s", w['code'], w['id'])
+        log.info("")
+
+    if errors:
+        log.error("❌ %d erreurs:", len(errors))
+        for e in errors:
+            log.error("   - %-6s → %s", e['code'], e['error'])
+        log.info("")
+
+    log.info("💡 Vérifier sur Garmin Connect:")
+    log.info("   https://connect.garmin.com/modern/workouts")
+
+
+def upload_test_c16(path: Path = S06_WORKOUTS_FILE) -> None:
+    """Uploade la séance C16 d'un cache JSON (test de bout en bout)"""
+    log.info("🚀 Test Upload C16 vers Garmin Connect")
+    log.info("=" * 50)
+
+    log.info("\n📂 Chargement workout depuis %s...", path.name)
+    by_code = {w['code']: w for w in load_cached_workouts(path)}
+    c16 = by_code['C16']
+    log.info("✅ C16 chargé: %s - %s", c16['code'], c16.get('description', ''))
+    log.info("   Date: %s", c16['date'])
+    log.info("   Durée: %s", c16['duration_total'])
+    log.info("   Intervalles: %d", len(c16['intervals']))
+
+    log.info("\n🔐 Connexion à Garmin Connect...")
+
+    try:
+        service = connect_garmin()
+        log.info("✅ Connexion réussie")
+
+        # Upload workout
+        log.info("\n📤 Upload de C16...")
+        result = service.upload_workout(c16)
+
+        log.info("\n✅ Upload réussi!")
+        log.info("   Workout ID: %s", result.get('workoutId', 'N/A'))
+        log.info("   Workout Name: %s", result.get('workoutName', 'N/A'))
+
+        log.info("\n💡 Vérifier sur Garmin Connect:")
+        log.info("   https://connect.garmin.com/modern/workouts")
+
+    except Exception as e:
+        log.error("\n❌ Erreur: %s", e, exc_info=log.isEnabledFor(logging.DEBUG))
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--verbose', action='store_true', help="Détails et traceback complète en cas d'erreur")
+
+    parser = argparse.ArgumentParser(description="Upload de séances vers Garmin Connect")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    weekly = commands.add_parser('weekly', parents=[common], help="Parse puis upload hebdomadaire des séances Garmin")
+    weekly.add_argument("pdf_path", help="Chemin vers le PDF de la semaine")
+    weekly.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Valide parse+conversion sans upload vers Garmin Connect",
+    )
+    weekly.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Uploade les séances une par une au lieu de les envoyer en parallèle",
+    )
+
+    codes = commands.add_parser('codes', parents=[common], help="Upload de séances choisies d'un PDF")
+    codes.add_argument('codes', nargs='+', help="Codes des séances (ex: C18 CAP19)")
+    codes.add_argument('--pdf', required=True, help="Chemin vers le PDF des séances")
+
+    commands.add_parser('all-cycling', parents=[common], help="Upload des séances cyclisme du cache S06")
+    commands.add_parser('test-c16', parents=[common], help="Upload de test de C16 (cache S06)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else os.getenv('LOGLEVEL', 'INFO'),
+        format='%(message)s',
+        stream=sys.stdout
+    )
+
+    if args.command == 'weekly':
+        if not Path(args.pdf_path).exists():
+            log.error("❌ Erreur: Le fichier n'existe pas: %s", args.pdf_path)
+            sys.exit(1)
+        upload_weekly_workouts(args.pdf_path, dry_run=args.dry_run, sequential=args.sequential)
+    elif args.command == 'codes':
+        upload_codes(args.codes, args.pdf)
+    elif args.command == 'all-cycling':
+        upload_all_cycling()
+    else:
+        upload_test_c16()
+
+
+if __name__ == '__main__':
+    main()
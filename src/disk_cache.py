@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cache disque (shelve) des réponses Garmin pour les scripts de récupération
+
+Relancer un script sur la même semaine ne refait pas les appels Garmin tant
+que la réponse enregistrée a moins de ttl secondes. Clé = (nom, arguments).
+Seules les réponses exploitables sont enregistrées (voir has_data) : un appel
+en échec, que le service a transformé en None, est refait à la relance suivante.
+
+Usage:
+    cache = DiskCache(ttl=3600)
+    get_activities = cache.wrap(service.get_activities, "activities")
+    activities = get_activities("2026-02-02", "2026-02-08", limit=100)
+"""
+
+import functools
+import inspect
+import shelve
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+DEFAULT_CACHE_FILE = Path(__file__).parent.parent / "data" / "cache" / "garmin_api"
+DEFAULT_CACHE_TTL = 3600
+
+_MISS = object()
+
+
+def has_data(value: Any) -> bool:
+    """
+    True si la réponse vaut d'être mise en cache
+
+    Les services Garmin renvoient None (ou {date: None} pour une plage) au lieu
+    de lever une exception : une réponse vide peut donc être un échec réseau.
+    """
+    if isinstance(value, dict):
+        return any(v is not None for v in value.values())
+    return value is not None
+
+
+class DiskCache:
+    """Mémoïsation persistante avec durée de vie ; ttl <= 0 désactive le cache"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_FILE, ttl: float = DEFAULT_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        # Un seul accès au fichier shelve à la fois (appels depuis plusieurs threads)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _key(name: str, args: Tuple, kwargs: dict) -> str:
+        return repr((name, args, sorted(kwargs.items())))
+
+    def get(self, key: str) -> Any:
+        """Valeur encore valide pour key, sinon _MISS"""
+        if not self.enabled:
+            return _MISS
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, shelve.open(str(self.path)) as db:
+            entry = db.get(key)
+        if entry is None:
+            return _MISS
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl:
+            return _MISS
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, shelve.open(str(self.path)) as db:
+            db[key] = (time.time(), value)
+
+    def wrap(self, fn: Callable, name: str, cacheable: Optional[Callable[[Any], bool]] = has_data) -> Callable:
+        """
+        Enveloppe fn (fonction ou coroutine) : lecture du cache, sinon appel puis écriture
+
+        Une exception levée par fn n'est jamais enregistrée ; un résultat pour
+        lequel cacheable(résultat) est faux non plus (None : tout enregistrer).
+        """
+        def store(key: str, value: Any) -> None:
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def cached_async(*args, **kwargs):
+                key = self._key(name, args, kwargs)
+                value = self.get(key)
+                if value is _MISS:
+                    value = await fn(*args, **kwargs)
+                    store(key, value)
+                return value
+            return cached_async
+
+        @functools.wraps(fn)
+        def cached(*args, **kwargs):
+            key = self._key(name, args, kwargs)
+            value = self.get(key)
+            if value is _MISS:
+                value = fn(*args, **kwargs)
+                store(key, value)
+            return value
+        return cached
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Conversion XLS → XLSX en streaming
+
+Lit les cellules (python-calamine si disponible, sinon xlrd avec une feuille
+par processus) et les écrit directement dans un classeur openpyxl en mode
+write_only : pas de DataFrame intermédiaire.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Iterator, List, Tuple, Union
+
+import openpyxl
+
+# Lecteur Rust (pip install python-calamine), nettement plus rapide que xlrd
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# xlrd n'est nécessaire qu'en l'absence de python-calamine
+try:
+    import xlrd
+except ImportError:
+    xlrd = None
+
+
+def _cell_values(book: "xlrd.Book", sheet: "xlrd.sheet.Sheet", row_idx: int) -> List[Any]:
+    """Valeurs d'une ligne xlrd, dates converties en datetime et cellules vides à None"""
+    values = sheet.row_values(row_idx)
+    for col_idx, ctype in enumerate(sheet.row_types(row_idx)):
+        if ctype == xlrd.XL_CELL_DATE:
+            values[col_idx] = xlrd.xldate_as_datetime(values[col_idx], book.datemode)
+        elif ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+            values[col_idx] = None
+        elif ctype == xlrd.XL_CELL_BOOLEAN:
+            values[col_idx] = bool(values[col_idx])
+    return values
+
+
+def iter_sheet_rows(book: "xlrd.Book", sheet: "xlrd.sheet.Sheet") -> Iterator[List[Any]]:
+    """Itère les lignes d'une feuille xlrd, prêtes pour openpyxl"""
+    for row_idx in range(sheet.nrows):
+        yield _cell_values(book, sheet, row_idx)
+
+
+def parse_sheet(xls_path: Union[str, Path], sheet_idx: int) -> Tuple[str, List[List[Any]]]:
+    """
+    Lit une seule feuille xlrd (worker ProcessPoolExecutor)
+
+    Returns:
+        (nom de la feuille, lignes prêtes pour openpyxl)
+    """
+    book = xlrd.open_workbook(str(xls_path), on_demand=True)
+    try:
+        sheet = book.sheet_by_index(sheet_idx)
+        return sheet.name, list(iter_sheet_rows(book, sheet))
+    finally:
+        book.release_resources()
+
+
+def stream_xls_to_xlsx(xls_path: Union[str, Path], xlsx_path: Union[str, Path, IO[bytes]]) -> List[Tuple[str, int]]:
+    """
+    Transcode un fichier .xls en .xlsx feuille par feuille
+
+    Args:
+        xls_path: Fichier .xls source
+        xlsx_path: Fichier .xlsx à créer (écrasé s'il existe) ou flux binaire
+
+    Returns:
+        Liste (nom de feuille, nombre de lignes), dans l'ordre du classeur
+    """
+    if CalamineWorkbook is not None:
+        return _calamine_to_xlsx(xls_path, xlsx_path)
+    if xlrd is None:
+        raise ImportError("Lecture .xls impossible : installer python-calamine (ou xlrd)")
+
+    book = xlrd.open_workbook(str(xls_path), on_demand=True)
+    nsheets = book.nsheets
+    wb = openpyxl.Workbook(write_only=True)
+    sheets = []
+
+    # Une seule feuille : réutiliser le classeur déjà ouvert plutôt que de le
+    # relire dans un worker
+    if nsheets <= 1:
+        for sheet_idx in range(nsheets):
+            sheet = book.sheet_by_index(sheet_idx)
+            ws = wb.create_sheet(sheet.name)
+            for row in iter_sheet_rows(book, sheet):
+                ws.append(row)
+            sheets.append((sheet.name, sheet.nrows))
+        book.release_resources()
+        wb.save(xlsx_path)
+        return sheets
+
+    book.release_resources()
+
+    # xlrd est du Python pur : une feuille par processus pour contourner le GIL
+    with ProcessPoolExecutor(max_workers=min(nsheets, os.cpu_count() or 1)) as executor:
+        for sheet_name, rows in executor.map(parse_sheet, [xls_path] * nsheets, range(nsheets)):
+            ws = wb.create_sheet(sheet_name)
+            for row in rows:
+                ws.append(row)
+            sheets.append((sheet_name, len(rows)))
+
+    wb.save(xlsx_path)
+    return sheets
+
+
+def _calamine_to_xlsx(xls_path: Union[str, Path], xlsx_path: Union[str, Path, IO[bytes]]) -> List[Tuple[str, int]]:
+    """Variante python-calamine de stream_xls_to_xlsx (valeurs déjà typées, dates incluses)"""
+    book = CalamineWorkbook.from_path(str(xls_path))
+    wb = openpyxl.Workbook(write_only=True)
+
+    sheets = []
+    for sheet_name in book.sheet_names:
+        ws = wb.create_sheet(sheet_name)
+        # skip_empty_area=False : conserver les lignes/colonnes vides en tête
+        rows = book.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+        for row in rows:
+            # Liste propre à chaque ligne : modifiée sur place plutôt que recopiée
+            # (append() en write_only sérialise la ligne immédiatement)
+            for col_idx, value in enumerate(row):
+                if value == "":
+                    row[col_idx] = None
+            ws.append(row)
+        sheets.append((sheet_name, len(rows)))
+
+    wb.save(xlsx_path)
+    return sheets
+
+
+def convert_and_open(xls_path: Union[str, Path]) -> "openpyxl.Workbook":
+    """
+    Convertit un .xls et retourne le classeur .xlsx modifiable, sans passer par le disque
+
+    La conversion est faite en write_only dans un tampon mémoire puis rechargée :
+    l'appelant remplit les cellules et ne sauvegarde qu'une fois.
+    """
+    buffer = io.BytesIO()
+    stream_xls_to_xlsx(xls_path, buffer)
+    buffer.seek(0)
+    return openpyxl.load_workbook(buffer)
@@ -5,11 +5,78 @@ Générateur de fichiers FIT pour workouts Garmin
 Convertit les workouts JSON en fichiers FIT pour upload vers Garmin Connect
 """
 
+import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
 from fitparse import FitFile
 import struct
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# À partir de ce nombre d'intervalles, le parsing vectorisé (numpy) est plus rapide
+VECTORIZE_MIN_INTERVALS = 20
+
+# Secondes entre l'epoch Unix et l'epoch FIT (1989-12-31 00:00 UTC)
+FIT_EPOCH_OFFSET = 631065600
+
+try:
+    import crcmod.predefined
+except ImportError:
+    crcmod = None
+
+
+def _crc16_table() -> tuple:
+    """Table octet par octet du CRC-16 FIT (polynôme 0x8005 réfléchi : 0xA001)"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_FIT_CRC_TABLE = _crc16_table()
+
+
+def _fit_crc_table(data: bytes, crc: int = 0) -> int:
+    """CRC-16 FIT de data, un octet par itération"""
+    table = _FIT_CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+# CRC-16 FIT (= CRC-16/ARC) : implémentation C de crcmod si disponible
+_fit_crc = _fit_crc_table if crcmod is None else crcmod.predefined.mkPredefinedCrcFun('crc-16')
+
+
+def _fit_timestamp(moment: datetime) -> int:
+    """Horodatage FIT (secondes depuis l'epoch FIT)"""
+    return int(moment.timestamp()) - FIT_EPOCH_OFFSET
+
+
+def _fit_string(text: str, size: int = 16) -> bytes:
+    """Chaîne UTF-8 tronquée pour tenir dans size octets avec son zéro final"""
+    return text.encode('utf-8')[:size - 1].decode('utf-8', 'ignore').encode('utf-8')
+
+
+def _definition(local_type: int, global_number: int, fields: tuple) -> bytes:
+    """Message de définition FIT (little-endian) pour un type de message local"""
+    header = struct.pack('<BBBHB', 0x40 | local_type, 0, 0, global_number, len(fields))
+    return header + b''.join(struct.pack('<BBB', *field) for field in fields)
+
+
+def _put(buf: bytearray, offset: int, data: bytes) -> int:
+    """Copie data dans buf à offset ; retourne l'offset suivant"""
+    end = offset + len(data)
+    buf[offset:end] = data
+    return end
+
 
 class FITWorkoutGenerator:
     """Générateur de fichiers FIT pour workouts cyclisme"""
@@ -18,53 +85,157 @@ class FITWorkoutGenerator:
     SPORT_CYCLING = 2
     SUB_SPORT_INDOOR_CYCLING = 6
 
+    # Valeurs du profil FIT (enums intensity et wkt_step_target)
     INTENSITY_ACTIVE = 0
     INTENSITY_REST = 1
-    INTENSITY_WARMUP = 0
-    INTENSITY_COOLDOWN = 1
+    INTENSITY_WARMUP = 2
+    INTENSITY_COOLDOWN = 3
 
     DURATION_TYPE_TIME = 0  # Secondes
-    TARGET_TYPE_POWER = 1
+    TARGET_TYPE_POWER = 4
+
+    # Durée "MM:SS" ou "MM" (minutes seules), puissance "XXX" ou "XXXàYYY"
+    _DUR_RE = re.compile(r'^\s*(\d+)(?::(\d+))?\s*$')
+    _PWR_RE = re.compile(r'^\s*(\d+)\s*(?:à\s*(\d+))?\s*$')
+
+    # Intensité selon la phase (première correspondance, sinon INTENSITY_ACTIVE)
+    _PHASE_TAGS = (
+        ('chauffement', INTENSITY_WARMUP),
+        ('cup', INTENSITY_COOLDOWN),
+        ('repos', INTENSITY_REST),
+        ('récup', INTENSITY_REST),
+    )
+
+    # En-tête et encodage FIT (profil 21.32, little-endian)
+    FIT_HEADER_SIZE = 14
+    FIT_PROTOCOL_VERSION = 0x20  # 2.0
+    FIT_PROFILE_VERSION = 2132  # 21.32
+    FIT_CRC_SIZE = 2
+    FIT_STRING_SIZE = 16
+    FIT_ENUM_INVALID = 0xFF
+    FIT_POWER_OFFSET = 1000  # Puissance custom : watts + 1000
+
+    FILE_TYPE_WORKOUT = 5
+    MANUFACTURER_DEVELOPMENT = 255
+
+    _HEADER = struct.Struct('<BBHI4sH')
+
+    # Messages locaux : (type local, n° global, champs (n° champ, taille, type de base))
+    _LOCAL_FILE_ID, _LOCAL_WORKOUT, _LOCAL_STEP = 0, 1, 2
+    _FILE_ID_DEFINITION = _definition(_LOCAL_FILE_ID, 0, (
+        (0, 1, 0x00),    # type
+        (1, 2, 0x84),    # manufacturer
+        (2, 2, 0x84),    # product
+        (4, 4, 0x86),    # time_created
+    ))
+    _FILE_ID_DATA = struct.Struct('<BBHHI')
+    _WORKOUT_DEFINITION = _definition(_LOCAL_WORKOUT, 26, (
+        (4, 1, 0x00),    # sport
+        (11, 1, 0x00),   # sub_sport
+        (5, 4, 0x8C),    # capabilities
+        (6, 2, 0x84),    # num_valid_steps
+        (8, 16, 0x07),   # wkt_name
+    ))
+    _WORKOUT_DATA = struct.Struct('<BBBIH16s')
+    _STEP_DEFINITION = _definition(_LOCAL_STEP, 27, (
+        (254, 2, 0x84),  # message_index
+        (0, 16, 0x07),   # wkt_step_name
+        (1, 1, 0x00),    # duration_type
+        (2, 4, 0x86),    # duration_value
+        (3, 1, 0x00),    # target_type
+        (4, 4, 0x86),    # target_value
+        (5, 4, 0x86),    # custom_target_value_low
+        (6, 4, 0x86),    # custom_target_value_high
+        (7, 1, 0x00),    # intensity
+    ))
+    _STEP_DATA = struct.Struct('<BH16sBIBIIIB')
 
     def __init__(self):
         self.messages = []
 
-    def generate_cycling_workout(self, workout: Dict) -> bytes:
+    def generate_cycling_workout(self, workout: Dict) -> Dict:
         """
-        Génère un fichier FIT pour un workout cyclisme
+        Génère les messages FIT (workout + steps) d'un workout cyclisme
 
         Args:
             workout: Dict avec structure JSON du workout
 
         Returns:
-            bytes du fichier FIT
+            Dict {'workout': message workout, 'steps': messages workout_step},
+            à sérialiser avec encode_fit()
         """
-        # File header
-        fit_data = bytearray()
-
-        # FIT file header (14 bytes)
-        header_size = 14
-        protocol_version = 0x20  # 2.0
-        profile_version = 2132  # 21.32
-        data_size = 0  # Will be calculated
-        data_type = b'.FIT'
-
         # Créer workout file message
         workout_msg = self._create_workout_message(workout)
 
         # Créer workout step messages pour chaque intervalle
-        step_messages = []
-        for idx, interval in enumerate(workout['intervals']):
-            step_msg = self._create_workout_step(idx, interval)
-            step_messages.append(step_msg)
+        step_messages = self._create_workout_steps(workout['intervals'])
 
-        # TODO: Encoder en format FIT binaire
-        # Pour l'instant, retourner structure JSON pour debugging
         return {
             'workout': workout_msg,
             'steps': step_messages
         }
 
+    def encode_fit(self, messages: Dict) -> bytes:
+        """
+        Encode les messages de generate_cycling_workout en fichier FIT binaire
+
+        La taille du fichier est connue d'avance (formats fixes) : le buffer est
+        alloué une fois puis rempli avec struct.pack_into.
+        """
+        workout_msg = messages['workout']
+        steps = messages['steps']
+
+        data_size = (
+            len(self._FILE_ID_DEFINITION) + self._FILE_ID_DATA.size
+            + len(self._WORKOUT_DEFINITION) + self._WORKOUT_DATA.size
+            + len(self._STEP_DEFINITION) + self._STEP_DATA.size * len(steps)
+        )
+        buf = bytearray(self.FIT_HEADER_SIZE + data_size + self.FIT_CRC_SIZE)
+
+        # En-tête (14 octets, CRC sur les 12 premiers)
+        self._HEADER.pack_into(
+            buf, 0, self.FIT_HEADER_SIZE, self.FIT_PROTOCOL_VERSION,
+            self.FIT_PROFILE_VERSION, data_size, b'.FIT', 0
+        )
+        struct.pack_into('<H', buf, 12, _fit_crc(buf[:12]))
+        offset = self.FIT_HEADER_SIZE
+
+        # file_id : type workout
+        offset = _put(buf, offset, self._FILE_ID_DEFINITION)
+        self._FILE_ID_DATA.pack_into(
+            buf, offset, self._LOCAL_FILE_ID, self.FILE_TYPE_WORKOUT,
+            self.MANUFACTURER_DEVELOPMENT, 0, _fit_timestamp(datetime.now())
+        )
+        offset += self._FILE_ID_DATA.size
+
+        # workout
+        offset = _put(buf, offset, self._WORKOUT_DEFINITION)
+        sub_sport = workout_msg['sub_sport']
+        self._WORKOUT_DATA.pack_into(
+            buf, offset, self._LOCAL_WORKOUT, workout_msg['sport'],
+            self.FIT_ENUM_INVALID if sub_sport is None else sub_sport,
+            workout_msg['capabilities'], workout_msg['num_valid_steps'],
+            _fit_string(workout_msg['wkt_name'])
+        )
+        offset += self._WORKOUT_DATA.size
+
+        # workout_step (durée en ms, puissance custom en watts + 1000)
+        offset = _put(buf, offset, self._STEP_DEFINITION)
+        for step in steps:
+            self._STEP_DATA.pack_into(
+                buf, offset, self._LOCAL_STEP, step['message_index'],
+                _fit_string(step['wkt_step_name']), step['duration_type'],
+                step['duration_value'] * 1000, step['target_type'], step['target_value'],
+                step['custom_target_value_low'] + self.FIT_POWER_OFFSET,
+                step['custom_target_value_high'] + self.FIT_POWER_OFFSET,
+                step['intensity']
+            )
+            offset += self._STEP_DATA.size
+
+        # CRC du fichier (en-tête + données)
+        struct.pack_into('<H', buf, offset, _fit_crc(buf[:offset]))
+        return bytes(buf)
+
     def _create_workout_message(self, workout: Dict) -> Dict:
         """Crée le message workout principal"""
         return {
@@ -75,37 +246,79 @@ class FITWorkoutGenerator:
             'wkt_name': workout['code']
         }
 
+    def _create_workout_steps(self, intervals: List[Dict]) -> List[Dict]:
+        """
+        Crée les workout steps de tous les intervalles
+
+        Les durées, puissances et intensités sont calculées d'un bloc avec numpy
+        pour les longues séances ; sinon (ou sans numpy) intervalle par intervalle.
+        """
+        if np is None or len(intervals) < VECTORIZE_MIN_INTERVALS:
+            return [self._create_workout_step(idx, interval) for idx, interval in enumerate(intervals)]
+
+        # Durées "MM:SS" ou "MM" (minutes seules) ; astype lève ValueError si invalide
+        durations = np.char.partition(np.array([interval['duration'] for interval in intervals]), ':')
+        seconds = np.where(durations[:, 1] == ':', durations[:, 2], '0')
+        duration_seconds = durations[:, 0].astype(np.int32) * 60 + seconds.astype(np.int32)
+
+        # Puissances "XXXàYYY" ou "XXX"
+        powers = np.char.partition(np.array([interval['power_watts'] for interval in intervals]), 'à')
+        power_low = powers[:, 0].astype(np.int32)
+        power_high = np.where(powers[:, 1] == 'à', powers[:, 2], powers[:, 0]).astype(np.int32)
+
+        # Intensités : tags appliqués du dernier au premier pour que le premier l'emporte
+        phases_lower = np.char.lower(np.array([interval.get('phase', '') for interval in intervals]))
+        intensities = np.full(len(intervals), self.INTENSITY_ACTIVE, dtype=np.int32)
+        for tag, tag_intensity in reversed(self._PHASE_TAGS):
+            intensities[np.char.find(phases_lower, tag) >= 0] = tag_intensity
+
+        return [
+            {
+                'message_index': step_index,
+                'wkt_step_name': f"{interval.get('phase', 'Step')} {step_index+1}",
+                'duration_type': self.DURATION_TYPE_TIME,
+                'duration_value': duration_value,
+                'target_type': self.TARGET_TYPE_POWER,
+                'target_value': 0,  # Custom zone
+                'custom_target_value_low': low,
+                'custom_target_value_high': high,
+                'intensity': intensity
+            }
+            for step_index, (interval, duration_value, low, high, intensity) in enumerate(zip(
+                intervals,
+                duration_seconds.tolist(),
+                power_low.tolist(),
+                power_high.tolist(),
+                intensities.tolist()
+            ))
+        ]
+
     def _create_workout_step(self, step_index: int, interval: Dict) -> Dict:
         """Crée un workout step pour un intervalle"""
 
-        # Parser durée (format "MM:SS")
+        # Parser durée (format "MM:SS", ou "MM" en minutes)
         duration_str = interval['duration']
-        if ':' in duration_str:
-            parts = duration_str.split(':')
-            duration_seconds = int(parts[0]) * 60 + int(parts[1])
-        else:
-            duration_seconds = int(duration_str) * 60
+        match = self._DUR_RE.match(duration_str)
+        if not match:
+            raise ValueError(f"Durée invalide: {duration_str!r}")
+        minutes, seconds = match.groups()
+        duration_seconds = int(minutes) * 60 + int(seconds or 0)
 
-        # Parser puissance (format "XXXàYYY")
+        # Parser puissance (format "XXXàYYY" ou "XXX")
         power_str = interval['power_watts']
-        if 'à' in power_str:
-            power_min, power_max = power_str.split('à')
-            target_power_low = int(power_min)
-            target_power_high = int(power_max)
-        else:
-            target_power_low = int(power_str)
-            target_power_high = int(power_str)
+        match = self._PWR_RE.match(power_str)
+        if not match:
+            raise ValueError(f"Puissance invalide: {power_str!r}")
+        power_min, power_max = match.groups()
+        target_power_low = int(power_min)
+        target_power_high = int(power_max or power_min)
 
         # Déterminer intensité
-        phase = interval.get('phase', '')
-        if 'chauffement' in phase.lower():
-            intensity = self.INTENSITY_WARMUP
-        elif 'cup' in phase.lower():
-            intensity = self.INTENSITY_COOLDOWN
-        elif 'repos' in phase.lower() or 'récup' in phase.lower():
-            intensity = self.INTENSITY_REST
-        else:
-            intensity = self.INTENSITY_ACTIVE
+        phase_lower = interval.get('phase', '').lower()
+        intensity = next(
+            (tag_intensity for tag, tag_intensity in self._PHASE_TAGS if tag in phase_lower),
+            self.INTENSITY_ACTIVE
+        )
 
         return {
             'message_index': step_index,
@@ -132,27 +345,26 @@ def create_fit_from_json(workout_json: Dict, output_path: str) -> str:
         Chemin du fichier créé
     """
     generator = FITWorkoutGenerator()
+    fit_data = generator.encode_fit(generator.generate_cycling_workout(workout_json))
 
-    # Pour l'instant, on ne peut pas générer de vrais fichiers FIT
-    # car fitparse est en lecture seule
-    # Il faudrait utiliser une librairie d'écriture FIT
-
-    print("⚠️  Génération FIT non disponible")
-    print("💡 Utiliser garmin-workouts (YAML) ou API Garmin directe")
-
-    return None
+    Path(output_path).write_bytes(fit_data)
+    return output_path
 
 
 if __name__ == '__main__':
     # Test avec C16
-    import json
+    import sys
+
+    import orjson
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from src.workout_cache import load_workouts
 
-    with open('data/workouts_cache/S06_workouts_v6_near_final.json') as f:
-        data = json.load(f)
+    data = load_workouts('data/workouts_cache/S06_workouts_v6_near_final.json')
 
     c16 = [w for w in data['workouts'] if w['code'] == 'C16'][0]
 
     generator = FITWorkoutGenerator()
     result = generator.generate_cycling_workout(c16)
 
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
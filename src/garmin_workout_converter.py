@@ -9,6 +9,10 @@ from typing import Dict, List, Any
 from datetime import datetime
 import re
 
+# Motifs compilés une fois : nombres (puissance "XXXàYYY", minutes seules), durée "MM:SS"
+_DIGITS_RE = re.compile(r'\d+')
+_MMSS_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
 
 def detect_repeat_groups(intervals: List[Dict]) -> List[Dict]:
     """
@@ -209,7 +213,7 @@ def create_cycling_step(step_order: int, interval: Dict) -> Dict[str, Any]:
 
     # Parser puissance (format "XXXàYYY")
     power_str = str(interval['power_watts'])
-    power_values = [int(v) for v in re.findall(r'\d+', power_str)]
+    power_values = [int(v) for v in _DIGITS_RE.findall(power_str)]
     if len(power_values) >= 2:
         target_power_low = power_values[0]
         target_power_high = power_values[1]
@@ -270,11 +274,11 @@ def parse_duration_to_seconds(duration_str: str) -> int:
 
     raw = str(duration_str).strip()
 
-    mmss = re.search(r'(\d{1,2}):(\d{2})', raw)
+    mmss = _MMSS_RE.search(raw)
     if mmss:
         return int(mmss.group(1)) * 60 + int(mmss.group(2))
 
-    if re.fullmatch(r'\d+', raw):
+    if _DIGITS_RE.fullmatch(raw):
         return int(raw) * 60
 
     raise ValueError(f"Unsupported duration format: {duration_str!r}")
@@ -429,9 +433,13 @@ def create_running_step(step_order: int, interval: Dict) -> Dict[str, Any]:
 if __name__ == '__main__':
     # Test avec C16
     import json
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from src.workout_cache import load_workouts
 
-    with open('data/workouts_cache/S06_workouts_v6_near_final.json') as f:
-        data = json.load(f)
+    data = load_workouts('data/workouts_cache/S06_workouts_v6_near_final.json')
 
     c16 = [w for w in data['workouts'] if w['code'] == 'C16'][0]
 
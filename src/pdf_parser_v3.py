@@ -12,12 +12,19 @@ CORRECTIONS MAJEURES V3:
 """
 
 import re
+import os
 import json
+import hashlib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import orjson
 import pdfplumber
 
+# Résultats de parse() déjà calculés, un JSON par (PDF, mtime, taille, version des parsers)
+PDF_CACHE_DIR = Path(__file__).parent.parent / "data" / ".pdf_cache"
+_PARSER_SOURCES = (Path(__file__), Path(__file__).parent / "table_based_parser.py")
+
 
 class TriathlonPDFParserV3:
     """Parser PDF d'entraînements avec corrections complètes"""
@@ -1753,6 +1760,33 @@ def parse_pdf(pdf_path: str) -> Dict:
         return parser.parse()
 
 
+def _pdf_cache_key(pdf_path: Path) -> str:
+    """Clé de cache : chemin, mtime et taille du PDF + mtime des modules de parsing"""
+    stat = pdf_path.stat()
+    parts = [str(pdf_path.resolve()), str(stat.st_mtime_ns), str(stat.st_size)]
+    parts += [str(source.stat().st_mtime_ns) for source in _PARSER_SOURCES if source.exists()]
+    return hashlib.sha1(":".join(parts).encode()).hexdigest()
+
+
+def parse_cached(pdf_path: str) -> Dict:
+    """
+    Comme parse_pdf, mais réutilise le résultat sauvegardé dans data/.pdf_cache
+
+    Le cache est invalidé dès que le PDF ou le code des parsers change.
+    """
+    cache_file = PDF_CACHE_DIR / f"{_pdf_cache_key(Path(pdf_path))}.json"
+    if cache_file.exists():
+        return orjson.loads(cache_file.read_bytes())
+
+    result = parse_pdf(pdf_path)
+
+    PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    tmp_file.write_bytes(orjson.dumps(result))
+    os.replace(tmp_file, cache_file)
+    return result
+
+
 if __name__ == "__main__":
     import sys
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Cache en mémoire des fichiers JSON de séances parsées (data/workouts_cache)
+
+Un même fichier n'est lu et décodé qu'une fois par processus, tant qu'il
+n'est pas modifié (clé = chemin + mtime). Le dict renvoyé est partagé entre
+les appelants : ne pas le modifier.
+
+Usage:
+    from src.workout_cache import load_workouts
+    workouts = load_workouts("data/workouts_cache/S06_workouts_v6_near_final.json")['workouts']
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import orjson
+
+
+@functools.lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Fichier décodé pour une version (mtime) donnée"""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def load_workouts(path: Union[str, Path]) -> Dict[str, Any]:
+    """Contenu JSON d'un cache de séances, décodé au premier appel seulement"""
+    resolved = str(Path(path).resolve())
+    return _load(resolved, os.stat(resolved).st_mtime_ns)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Modification ciblée de cellules dans un classeur .xlsx existant
+
+Au lieu de charger tout le modèle objet (openpyxl) puis de réécrire chaque
+partie XML, seules les feuilles touchées (et styles.xml si un format de
+nombre est demandé) sont réécrites ; les autres membres de l'archive sont
+recopiés tels quels. Formules, mise en forme et liens du modèle sont donc
+conservés à l'identique.
+
+Usage:
+    patcher = XlsxPatcher("modele.xlsx")
+    patcher.set("Lundi", "L4", "CAP17")
+    patcher.set("Lundi", "M6", 0.042, number_format="hh:mm")
+    patcher.save("modele_garmin.xlsx")
+"""
+
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+WORKBOOK_XML = "xl/workbook.xml"
+WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+STYLES_XML = "xl/styles.xml"
+CALC_CHAIN_XML = "xl/calcChain.xml"
+CONTENT_TYPES_XML = "[Content_Types].xml"
+
+# Premier identifiant libre pour un format de nombre personnalisé
+FIRST_CUSTOM_NUMFMT_ID = 164
+
+_COORD_RE = re.compile(r'^([A-Z]+)(\d+)$')
+_CELL_RE = re.compile(r'<c\b[^>]*?(?:/>|>.*?</c>)', re.DOTALL)
+_ROW_RE = re.compile(r'<row\b[^>]*?(?:/>|>.*?</row>)', re.DOTALL)
+_REF_ATTR_RE = re.compile(r'\br="([A-Z]*)(\d+)"')
+_STYLE_ATTR_RE = re.compile(r'\bs="(\d+)"')
+_XF_RE = re.compile(r'<xf\b[^>]*?(?:/>|>.*?</xf>)', re.DOTALL)
+
+
+class XlsxPatchError(Exception):
+    """Le classeur ne peut pas être modifié sans risque par patch XML"""
+
+
+def _column_index(letters: str) -> int:
+    """'A' → 1, 'AA' → 27"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _column_letters(index: int) -> str:
+    """1 → 'A', 27 → 'AA'"""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _split_coordinate(coordinate: str) -> Tuple[int, int]:
+    """'F4' → (4, 6)"""
+    match = _COORD_RE.match(coordinate)
+    if not match:
+        raise ValueError(f"Coordonnée invalide: {coordinate}")
+    return int(match.group(2)), _column_index(match.group(1))
+
+
+def _cell_xml(coordinate: str, value: Any, style_id: Optional[int]) -> str:
+    """Élément <c> pour une valeur Python (texte en chaîne inline, nombre, booléen)"""
+    style = f' s="{style_id}"' if style_id else ''
+    if value is None:
+        return f'<c r="{coordinate}"{style}/>'
+    if isinstance(value, bool):
+        return f'<c r="{coordinate}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{coordinate}"{style}><v>{value!r}</v></c>'
+    text = escape(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{coordinate}"{style} t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def _insert_sorted(content: str, pattern: "re.Pattern", key: int, key_of, new_xml: str) -> str:
+    """Insère new_xml avant le premier élément dont la clé dépasse key"""
+    for match in pattern.finditer(content):
+        if key_of(match.group(0)) > key:
+            return content[:match.start()] + new_xml + content[match.start():]
+    return content + new_xml
+
+
+def _row_number(row_xml: str) -> int:
+    return int(re.search(r'\br="(\d+)"', row_xml).group(1))
+
+
+def _cell_column(cell_xml: str) -> int:
+    return _column_index(_REF_ATTR_RE.search(cell_xml).group(1))
+
+
+class XlsxPatcher:
+    """Enregistre des valeurs de cellules puis les écrit dans une copie du classeur"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        # feuille → {coordonnée: (valeur, format de nombre)}
+        self.edits: Dict[str, Dict[str, Tuple[Any, Optional[str]]]] = {}
+        with zipfile.ZipFile(self.path) as archive:
+            self._sheet_parts = self._read_sheet_parts(archive)
+
+    @staticmethod
+    def _read_sheet_parts(archive: zipfile.ZipFile) -> Dict[str, str]:
+        """Nom de feuille → membre XML de l'archive, d'après workbook.xml et ses relations"""
+        workbook = ElementTree.fromstring(archive.read(WORKBOOK_XML))
+        rels = ElementTree.fromstring(archive.read(WORKBOOK_RELS))
+        targets = {
+            rel.get("Id"): rel.get("Target")
+            for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship")
+        }
+
+        parts = {}
+        for sheet in workbook.iter(f"{{{NS_MAIN}}}sheet"):
+            target = targets[sheet.get(f"{{{NS_REL}}}id")]
+            if target.startswith("/"):
+                parts[sheet.get("name")] = target.lstrip("/")
+            else:
+                parts[sheet.get("name")] = posixpath.normpath(posixpath.join("xl", target))
+        return parts
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheet_parts)
+
+    def set(self, sheet_name: str, coordinate: str, value: Any, number_format: Optional[str] = None) -> None:
+        """Programme l'écriture de value dans sheet_name!coordinate (ex: 'F4')"""
+        if sheet_name not in self._sheet_parts:
+            raise KeyError(f"Feuille introuvable: {sheet_name}")
+        _split_coordinate(coordinate)
+        self.edits.setdefault(sheet_name, {})[coordinate] = (value, number_format)
+
+    def save(self, output_path: Union[str, Path]) -> None:
+        """
+        Écrit la copie modifiée du classeur
+
+        Raises:
+            XlsxPatchError: Si une cellule à remplacer porte une formule partagée
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            names = archive.namelist()
+            patched: Dict[str, bytes] = {}
+
+            styles = archive.read(STYLES_XML).decode("utf-8") if STYLES_XML in names else None
+            style_cache: Dict[Tuple[int, str], int] = {}
+            formulas_removed = False
+
+            for sheet_name, cells in self.edits.items():
+                part = self._sheet_parts[sheet_name]
+                xml = archive.read(part).decode("utf-8")
+                for coordinate, (value, number_format) in cells.items():
+                    style_id = None
+                    if number_format is not None:
+                        if styles is None:
+                            raise XlsxPatchError("styles.xml absent : format de nombre impossible")
+                        key = (self._cell_style(xml, coordinate), number_format)
+                        if key not in style_cache:
+                            styles, style_cache[key] = self._add_number_format(styles, *key)
+                        style_id = style_cache[key]
+                    xml, had_formula = self._patch_cell(xml, coordinate, value, style_id)
+                    formulas_removed = formulas_removed or had_formula
+                patched[part] = self._expand_dimension(xml, cells).encode("utf-8")
+
+            if style_cache:
+                patched[STYLES_XML] = styles.encode("utf-8")
+
+            # Les valeurs en cache des formules sont périmées : recalcul complet à l'ouverture
+            patched[WORKBOOK_XML] = self._force_full_calc(archive.read(WORKBOOK_XML).decode("utf-8")).encode("utf-8")
+
+            dropped = set()
+            if formulas_removed and CALC_CHAIN_XML in names:
+                # La chaîne de calcul référence des formules supprimées : Excel la reconstruit
+                dropped.add(CALC_CHAIN_XML)
+                patched[WORKBOOK_RELS] = re.sub(
+                    r'<Relationship\b[^>]*Target="[^"]*calcChain\.xml"[^>]*/>', '',
+                    archive.read(WORKBOOK_RELS).decode("utf-8")
+                ).encode("utf-8")
+                patched[CONTENT_TYPES_XML] = re.sub(
+                    r'<Override\b[^>]*PartName="/xl/calcChain\.xml"[^>]*/>', '',
+                    archive.read(CONTENT_TYPES_XML).decode("utf-8")
+                ).encode("utf-8")
+
+            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as output:
+                for info in archive.infolist():
+                    if info.filename in dropped:
+                        continue
+                    data = patched.get(info.filename)
+                    output.writestr(info, data if data is not None else archive.read(info))
+
+    @staticmethod
+    def _find_cell(xml: str, coordinate: str) -> Optional["re.Match"]:
+        return re.search(rf'<c\b[^>]*\br="{coordinate}"[^>]*?(?:/>|>.*?</c>)', xml, re.DOTALL)
+
+    @classmethod
+    def _cell_style(cls, xml: str, coordinate: str) -> int:
+        """Index du style (cellXfs) de la cellule, 0 si elle n'existe pas"""
+        cell_match = cls._find_cell(xml, coordinate)
+        if cell_match is None:
+            return 0
+        old_cell = cell_match.group(0)
+        style_match = _STYLE_ATTR_RE.search(old_cell[:old_cell.index('>')])
+        return int(style_match.group(1)) if style_match else 0
+
+    @classmethod
+    def _patch_cell(cls, xml: str, coordinate: str, value: Any, style_id: Optional[int]) -> Tuple[str, bool]:
+        """
+        Remplace (ou insère) une cellule dans le XML d'une feuille
+
+        Returns:
+            (xml modifié, True si une formule a été retirée)
+        """
+        row_idx, col_idx = _split_coordinate(coordinate)
+
+        # Cellule existante : on conserve son style sauf demande contraire
+        cell_match = cls._find_cell(xml, coordinate)
+        if cell_match:
+            old_cell = cell_match.group(0)
+            if re.search(r'<f\b[^>]*\bt="shared"[^>]*\bref=', old_cell):
+                raise XlsxPatchError(f"{coordinate} porte une formule partagée")
+            if style_id is None:
+                style_id = cls._cell_style(xml, coordinate)
+            new_cell = _cell_xml(coordinate, value, style_id)
+            return xml[:cell_match.start()] + new_cell + xml[cell_match.end():], '<f' in old_cell
+
+        new_cell = _cell_xml(coordinate, value, style_id)
+        row_match = re.search(rf'<row\b[^>]*\br="{row_idx}"[^>]*?(?:/>|>.*?</row>)', xml, re.DOTALL)
+        if row_match:
+            row_xml = row_match.group(0)
+            open_end = row_xml.index('>') + 1
+            # spans n'est qu'une indication d'optimisation : retirée plutôt que recalculée
+            open_tag = re.sub(r'\sspans="[^"]*"', '', row_xml[:open_end])
+            if open_tag.endswith('/>'):
+                new_row = open_tag[:-2].rstrip() + '>' + new_cell + '</row>'
+            else:
+                content = row_xml[open_end:-len('</row>')]
+                new_row = open_tag + _insert_sorted(content, _CELL_RE, col_idx, _cell_column, new_cell) + '</row>'
+            return xml[:row_match.start()] + new_row + xml[row_match.end():], False
+
+        new_row = f'<row r="{row_idx}">{new_cell}</row>'
+        empty_data = re.search(r'<sheetData\s*/>', xml)
+        if empty_data:
+            return xml[:empty_data.start()] + f'<sheetData>{new_row}</sheetData>' + xml[empty_data.end():], False
+        start = xml.index('>', xml.index('<sheetData')) + 1
+        end = xml.index('</sheetData>')
+        content = _insert_sorted(xml[start:end], _ROW_RE, row_idx, _row_number, new_row)
+        return xml[:start] + content + xml[end:], False
+
+    @staticmethod
+    def _expand_dimension(xml: str, coordinates) -> str:
+        """Étend <dimension ref> aux cellules écrites (lecteurs openpyxl read_only notamment)"""
+        match = re.search(r'<dimension\b[^>]*\bref="([A-Z]+\d+)(?::([A-Z]+\d+))?"', xml)
+        if match is None:
+            return xml
+        bounds = [_split_coordinate(match.group(1)), _split_coordinate(match.group(2) or match.group(1))]
+        bounds.extend(_split_coordinate(coordinate) for coordinate in coordinates)
+        rows = [row for row, _ in bounds]
+        cols = [col for _, col in bounds]
+        ref = f"{_column_letters(min(cols))}{min(rows)}:{_column_letters(max(cols))}{max(rows)}"
+        end = match.end(2) if match.group(2) else match.end(1)
+        return xml[:match.start(1)] + ref + xml[end:]
+
+    @staticmethod
+    def _add_number_format(styles: str, base_style: int, format_code: str) -> Tuple[str, int]:
+        """
+        Ajoute à styles.xml un style copié de base_style avec le format format_code
+
+        Returns:
+            (styles.xml modifié, index du nouveau style dans cellXfs)
+        """
+        escaped_code = escape(format_code, {'"': '&quot;'})
+
+        # Format de nombre : réutilisé s'il existe déjà dans <numFmts>, sinon ajouté
+        block = re.search(r'<numFmts\b[^>]*?(?:/>|>.*?</numFmts>)', styles, re.DOTALL)
+        inner = '' if block is None or block.group(0).endswith('/>') else (
+            block.group(0)[block.group(0).index('>') + 1:-len('</numFmts>')]
+        )
+        existing = re.search(rf'<numFmt\b[^>]*\bnumFmtId="(\d+)"[^>]*\bformatCode="{re.escape(escaped_code)}"', inner)
+        if existing:
+            numfmt_id = int(existing.group(1))
+        else:
+            # Les numFmt des formats conditionnels (dxfs) comptent aussi pour les identifiants pris
+            used_ids = [int(i) for i in re.findall(r'<numFmt\b[^>]*\bnumFmtId="(\d+)"', styles)]
+            numfmt_id = max(used_ids + [FIRST_CUSTOM_NUMFMT_ID - 1]) + 1
+            inner += f'<numFmt numFmtId="{numfmt_id}" formatCode="{escaped_code}"/>'
+            new_block = f'<numFmts count="{inner.count("<numFmt ")}">{inner}</numFmts>'
+            if block is None:
+                start = styles.index('>', styles.index('<styleSheet')) + 1
+                styles = styles[:start] + new_block + styles[start:]
+            else:
+                styles = styles[:block.start()] + new_block + styles[block.end():]
+
+        # Style de cellule : copie de celui d'origine avec le nouveau numFmtId
+        block = re.search(r'<cellXfs\b[^>]*>(.*?)</cellXfs>', styles, re.DOTALL)
+        if block is None:
+            raise XlsxPatchError("cellXfs absent de styles.xml")
+        xfs = _XF_RE.findall(block.group(1))
+        base_xf = xfs[base_style] if base_style < len(xfs) else '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        new_xf = re.sub(r'\bnumFmtId="\d+"', f'numFmtId="{numfmt_id}"', base_xf, count=1)
+        new_xf = re.sub(r'\sapplyNumberFormat="[^"]*"', '', new_xf)
+        new_xf = new_xf.replace('<xf ', '<xf applyNumberFormat="1" ', 1)
+        styles = (
+            styles[:block.start()]
+            + f'<cellXfs count="{len(xfs) + 1}">{block.group(1)}{new_xf}</cellXfs>'
+            + styles[block.end():]
+        )
+        return styles, len(xfs)
+
+    @staticmethod
+    def _force_full_calc(workbook: str) -> str:
+        """Active fullCalcOnLoad dans <calcPr> (ajouté si absent)"""
+        calc = re.search(r'<calcPr\b[^>]*?/?>', workbook)
+        if calc:
+            tag = re.sub(r'\sfullCalcOnLoad="[^"]*"', '', calc.group(0))
+            tag = tag.replace('<calcPr', '<calcPr fullCalcOnLoad="1"', 1)
+            return workbook[:calc.start()] + tag + workbook[calc.end():]
+        # <calcPr> se place avant ces éléments s'ils sont présents (ordre du schéma)
+        following = re.search(
+            r'<(?:oleSize|customWorkbookViews|pivotCaches|smartTagPr|smartTagTypes|webPublishing'
+            r'|fileRecoveryPr|webPublishObjects|extLst)\b|</workbook>', workbook
+        )
+        return workbook[:following.start()] + '<calcPr fullCalcOnLoad="1"/>' + workbook[following.start():]
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Two-level cache-aside used by the async Garmin service (api/services/garmin_service.py)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+garmin_service = pytest.importorskip("api.services.garmin_service")
+cache_aside = garmin_service.cache_aside
+
+
+class CountingFetch:
+    """Fetch coroutine that yields to the loop and counts its calls."""
+
+    def __init__(self, value=None, error: Exception | None = None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_concurrent_misses_share_one_fetch() -> None:
+    cache: dict = {}
+    fetch = CountingFetch({"weight": 70.5})
+
+    async def run():
+        return await asyncio.gather(*[cache_aside(cache, ("weight", "2026-02-02"), fetch) for _ in range(20)])
+
+    results = asyncio.run(run())
+
+    assert fetch.calls == 1
+    assert results == [{"weight": 70.5}] * 20
+    assert cache[("weight", "2026-02-02")] == {"weight": 70.5}
+
+
+def test_cached_value_skips_fetch() -> None:
+    cache = {("sleep", "2026-02-02"): {"hours": 7.5}}
+    fetch = CountingFetch({"hours": 0})
+
+    assert asyncio.run(cache_aside(cache, ("sleep", "2026-02-02"), fetch)) == {"hours": 7.5}
+    assert fetch.calls == 0
+
+
+def test_exceptions_are_not_cached() -> None:
+    cache: dict = {}
+    key = ("weight", "2026-02-03")
+    failing = CountingFetch(error=ConnectionError("429"))
+
+    async def run():
+        return await asyncio.gather(*[cache_aside(cache, key, failing) for _ in range(5)], return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert key not in cache
+
+    # Next call retries Garmin and caches the successful value
+    fetch = CountingFetch(71.0)
+    assert asyncio.run(cache_aside(cache, key, fetch)) == 71.0
+    assert fetch.calls == 1
+    assert cache[key] == 71.0
+
+
+class FakeRedis:
+    """Minimal redis.asyncio stand-in: get / set(nx, ex) / delete, failing on the methods in fail_on."""
+
+    def __init__(self, data: dict | None = None, fail_on: tuple = ()):
+        self.data = dict(data or {})
+        self.fail_on = fail_on
+        self.expiry: dict = {}
+        self.deleted: list = []
+
+    def _check(self, method: str) -> None:
+        if method in self.fail_on:
+            raise ConnectionError("redis down")
+
+    async def get(self, key):
+        self._check("get")
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        self._check("set")
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.expiry[key] = ex
+        return True
+
+    async def delete(self, key):
+        self._check("delete")
+        self.deleted.append(key)
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(garmin_service, "REDIS_LOCK_POLL", 0.01)
+    monkeypatch.setattr(garmin_service, "REDIS_LOCK_TTL", 0.5)
+
+
+def test_redis_hit_fills_l1() -> None:
+    cache: dict = {}
+    redis = FakeRedis({"garmin:weight:2026-02-02": b"70.5"})
+    fetch = CountingFetch(0.0)
+
+    value = asyncio.run(cache_aside(cache, "k", fetch, redis=redis, redis_key="garmin:weight:2026-02-02"))
+
+    assert value == 70.5
+    assert cache["k"] == 70.5
+    assert fetch.calls == 0
+
+
+def test_redis_miss_fetches_stores_and_releases_lock() -> None:
+    cache: dict = {}
+    redis = FakeRedis()
+    fetch = CountingFetch({"hours": 7.5})
+
+    value = asyncio.run(cache_aside(cache, "k", fetch, redis=redis, redis_key="garmin:sleep", ttl=123))
+
+    assert value == {"hours": 7.5}
+    assert fetch.calls == 1
+    assert redis.data["garmin:sleep"] == b'{"hours":7.5}'
+    assert redis.expiry["garmin:sleep"] == 123
+    assert redis.deleted == ["garmin:sleep:lock"]
+    assert "garmin:sleep:lock" not in redis.data
+
+
+def test_redis_lock_released_when_fetch_raises() -> None:
+    redis = FakeRedis()
+    fetch = CountingFetch(error=ConnectionError("429"))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache_aside({}, "k", fetch, redis=redis, redis_key="garmin:sleep"))
+
+    assert "garmin:sleep:lock" not in redis.data
+    assert "garmin:sleep" not in redis.data
+
+
+def test_held_redis_lock_waits_for_other_worker(fast_polling) -> None:
+    cache: dict = {}
+    redis = FakeRedis({"garmin:weight:lock": 1})
+    fetch = CountingFetch(0.0)
+
+    async def other_worker():
+        await asyncio.sleep(0.05)
+        redis.data["garmin:weight"] = b"72.0"
+        del redis.data["garmin:weight:lock"]
+
+    async def run():
+        worker = asyncio.create_task(other_worker())
+        value = await cache_aside(cache, "k", fetch, redis=redis, redis_key="garmin:weight")
+        await worker
+        return value
+
+    assert asyncio.run(run()) == 72.0
+    assert fetch.calls == 0
+    assert cache["k"] == 72.0
+
+
+def test_held_redis_lock_timeout_falls_back_to_fetch(fast_polling) -> None:
+    redis = FakeRedis({"garmin:weight:lock": 1})
+    fetch = CountingFetch(73.0)
+
+    assert asyncio.run(cache_aside({}, "k", fetch, redis=redis, redis_key="garmin:weight")) == 73.0
+    assert fetch.calls == 1
+    # The lock belongs to the other worker: it is not released here
+    assert redis.deleted == []
+
+
+@pytest.mark.parametrize("fail_on", [("get", "set", "delete"), ("get",), ("set",)])
+def test_redis_down_falls_back_to_fetch(fail_on) -> None:
+    cache: dict = {}
+    redis = FakeRedis(fail_on=fail_on)
+    fetch = CountingFetch(74.0)
+
+    assert asyncio.run(cache_aside(cache, "k", fetch, redis=redis, redis_key="garmin:weight")) == 74.0
+    assert fetch.calls == 1
+    assert cache["k"] == 74.0
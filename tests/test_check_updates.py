@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Dependency update check (scripts/check_updates.py) without network access."""
+
+from __future__ import annotations
+
+import urllib.request
+
+import pytest
+
+from scripts import check_updates
+
+INSTALLED = {
+    "garth": {"name": "garth", "version": "0.5.3"},
+    "pypdf2": {"name": "PyPDF2", "version": "3.0.1"},
+}
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    monkeypatch.setattr(check_updates, "pip_list", lambda *args: dict(INSTALLED))
+
+
+def test_offline_reports_unknown(installed, monkeypatch) -> None:
+    def offline(*args, **kwargs):
+        raise OSError("Network is unreachable")
+
+    monkeypatch.setattr(urllib.request, "urlopen", offline)
+
+    results = check_updates.check_package_updates(["garth", "PyPDF2", "fastapi"])
+
+    assert results == {
+        "garth": {"installed": "0.5.3", "latest": "UNKNOWN", "needs_update": False},
+        "PyPDF2": {"installed": "3.0.1", "latest": "UNKNOWN", "needs_update": False},
+        "fastapi": {"installed": "NOT_INSTALLED", "latest": "UNKNOWN", "needs_update": False},
+    }
+
+
+def test_offline_main_does_not_claim_up_to_date(installed, monkeypatch, capsys) -> None:
+    monkeypatch.setattr(check_updates, "pypi_latest_version", lambda package: "UNKNOWN")
+
+    with pytest.raises(SystemExit) as exit_info:
+        check_updates.main()
+
+    assert exit_info.value.code == 0
+    output = capsys.readouterr().out
+    assert "Toutes les dépendances sont à jour" not in output
+    assert "inconnues" in output
+
+
+def test_latest_version_comes_from_pypi(installed, monkeypatch) -> None:
+    latest = {"garth": "0.5.3", "PyPDF2": "3.0.2"}
+    monkeypatch.setattr(check_updates, "pypi_latest_version", latest.__getitem__)
+
+    results = check_updates.check_package_updates(["garth", "PyPDF2"])
+
+    assert results["garth"]["needs_update"] is False
+    assert results["PyPDF2"] == {"installed": "3.0.1", "latest": "3.0.2", "needs_update": True}
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Disk cache: failed Garmin fetches must not be stored."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.disk_cache import DiskCache, has_data
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(Path(self._tmp.name) / "garmin_api", ttl=3600)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_successful_fetch_is_cached(self) -> None:
+        calls = []
+
+        def fetch(date: str) -> float:
+            calls.append(date)
+            return 70.5
+
+        cached = self.cache.wrap(fetch, "weight")
+        self.assertEqual(70.5, cached("2026-02-02"))
+        self.assertEqual(70.5, cached("2026-02-02"))
+        self.assertEqual(1, len(calls))
+
+    def test_failed_range_fetch_is_not_cached(self) -> None:
+        # get_weight_range / get_sleep_range return {date: None} when Garmin fails
+        responses = [
+            {"2026-02-02": None, "2026-02-03": None},
+            {"2026-02-02": 70.5, "2026-02-03": None},
+        ]
+        calls = []
+
+        async def fetch_range(dates: list) -> dict:
+            calls.append(dates)
+            return responses[len(calls) - 1]
+
+        cached = self.cache.wrap(fetch_range, "weight_range")
+        dates = ["2026-02-02", "2026-02-03"]
+
+        self.assertEqual(responses[0], asyncio.run(cached(dates)))
+        self.assertEqual(responses[1], asyncio.run(cached(dates)))
+        self.assertEqual(responses[1], asyncio.run(cached(dates)))
+        self.assertEqual(2, len(calls))
+
+    def test_raising_fetch_is_not_cached(self) -> None:
+        calls = []
+
+        def fetch() -> list:
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("429")
+            return [{"activityId": 1}]
+
+        cached = self.cache.wrap(fetch, "activities")
+        with self.assertRaises(ConnectionError):
+            cached()
+        self.assertEqual([{"activityId": 1}], cached())
+        self.assertEqual([{"activityId": 1}], cached())
+        self.assertEqual(2, len(calls))
+
+    def test_has_data(self) -> None:
+        self.assertFalse(has_data(None))
+        self.assertFalse(has_data({"2026-02-02": None}))
+        self.assertTrue(has_data({"2026-02-02": None, "2026-02-03": 70.5}))
+        self.assertTrue(has_data([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Binary FIT encoding of cycling workouts (src/fit_workout_generator.py)."""
+
+from __future__ import annotations
+
+import io
+import random
+import struct
+
+import pytest
+
+# The generator module imports fitparse at load time
+fitparse = pytest.importorskip("fitparse")
+
+from src.fit_workout_generator import (  # noqa: E402
+    VECTORIZE_MIN_INTERVALS,
+    FITWorkoutGenerator,
+    _fit_crc,
+    _fit_crc_table,
+    create_fit_from_json,
+)
+
+WORKOUT = {
+    "code": "C16",
+    "intervals": [
+        {"duration": "10:00", "power_watts": "100à150", "phase": "Échauffement"},
+        {"duration": "5", "power_watts": "250", "phase": "Corps de séance"},
+        {"duration": "3:30", "power_watts": "120", "phase": "Récupération"},
+    ],
+}
+
+
+def encode(workout: dict) -> bytes:
+    generator = FITWorkoutGenerator()
+    return generator.encode_fit(generator.generate_cycling_workout(workout))
+
+
+@pytest.mark.parametrize("crc", [_fit_crc, _fit_crc_table])
+def test_crc_check_value(crc) -> None:
+    # CRC-16/ARC check value
+    assert crc(b"123456789") == 0xBB3D
+    assert crc(b"") == 0
+
+
+def test_crcmod_matches_table_crc() -> None:
+    pytest.importorskip("crcmod")
+    assert _fit_crc is not _fit_crc_table
+
+    rng = random.Random(1234)
+    for size in (1, 12, 14, 883, 4096):
+        data = bytes(rng.getrandbits(8) for _ in range(size))
+        assert _fit_crc(data) == _fit_crc_table(data)
+        assert _fit_crc(bytearray(data)) == _fit_crc_table(data)
+
+
+def test_encoded_size_matches_header_data_size() -> None:
+    data = encode(WORKOUT)
+
+    header_size, _, _, data_size, signature = struct.unpack_from("<BBHI4s", data)
+    assert (header_size, signature) == (14, b".FIT")
+    assert len(data) == 14 + data_size + 2
+
+
+def test_crc_over_whole_file_is_zero() -> None:
+    data = encode(WORKOUT)
+
+    # Header CRC covers the first 12 bytes, file CRC everything before it
+    assert _fit_crc(data[:14]) == 0
+    assert _fit_crc(data) == 0
+
+
+def test_fitparse_reads_back_messages(tmp_path) -> None:
+    path = tmp_path / "C16.fit"
+    create_fit_from_json(WORKOUT, str(path))
+
+    fit = fitparse.FitFile(str(path), check_crc=True)
+    messages = [(m.name, m.get_values()) for m in fit.get_messages()]
+    names = [name for name, _ in messages]
+    assert names == ["file_id", "workout", "workout_step", "workout_step", "workout_step"]
+
+    file_id = messages[0][1]
+    assert (file_id["type"], file_id["manufacturer"]) == ("workout", "development")
+
+    workout = messages[1][1]
+    assert (workout["sport"], workout["wkt_name"], workout["num_valid_steps"]) == ("cycling", "C16", 3)
+
+    steps = [values for name, values in messages if name == "workout_step"]
+    assert [s["message_index"] for s in steps] == [0, 1, 2]
+    assert [s["duration_type"] for s in steps] == ["time"] * 3
+    assert [s["duration_time"] for s in steps] == [600.0, 300.0, 210.0]
+    assert [s["target_type"] for s in steps] == ["power"] * 3
+    assert [(s["custom_target_power_low"], s["custom_target_power_high"]) for s in steps] == [
+        (1100, 1150), (1250, 1250), (1120, 1120),
+    ]
+    assert [s["intensity"] for s in steps] == ["warmup", "active", "cooldown"]
+
+
+def test_long_names_are_truncated_to_field_size() -> None:
+    workout = {"code": "C" * 40, "intervals": [{"duration": "1", "power_watts": "100", "phase": "é" * 20}]}
+    data = encode(workout)
+
+    assert _fit_crc(data) == 0
+    values = [m.get_values() for m in fitparse.FitFile(io.BytesIO(data)).get_messages()]
+    assert values[1]["wkt_name"] == "C" * 15
+    assert len(values[2]["wkt_step_name"].encode("utf-8")) <= 15
+
+
+PARITY_INTERVALS = [
+    {"duration": duration, "power_watts": power, "phase": phase}
+    for duration, power, phase in [
+        ("10", "100à150", "Échauffement"),
+        ("10:00", "150", "échauffement progressif"),
+        ("5:30", "250à260", "Corps de séance"),
+        ("1", "300", "Sprint"),
+        ("2:05", "120", "Récupération"),
+        ("0:45", "110à115", "Repos"),
+        ("3", "140", "récup active"),
+        ("12:00", "200à220", "Tempo"),
+        (" 4:15", "150 à 180", "Retour au calme"),
+        ("59:59", "1000", "Test"),
+    ]
+] * 3 + [{"duration": "7", "power_watts": "180"}]
+
+
+def test_vectorized_steps_match_scalar_parser() -> None:
+    pytest.importorskip("numpy")
+    assert len(PARITY_INTERVALS) > VECTORIZE_MIN_INTERVALS
+
+    generator = FITWorkoutGenerator()
+    scalar = [generator._create_workout_step(i, interval) for i, interval in enumerate(PARITY_INTERVALS)]
+    assert generator._create_workout_steps(PARITY_INTERVALS) == scalar
+    assert {step["intensity"] for step in scalar} == {
+        FITWorkoutGenerator.INTENSITY_WARMUP,
+        FITWorkoutGenerator.INTENSITY_ACTIVE,
+        FITWorkoutGenerator.INTENSITY_REST,
+        FITWorkoutGenerator.INTENSITY_COOLDOWN,
+    }
+
+
+@pytest.mark.parametrize("field, value", [("duration", "x:10"), ("power_watts", "abc")])
+def test_vectorized_steps_reject_invalid_values(field, value) -> None:
+    pytest.importorskip("numpy")
+
+    intervals = [dict(interval) for interval in PARITY_INTERVALS]
+    intervals[5][field] = value
+    with pytest.raises(ValueError):
+        FITWorkoutGenerator()._create_workout_steps(intervals)
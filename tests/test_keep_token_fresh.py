@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Background OAuth2 refresh shared between uvicorn workers (AsyncGarminService.keep_token_fresh)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from test_cache_aside import FakeRedis
+
+garmin_service = pytest.importorskip("api.services.garmin_service")
+
+
+def make_worker(redis) -> tuple:
+    """AsyncGarminService whose refresh_token only counts its calls."""
+    service = garmin_service.AsyncGarminService(None, SimpleNamespace(email="athlete@example.com"), redis=redis)
+    calls = []
+
+    async def refresh_token():
+        calls.append(1)
+
+    service.refresh_token = refresh_token
+    return service, calls
+
+
+def run_loops(services, duration: float, interval: float) -> None:
+    async def run():
+        tasks = [asyncio.create_task(service.keep_token_fresh(interval)) for service in services]
+        await asyncio.sleep(duration)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(run())
+
+
+def test_single_worker_refreshes_with_redis() -> None:
+    redis = FakeRedis()
+    workers = [make_worker(redis) for _ in range(4)]
+
+    # Lock TTL (1 s minimum) outlasts the run: one refresh in total
+    run_loops([service for service, _ in workers], duration=0.25, interval=0.05)
+
+    assert sum(len(calls) for _, calls in workers) == 1
+
+
+def test_redis_down_skips_refresh() -> None:
+    service, calls = make_worker(FakeRedis(fail_on=("set",)))
+
+    run_loops([service], duration=0.25, interval=0.05)
+
+    assert calls == []
+
+
+def test_without_redis_every_interval_refreshes() -> None:
+    service, calls = make_worker(None)
+
+    run_loops([service], duration=0.25, interval=0.05)
+
+    assert len(calls) >= 3
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""XML patching of .xlsx workbooks (src/xlsx_patcher.py)."""
+
+from __future__ import annotations
+
+import re
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+try:
+    import openpyxl
+    from openpyxl.styles import Font
+except ImportError:
+    openpyxl = None
+
+from src.xlsx_patcher import CALC_CHAIN_XML, XlsxPatcher, XlsxPatchError
+
+SHEET1 = "xl/worksheets/sheet1.xml"
+SHEET2 = "xl/worksheets/sheet2.xml"
+CALC_CHAIN = '<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><c r="F1" i="1"/></calcChain>'
+CALC_CHAIN_REL = (
+    '<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain"'
+    ' Target="calcChain.xml" Id="rId9"/>'
+)
+CALC_CHAIN_OVERRIDE = (
+    '<Override PartName="/xl/calcChain.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/>'
+)
+
+
+def rewrite_members(path: Path, replacements: dict, extra: dict | None = None) -> None:
+    """Apply {member: fn(xml) -> xml} to the archive and add extra members."""
+    with zipfile.ZipFile(path) as archive:
+        members = {info.filename: archive.read(info) for info in archive.infolist()}
+    for name, fn in replacements.items():
+        members[name] = fn(members[name].decode("utf-8")).encode("utf-8")
+    for name, xml in (extra or {}).items():
+        members[name] = xml.encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def sheet_xml(path: Path, member: str = SHEET1) -> str:
+    with zipfile.ZipFile(path) as archive:
+        return archive.read(member).decode("utf-8")
+
+
+@unittest.skipIf(openpyxl is None, "openpyxl not installed")
+class TestXlsxPatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        self.template = tmp / "template.xlsx"
+        self.output = tmp / "output.xlsx"
+
+        # Lundi: A1..F4 with a styled B2, a formula in F1 and a gap at row 3
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Lundi"
+        ws["A1"] = "titre"
+        ws["F1"] = "=B2*2"
+        ws["B2"] = 1.5
+        ws["B2"].font = Font(bold=True)
+        ws["B2"].number_format = "0.000"
+        ws["B4"] = 1
+        ws["D4"] = 2
+        wb.create_sheet("Vide")
+        wb.save(self.template)
+
+        # Excel writes an empty sheet as <sheetData/>
+        rewrite_members(self.template, {SHEET2: lambda xml: re.sub(r"<sheetData>\s*</sheetData>", "<sheetData/>", xml)})
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def patch(self, edits) -> None:
+        patcher = XlsxPatcher(self.template)
+        for sheet, coordinate, value, *number_format in edits:
+            patcher.set(sheet, coordinate, value, *number_format)
+        patcher.save(self.output)
+
+    def test_overwrite_keeps_style(self) -> None:
+        self.patch([("Lundi", "B2", 2.25)])
+
+        cell = openpyxl.load_workbook(self.output)["Lundi"]["B2"]
+        self.assertEqual(2.25, cell.value)
+        self.assertTrue(cell.font.bold)
+        self.assertEqual("0.000", cell.number_format)
+
+    def test_cells_and_rows_inserted_in_order(self) -> None:
+        self.patch([
+            ("Lundi", "C4", "c"),   # between B4 and D4
+            ("Lundi", "A4", "a"),   # before the first cell of the row
+            ("Lundi", "E4", "e"),   # after the last cell of the row
+            ("Lundi", "A3", "r3"),  # new row between rows 2 and 4
+            ("Lundi", "A9", "r9"),  # new row after the last one
+            ("Vide", "B2", "b2"),   # empty <sheetData/>
+            ("Vide", "A1", "a1"),
+        ])
+
+        xml = sheet_xml(self.output)
+        rows = [int(r) for r in re.findall(r'<row\b[^>]*\br="(\d+)"', xml)]
+        self.assertEqual(sorted(rows), rows)
+        row4 = re.search(r'<row\b[^>]*\br="4".*?</row>', xml).group(0)
+        self.assertEqual(["A4", "B4", "C4", "D4", "E4"], re.findall(r'<c\b[^>]*\br="([A-Z]+\d+)"', row4))
+        empty = sheet_xml(self.output, SHEET2)
+        self.assertEqual(["A1", "B2"], re.findall(r'<c\b[^>]*\br="([A-Z]+\d+)"', empty))
+
+        wb = openpyxl.load_workbook(self.output)
+        lundi = wb["Lundi"]
+        self.assertEqual(["a", 1, "c", 2, "e"], [lundi[f"{col}4"].value for col in "ABCDE"])
+        self.assertEqual("r3", lundi["A3"].value)
+        self.assertEqual("r9", lundi["A9"].value)
+        self.assertEqual(("a1", "b2"), (wb["Vide"]["A1"].value, wb["Vide"]["B2"].value))
+
+    def test_identical_number_format_is_reused(self) -> None:
+        self.patch([
+            ("Lundi", "D4", 0.5, "0.000"),  # unstyled cell
+            ("Lundi", "A1", 0.25, "0.000"),
+            ("Lundi", "E6", 0.042, "hh:mm:ss.0"),
+        ])
+
+        with zipfile.ZipFile(self.output) as archive:
+            styles = archive.read("xl/styles.xml").decode("utf-8")
+        self.assertEqual(1, styles.count('formatCode="0.000"'))
+        self.assertEqual(1, styles.count('formatCode="hh:mm:ss.0"'))
+
+        lundi = openpyxl.load_workbook(self.output)["Lundi"]
+        self.assertEqual("0.000", lundi["D4"].number_format)
+        self.assertEqual("0.000", lundi["A1"].number_format)
+        self.assertEqual("hh:mm:ss.0", lundi["E6"].number_format)
+
+    def test_shared_formula_falls_back_to_openpyxl(self) -> None:
+        from scripts.fill_excel_from_garmin_xlsx import save_with_openpyxl
+
+        rewrite_members(self.template, {
+            SHEET1: lambda xml: xml.replace("<f>B2*2</f>", '<f t="shared" ref="F1:F2" si="0">B2*2</f>')
+        })
+        patcher = XlsxPatcher(self.template)
+        patcher.set("Lundi", "F1", 5)
+
+        with self.assertRaises(XlsxPatchError):
+            patcher.save(self.output)
+        save_with_openpyxl(patcher, self.output)
+
+        self.assertEqual(5, openpyxl.load_workbook(self.output)["Lundi"]["F1"].value)
+
+    def test_removing_formula_drops_calc_chain(self) -> None:
+        rewrite_members(
+            self.template,
+            {
+                "xl/_rels/workbook.xml.rels": lambda xml: xml.replace("</Relationships>", CALC_CHAIN_REL + "</Relationships>"),
+                "[Content_Types].xml": lambda xml: xml.replace("</Types>", CALC_CHAIN_OVERRIDE + "</Types>"),
+            },
+            extra={CALC_CHAIN_XML: CALC_CHAIN},
+        )
+        self.patch([("Lundi", "F1", 3)])
+
+        with zipfile.ZipFile(self.output) as archive:
+            self.assertNotIn(CALC_CHAIN_XML, archive.namelist())
+            self.assertNotIn("calcChain", archive.read("xl/_rels/workbook.xml.rels").decode("utf-8"))
+            self.assertNotIn("calcChain", archive.read("[Content_Types].xml").decode("utf-8"))
+            self.assertIn('fullCalcOnLoad="1"', archive.read("xl/workbook.xml").decode("utf-8"))
+        self.assertEqual(3, openpyxl.load_workbook(self.output)["Lundi"]["F1"].value)
+
+    def test_value_edit_keeps_calc_chain(self) -> None:
+        rewrite_members(self.template, {}, extra={CALC_CHAIN_XML: CALC_CHAIN})
+        self.patch([("Lundi", "B4", 7)])
+
+        with zipfile.ZipFile(self.output) as archive:
+            self.assertIn(CALC_CHAIN_XML, archive.namelist())
+
+    def test_dimension_widened(self) -> None:
+        self.patch([("Lundi", "H12", "x"), ("Vide", "C3", "y")])
+
+        self.assertIn('<dimension ref="A1:H12"', sheet_xml(self.output))
+        self.assertIn('<dimension ref="A1:C3"', sheet_xml(self.output, SHEET2))
+
+        ws = openpyxl.load_workbook(self.output, read_only=True)["Lundi"]
+        self.assertEqual((12, 8), (ws.max_row, ws.max_column))
+
+
+if __name__ == "__main__":
+    unittest.main()